@@ -0,0 +1,241 @@
+"""Benchmark baking projects from the template in-process.
+
+Bakes ``--projects`` projects, cycling through a set of option combinations,
+and reports throughput and the p50/p95 latency of one bake. Every bake is
+split into phases: building the context from cookiecutter.json and the
+options, writing the replay file, rendering each template file, and running
+each hook. Results are written as JSON so runs on different commits can be
+compared with ``--compare``.
+
+    uv run python -m benchmarks.bench_bake --projects 50 --strength 2 -o bake-results.json
+    uv run python -m benchmarks.bench_bake --projects 50 --strength 2 --compare bake-results.json
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import itertools
+import json
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import click
+import cookiecutter.generate
+import cookiecutter.main
+
+from benchmarks.bench_cicd import metadata
+from cookiecutter_uv.bake import TEMPLATE_DIR, bake, isolated_config, read_manifest
+from cookiecutter_uv.combinations import covering_array, load_choices
+
+
+@dataclass
+class BakeTimings:
+    """Where the time of one bake went, in seconds."""
+
+    total: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    files: dict[str, float] = field(default_factory=dict)
+    hooks: dict[str, float] = field(default_factory=dict)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def instrumented(timings: BakeTimings) -> Iterator[None]:
+    """Time cookiecutter's phases into ``timings`` while the block runs."""
+
+    def timed(func: Callable[..., Any], record: Callable[[float, tuple[Any, ...]], None]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(time.perf_counter() - start, args)
+
+        return wrapper
+
+    def render(seconds: float, args: tuple[Any, ...]) -> None:
+        # generate_file(project_dir, infile, ...)
+        timings.files[args[1]] = timings.files.get(args[1], 0.0) + seconds
+        timings.add("render", seconds)
+
+    def hook(seconds: float, args: tuple[Any, ...]) -> None:
+        # run_hook_from_repo_dir(repo_dir, hook_name, ...)
+        timings.hooks[args[1]] = timings.hooks.get(args[1], 0.0) + seconds
+        timings.add("hooks", seconds)
+
+    targets = [
+        (cookiecutter.main, "generate_context", _phase(timings, "context")),
+        (cookiecutter.main, "prompt_for_config", _phase(timings, "context")),
+        (cookiecutter.main, "dump", _phase(timings, "replay")),
+        (cookiecutter.generate, "generate_file", render),
+        (cookiecutter.generate, "run_hook_from_repo_dir", hook),
+    ]
+    with contextlib.ExitStack() as stack:
+        for module, name, record in targets:
+            stack.enter_context(patch.object(module, name, timed(getattr(module, name), record)))
+        yield
+
+
+def _phase(timings: BakeTimings, phase: str) -> Callable[[float, tuple[Any, ...]], None]:
+    return lambda seconds, _args: timings.add(phase, seconds)
+
+
+def bake_once(
+    context: dict[str, str], output_dir: Path, template: Path = TEMPLATE_DIR, config_file: Path | None = None
+) -> BakeTimings:
+    timings = BakeTimings()
+    with instrumented(timings):
+        start = time.perf_counter()
+        bake(context, output_dir, template, config_file=config_file)
+        timings.total = time.perf_counter() - start
+    timings.add("other", timings.total - sum(timings.phases.values()))
+    return timings
+
+
+def percentile(values: list[float], q: float) -> float:
+    """The nearest-rank percentile ``q`` (0-100) of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, round(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_benchmark(
+    contexts: list[dict[str, str]], projects: int, warmup: int = 1, template: Path = TEMPLATE_DIR
+) -> dict[str, Any]:
+    """Bake ``projects`` projects, cycling through ``contexts``, and summarize the timings."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = isolated_config(Path(tmp) / "config")
+        for i, context in zip(range(warmup), itertools.cycle(contexts)):
+            bake(context, Path(tmp) / f"warmup-{i}", template, config_file=config_file)
+
+        runs = []
+        start = time.perf_counter()
+        for i, context in zip(range(projects), itertools.cycle(contexts)):
+            runs.append(bake_once(context, Path(tmp) / str(i), template, config_file))
+        wall = time.perf_counter() - start
+
+    totals = [run.total for run in runs]
+    files: dict[str, list[float]] = {}
+    for run in runs:
+        for name, seconds in run.files.items():
+            files.setdefault(name, []).append(seconds)
+
+    return {
+        "projects": projects,
+        "combinations": len(contexts),
+        "projects_per_second": projects / wall,
+        "latency": {
+            "p50": percentile(totals, 50),
+            "p95": percentile(totals, 95),
+            "min": min(totals),
+            "max": max(totals),
+        },
+        "phases": _mean_per_key([run.phases for run in runs], projects),
+        "hooks": _mean_per_key([run.hooks for run in runs], projects),
+        "files": [
+            {"path": name, "renders": len(seconds), "mean": sum(seconds) / len(seconds), "total": sum(seconds)}
+            for name, seconds in sorted(files.items(), key=lambda item: sum(item[1]), reverse=True)
+        ],
+    }
+
+
+def compare(baseline: dict[str, Any], results: dict[str, Any]) -> list[tuple[str, float, float, float]]:
+    """Return (metric, baseline, current, ratio) for the latencies and phases, where higher is slower."""
+    metrics = [("latency p50", ("latency", "p50")), ("latency p95", ("latency", "p95"))]
+    metrics += [(f"phase {phase}", ("phases", phase)) for phase in results["phases"]]
+    rows = []
+    for name, (section, key) in metrics:
+        old = baseline.get(section, {}).get(key)
+        new = results[section][key]
+        if old:
+            rows.append((name, old, new, new / old))
+    return rows
+
+
+def _mean_per_key(values: list[dict[str, float]], count: int) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for entry in values:
+        for key, seconds in entry.items():
+            totals[key] = totals.get(key, 0.0) + seconds
+    return {key: total / count for key, total in totals.items()}
+
+
+@click.command()
+@click.option("--projects", "-n", default=20, show_default=True, type=click.IntRange(min=1), help="Projects to bake")
+@click.option(
+    "--strength",
+    type=click.IntRange(min=1),
+    help="Cycle through a covering array of this strength instead of the default options",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Cycle through the option combinations in this CSV, JSON Lines or JSON file",
+)
+@click.option("--warmup", default=1, show_default=True, type=click.IntRange(min=0), help="Untimed bakes first")
+@click.option("--top", default=10, show_default=True, help="Number of slowest files to show")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), help="Write results to this file")
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Results file of an earlier run to compare against",
+)
+@click.option("--max-slowdown", type=float, help="Exit with an error if any metric is this many times slower")
+def main(
+    projects: int,
+    strength: int | None,
+    manifest: Path | None,
+    warmup: int,
+    top: int,
+    output: Path | None,
+    baseline: Path | None,
+    max_slowdown: float | None,
+) -> None:
+    """Benchmark baking projects from the template."""
+    contexts: list[dict[str, str]] = [{}]
+    if manifest:
+        contexts = read_manifest(manifest)
+    elif strength:
+        contexts = covering_array(load_choices(), strength)
+
+    results = run_benchmark(contexts, projects, warmup=warmup)
+
+    latency = results["latency"]
+    click.echo(f"{results['projects']} projects from {results['combinations']} combinations")
+    click.echo(f"{'throughput':<30} {results['projects_per_second']:>10.1f} projects/s")
+    click.echo(f"{'latency p50':<30} {latency['p50'] * 1000:>10.1f} ms")
+    click.echo(f"{'latency p95':<30} {latency['p95'] * 1000:>10.1f} ms")
+    click.echo("")
+    for phase, seconds in sorted(results["phases"].items(), key=lambda item: item[1], reverse=True):
+        click.echo(f"{'phase ' + phase:<30} {seconds * 1000:>10.1f} ms")
+    for hook, seconds in results["hooks"].items():
+        click.echo(f"{'hook ' + hook:<30} {seconds * 1000:>10.1f} ms")
+    click.echo("")
+    for entry in results["files"][:top]:
+        click.echo(f"{entry['path'][-60:]:<60} {entry['mean'] * 1000:>8.2f} ms")
+
+    if output:
+        output.write_text(json.dumps({"metadata": metadata(), "results": results}, indent=2) + "\n")
+        click.echo(f"\nWrote {output}.")
+
+    if baseline:
+        click.echo(f"\nCompared with {baseline}:")
+        rows = compare(json.loads(baseline.read_text())["results"], results)
+        for name, old, new, ratio in rows:
+            click.echo(f"{name:<30} {old * 1000:>10.1f} ms -> {new * 1000:>10.1f} ms  x{ratio:.2f}")
+        if max_slowdown and any(ratio > max_slowdown for *_, ratio in rows):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Benchmark the cicd updaters end to end against a local stand-in for PyPI and GitHub.
+
+Synthetic corpora of pyproject.toml, action.yml and .pre-commit-config.yaml
+files are generated for every combination of ``--files`` and ``--packages``,
+then updated the same way ``update-dependencies`` does: resolve all versions,
+then plan and apply each updater. Results are written as JSON so runs on
+different commits can be compared with ``--compare``.
+
+    uv run python -m benchmarks.bench_cicd --files 10,100,1000 --packages 10,100 -o results.json
+    uv run python -m benchmarks.bench_cicd --files 10,100,1000 --packages 10,100 --compare results.json
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import click
+
+from benchmarks.mock_server import MockServer
+from cookiecutter_uv.cicd.fetchers import FetchSettings, GitHubRepo, ResolvedVersions
+from cookiecutter_uv.cicd.updaters import (
+    ActionYmlUpdater,
+    PreCommitConfigUpdater,
+    PyprojectTomlUpdater,
+    resolve_versions,
+)
+
+DEPENDENCIES_PER_FILE = 25
+
+ACTION_YML = """\
+name: "Setup Python Environment"
+
+inputs:
+  uv-version:
+    description: "uv version to use"
+    required: true
+    default: "0.0.1"
+"""
+
+
+@dataclass
+class Corpus:
+    """Generated files, grouped by updater."""
+
+    pyproject: list[Path] = field(default_factory=list)
+    action_yml: list[Path] = field(default_factory=list)
+    precommit: list[Path] = field(default_factory=list)
+
+
+def tracked_packages(count: int) -> list[str]:
+    return [f"package-{i:04d}" for i in range(count)]
+
+
+def tracked_hooks(count: int) -> list[tuple[str, GitHubRepo]]:
+    repos = [GitHubRepo(owner="hooks", repo=f"hook-{i:03d}") for i in range(max(2, count // 10))]
+    return [(f"https://github.com/{repo}", repo) for repo in repos]
+
+
+def generate_corpus(root: Path, files: int, packages: list[str], hooks: list[tuple[str, GitHubRepo]]) -> Corpus:
+    """Write ``files`` synthetic repositories under ``root``."""
+    corpus = Corpus()
+    per_file = min(len(packages), DEPENDENCIES_PER_FILE)
+    precommit = "repos:\n" + "".join(
+        f'  - repo: {url}\n    rev: "v0.0.1"\n    hooks:\n      - id: {repo.repo}\n\n' for url, repo in hooks
+    )
+
+    for i in range(files):
+        repo_dir = root / f"repo-{i:05d}"
+        action_dir = repo_dir / ".github" / "actions" / "setup-python-env"
+        action_dir.mkdir(parents=True)
+
+        dependencies = [packages[(i + j) % len(packages)] for j in range(per_file)]
+        pyproject = repo_dir / "pyproject.toml"
+        pyproject.write_text(
+            f'[project]\nname = "repo-{i}"\nversion = "0.0.1"\n\n[dependency-groups]\ndev = [\n'
+            + "".join(f'    "{name}>=0.0.1",\n' for name in dependencies)
+            + "]\n"
+        )
+        corpus.pyproject.append(pyproject)
+
+        action_yml = action_dir / "action.yml"
+        action_yml.write_text(ACTION_YML)
+        corpus.action_yml.append(action_yml)
+
+        config = repo_dir / ".pre-commit-config.yaml"
+        config.write_text(precommit)
+        corpus.precommit.append(config)
+
+    return corpus
+
+
+def run_once(files: int, packages: int, server: MockServer) -> dict[str, tuple[float, int]]:
+    """Generate a fresh corpus and time each phase. Returns {phase: (seconds, updates)}."""
+    names = tracked_packages(packages)
+    hooks = tracked_hooks(packages)
+    settings = FetchSettings(
+        pypi_url=f"{server.url}/pypi",
+        index_url=f"{server.url}/simple",
+        github_api_url=server.url,
+    )
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        patch("cookiecutter_uv.cicd.fetchers.settings", settings),
+        patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", names),
+        patch("cookiecutter_uv.cicd.updaters.PRECOMMIT_HOOKS", hooks),
+    ):
+        corpus = generate_corpus(Path(tmp), files, names, hooks)
+        timings: dict[str, tuple[float, int]] = {}
+
+        start = time.perf_counter()
+        versions = resolve_versions()
+        timings["resolve"] = (time.perf_counter() - start, packages + len(hooks) + 1)
+
+        phases: dict[str, Callable[[ResolvedVersions], int]] = {
+            "pyproject": lambda v: PyprojectTomlUpdater(corpus.pyproject, v).update(),
+            "action_yml": lambda v: ActionYmlUpdater(corpus.action_yml, v).update(),
+            "precommit": lambda v: sum(PreCommitConfigUpdater(config, v).update() for config in corpus.precommit),
+        }
+        for phase, run in phases.items():
+            start = time.perf_counter()
+            updates = run(versions)
+            timings[phase] = (time.perf_counter() - start, updates)
+
+    timings["total"] = (sum(seconds for seconds, _ in timings.values()), sum(n for _, n in timings.values()))
+    return timings
+
+
+def run_benchmarks(
+    files: list[int], packages: list[int], repeat: int = 3, latency: float = 0.0
+) -> list[dict[str, Any]]:
+    """Run every (files, packages) case ``repeat`` times and summarize the timings."""
+    results = []
+    with MockServer(latency=latency) as server:
+        for file_count in files:
+            for package_count in packages:
+                runs = [run_once(file_count, package_count, server) for _ in range(repeat)]
+                for phase in runs[0]:
+                    seconds = [run[phase][0] for run in runs]
+                    results.append(
+                        {
+                            "name": f"{phase}[files={file_count},packages={package_count}]",
+                            "phase": phase,
+                            "files": file_count,
+                            "packages": package_count,
+                            "updates": runs[0][phase][1],
+                            "min": min(seconds),
+                            "median": statistics.median(seconds),
+                        }
+                    )
+    return results
+
+
+def metadata() -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(baseline: list[dict[str, Any]], results: list[dict[str, Any]]) -> list[tuple[str, float, float, float]]:
+    """Return (name, baseline_min, current_min, ratio) for every case present in both runs."""
+    previous = {result["name"]: result for result in baseline}
+    rows = []
+    for result in results:
+        old = previous.get(result["name"])
+        if old and old["min"] > 0:
+            rows.append((result["name"], old["min"], result["min"], result["min"] / old["min"]))
+    return rows
+
+
+def _int_list(_ctx: click.Context, _param: click.Parameter, value: str) -> list[int]:
+    try:
+        return [int(item) for item in value.split(",") if item]
+    except ValueError as e:
+        msg = "expected a comma-separated list of integers"
+        raise click.BadParameter(msg) from e
+
+
+@click.command()
+@click.option("--files", default="10,100,1000", callback=_int_list, help="Comma-separated corpus sizes in files")
+@click.option("--packages", default="10,100", callback=_int_list, help="Comma-separated numbers of tracked packages")
+@click.option("--repeat", default=3, show_default=True, type=click.IntRange(min=1), help="Runs per case")
+@click.option("--latency", default=0.0, show_default=True, help="Simulated server latency per request, in seconds")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path), help="Write results to this file")
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Results file of an earlier run to compare against",
+)
+@click.option("--max-slowdown", type=float, help="Exit with an error if any case is this many times slower")
+def main(
+    files: list[int],
+    packages: list[int],
+    repeat: int,
+    latency: float,
+    output: Path | None,
+    baseline: Path | None,
+    max_slowdown: float | None,
+) -> None:
+    """Benchmark the cicd updaters on synthetic corpora."""
+    results = run_benchmarks(files, packages, repeat=repeat, latency=latency)
+
+    for result in results:
+        click.echo(f"{result['name']:<50} {result['min'] * 1000:>10.1f} ms  ({result['updates']} updates)")
+
+    if output:
+        output.write_text(json.dumps({"metadata": metadata(), "results": results}, indent=2) + "\n")
+        click.echo(f"\nWrote {output}.")
+
+    if baseline:
+        click.echo(f"\nCompared with {baseline}:")
+        rows = compare(json.loads(baseline.read_text())["results"], results)
+        for name, old, new, ratio in rows:
+            click.echo(f"{name:<50} {old * 1000:>10.1f} ms -> {new * 1000:>10.1f} ms  x{ratio:.2f}")
+        if max_slowdown and any(ratio > max_slowdown for *_, ratio in rows):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
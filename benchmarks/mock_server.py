@@ -0,0 +1,153 @@
+"""Local stand-in for the PyPI and GitHub APIs used by the fetchers."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+_GRAPHQL_REPOSITORY = re.compile(r'(\w+): repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+
+
+def fake_version(name: str) -> str:
+    """Deterministic 'latest' version for a package or repository name."""
+    digest = int(hashlib.sha256(name.encode()).hexdigest(), 16)
+    return f"{digest % 20 + 1}.{digest % 97}.{digest % 13}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockServer
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connection_count += 1
+
+    def do_GET(self) -> None:
+        if not self._begin():
+            return
+        payload = self._route(self.path.strip("/").split("/"))
+        if payload is None:
+            self.send_error(404)
+            return
+        self._send_json(payload)
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self._begin():
+            return
+        if self.path != "/graphql":
+            self.send_error(404)
+            return
+        if not self.headers.get("Authorization", "").lower().startswith("bearer "):
+            self.send_error(401)
+            return
+        self.server.graphql_count += 1
+        self._send_json({"data": self._graphql(json.loads(body)["query"])})
+
+    def _begin(self) -> bool:
+        self.server.request_count += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.fail_next > 0:
+            self.server.fail_next -= 1
+            self.send_error(503)
+            return False
+        return True
+
+    def _send_json(self, payload: Any) -> None:
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _route(parts: list[str]) -> Any:
+        if len(parts) == 3 and parts[0] == "pypi" and parts[2] == "json":
+            return {"info": {"name": parts[1], "version": fake_version(parts[1])}}
+        if len(parts) == 2 and parts[0] == "simple":
+            version = fake_version(parts[1])
+            return {
+                "meta": {"api-version": "1.1"},
+                "name": parts[1],
+                "files": [{"filename": f"{parts[1]}-{version}.tar.gz", "yanked": False}],
+            }
+        if len(parts) == 5 and parts[0] == "repos" and parts[3:] == ["releases", "latest"]:
+            return {"tag_name": f"v{fake_version('/'.join(parts[1:3]))}"}
+        if len(parts) == 5 and parts[0] == "repos" and parts[3] == "commits":
+            return {"sha": hashlib.sha1("/".join(parts[1:]).encode()).hexdigest()}  # noqa: S324
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "tags":
+            return [{"name": f"v{fake_version('/'.join(parts[1:3]))}"}]
+        return None
+
+    @staticmethod
+    def _graphql(query: str) -> dict[str, Any]:
+        """Answer the aliased repository queries sent by ``get_github_versions``."""
+        data: dict[str, Any] = {}
+        matches = list(_GRAPHQL_REPOSITORY.finditer(query))
+        for match, following in zip(matches, [*matches[1:], None], strict=True):
+            alias, owner, name = match.groups()
+            selection = query[match.end() : following.start() if following else len(query)]
+            tag = f"v{fake_version(f'{owner}/{name}')}"
+            node: dict[str, Any] = {}
+            if "latestRelease" in selection:
+                node["latestRelease"] = {"tagName": tag}
+            if "refs(" in selection:
+                node["refs"] = {"nodes": [{"name": tag}]}
+            data[alias] = node
+        return data
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    """Serves PyPI JSON, PEP 691 simple index and GitHub REST and GraphQL responses on localhost.
+
+    Use as a context manager; ``url`` is the base URL for both APIs. Responses
+    are gzip-encoded when the client accepts it, connections are kept alive,
+    and setting ``fail_next`` makes the next requests fail with 503.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.request_count = 0
+        self.connection_count = 0
+        self.graphql_count = 0
+        self.fail_next = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> MockServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
+        self.server_close()
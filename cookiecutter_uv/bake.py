@@ -0,0 +1,141 @@
+"""Generate projects from this template in-process, one at a time or in batches."""
+
+from __future__ import annotations
+
+import csv
+import functools
+import json
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from cookiecutter.exceptions import CookiecutterException
+from cookiecutter.main import cookiecutter
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class BakeResult:
+    """The outcome of generating one project."""
+
+    context: dict[str, str]
+    project_dir: Path | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def bake(
+    context: dict[str, str],
+    output_dir: Path,
+    template: Path = TEMPLATE_DIR,
+    overwrite_if_exists: bool = False,
+    config_file: Path | None = None,
+    default_config: bool = False,
+    accept_hooks: bool = True,
+) -> Path:
+    """Generate one project without prompting and return its directory.
+
+    ``context`` overrides the defaults in cookiecutter.json; choice variables
+    take one of their listed values. ``config_file``, ``default_config`` and
+    ``accept_hooks`` work as the cookiecutter CLI options of the same name.
+    """
+    project_dir = cookiecutter(
+        str(template),
+        no_input=True,
+        extra_context=context,
+        output_dir=str(output_dir),
+        overwrite_if_exists=overwrite_if_exists,
+        config_file=str(config_file) if config_file else None,
+        default_config=default_config,
+        accept_hooks=accept_hooks,
+    )
+    return Path(project_dir)
+
+
+def isolated_config(directory: Path) -> Path:
+    """Write a cookiecutter config that keeps clones and replay files in ``directory`` and has no default context.
+
+    Baking with it does not depend on the user's ~/.cookiecutterrc and does not
+    write to their replay directory.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    config = {
+        "cookiecutters_dir": str(directory / "cookiecutters"),
+        "replay_dir": str(directory / "replay"),
+        "default_context": {},
+        "abbreviations": {},
+    }
+    path = directory / "cookiecutterrc.yaml"
+    # JSON is valid YAML.
+    path.write_text(json.dumps(config, indent=2) + "\n")
+    return path
+
+
+def bake_many(
+    contexts: Iterable[dict[str, str]],
+    output_dir: Path,
+    template: Path = TEMPLATE_DIR,
+    overwrite_if_exists: bool = False,
+    processes: int = 1,
+    config_file: Path | None = None,
+    default_config: bool = False,
+) -> list[BakeResult]:
+    """Generate a project for every context in this process, or fanned out over ``processes`` workers.
+
+    A project that fails to generate is reported in its result and does not
+    stop the others. Results are returned in the order of ``contexts``.
+    """
+    run = functools.partial(
+        _bake_one,
+        output_dir=output_dir,
+        template=template,
+        overwrite_if_exists=overwrite_if_exists,
+        config_file=config_file,
+        default_config=default_config,
+    )
+    if processes <= 1:
+        return [run(context) for context in contexts]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(run, contexts))
+
+
+def read_manifest(path: Path) -> list[dict[str, str]]:
+    """Read project contexts from a CSV file with a header row, a JSON Lines file or a JSON list."""
+    if path.suffix == ".csv":
+        with path.open(newline="") as f:
+            return [{key: value for key, value in row.items() if value} for row in csv.DictReader(f)]
+
+    text = path.read_text()
+    if path.suffix == ".jsonl":
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        rows = json.loads(text)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        msg = f"{path} must contain a list of objects"
+        raise ValueError(msg)
+    return [_stringify(row) for row in rows]
+
+
+def _stringify(row: dict[str, Any]) -> dict[str, str]:
+    return {key: value if isinstance(value, str) else json.dumps(value) for key, value in row.items()}
+
+
+def _bake_one(
+    context: dict[str, str],
+    output_dir: Path,
+    template: Path,
+    overwrite_if_exists: bool,
+    config_file: Path | None,
+    default_config: bool,
+) -> BakeResult:
+    try:
+        project_dir = bake(context, output_dir, template, overwrite_if_exists, config_file, default_config)
+    except (CookiecutterException, OSError) as e:
+        return BakeResult(context, error=f"{type(e).__name__}: {e}")
+    return BakeResult(context, project_dir)
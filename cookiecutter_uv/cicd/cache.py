@@ -0,0 +1,108 @@
+"""On-disk cache for HTTP responses."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from cookiecutter_uv.cicd.defaults import DEFAULT_MAX_SIZE, DEFAULT_TTL
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its validators."""
+
+    url: str
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that let the server answer with 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Response cache keyed by URL, bounded by total size on disk.
+
+    Entries younger than ``ttl`` seconds are served without touching the
+    network; older ones are revalidated with their ETag/Last-Modified. When the
+    cache grows past ``max_size`` bytes the least recently used entries are
+    removed.
+    """
+
+    def __init__(self, directory: Path, ttl: float = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for a URL, if any."""
+        path = self._path(url)
+        try:
+            data = json.loads(path.read_text())
+            entry = CacheEntry(**data)
+        except (OSError, TypeError, json.JSONDecodeError):
+            return None
+        if entry.url != url:
+            return None
+        # Mark the entry as recently used for eviction.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        """Store an entry, replacing any previous one for the same URL."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp, self._path(entry.url))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            return
+        self._evict()
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Mark an entry as revalidated now."""
+        entry.fetched_at = time.time()
+        self.put(entry)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_size."""
+        with self._lock:
+            files = []
+            for path in self.directory.glob("*.json"):
+                with contextlib.suppress(OSError):
+                    stat = path.stat()
+                    files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_size:
+                    break
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                total -= size
@@ -1,65 +1,84 @@
-"""CLI for dependency updates."""
+"""CLI for dependency updates.
+
+The group only knows where its subcommands live. They are imported from
+``cookiecutter_uv.cicd.commands`` when invoked or listed, and that module
+defers the HTTP stack and the updaters, so ``--help`` and every command start
+without loading them until they are needed.
+"""
 
 from __future__ import annotations
 
-import logging
+import importlib
 from pathlib import Path
 
 import click
 
-from cookiecutter_uv.cicd.updaters import ActionYmlUpdater, PreCommitConfigUpdater, PyprojectTomlUpdater
+# Subcommand name -> "module:attribute" of the command.
+COMMANDS = {
+    "apply-plan": "cookiecutter_uv.cicd.commands:apply_plan",
+    "resolve": "cookiecutter_uv.cicd.commands:resolve",
+    "update-dependencies": "cookiecutter_uv.cicd.commands:update_dependencies",
+}
 
-logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+class LazyGroup(click.Group):
+    """A group whose subcommands are imported on first use.
 
-@click.group()
-def cli() -> None:
-    """CI/CD utilities for cookiecutter-uv."""
+    ``--help`` imports them too, to show the first line of their docstrings; the
+    modules they live in import their own heavy dependencies only when run.
+    """
 
+    def __init__(self, *args: object, lazy_commands: dict[str, str], **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.lazy_commands = lazy_commands
 
-@cli.command()
-@click.option("--dry-run", is_flag=True, help="Print changes without writing")
-@click.option(
-    "--pyproject",
-    "pyproject_files",
-    multiple=True,
-    required=True,
-    type=click.Path(exists=True, path_type=Path),
-    help="pyproject.toml files to update (can be repeated)",
-)
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module_name, _, attribute = self.lazy_commands[cmd_name].partition(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
 @click.option(
-    "--action-yml",
-    "action_yml_files",
-    multiple=True,
-    required=True,
-    type=click.Path(exists=True, path_type=Path),
-    help="action.yml files to update (can be repeated)",
+    "--profile",
+    is_flag=True,
+    envvar="COOKIECUTTER_UV_PROFILE",
+    help="Print a table of where the time went: fetches per host, and reads, matches and writes per file",
 )
 @click.option(
-    "--precommit-config",
-    "precommit_configs",
-    multiple=True,
-    required=True,
-    type=click.Path(exists=True, path_type=Path),
-    help="Pre-commit config files to update (can be repeated)",
+    "--profile-output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="COOKIECUTTER_UV_PROFILE_OUTPUT",
+    help="Write the profile as a Chrome trace (chrome://tracing, Perfetto) to this file",
 )
-def update_dependencies(
-    dry_run: bool,
-    pyproject_files: tuple[Path, ...],
-    action_yml_files: tuple[Path, ...],
-    precommit_configs: tuple[Path, ...],
-) -> None:
-    """Update all dependencies to their latest versions."""
-    total = 0
-    total += PyprojectTomlUpdater(list(pyproject_files)).update(dry_run=dry_run)
-    total += ActionYmlUpdater(list(action_yml_files)).update(dry_run=dry_run)
-    for config in precommit_configs:
-        total += PreCommitConfigUpdater(config).update(dry_run=dry_run)
-
-    if dry_run:
-        click.echo(f"\nDry run complete. {total} update(s) would be applied.")
-    else:
-        click.echo(f"\nDone. {total} update(s) applied.")
+@click.pass_context
+def cli(ctx: click.Context, profile: bool, profile_output: Path | None) -> None:
+    """CI/CD utilities for cookiecutter-uv."""
+    import logging
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not (profile or profile_output):
+        return
+
+    from cookiecutter_uv.cicd.profiling import profiler
+
+    profiler.reset()
+    profiler.enabled = True
+
+    def report() -> None:
+        profiler.enabled = False
+        if profile:
+            click.echo("\n" + profiler.summary(), err=True)
+        if profile_output:
+            profiler.save_trace(profile_output)
+            click.echo(f"Wrote profile to {profile_output}.", err=True)
+
+    ctx.call_on_close(report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,372 @@
+"""Subcommands of the cicd CLI, loaded only when one of them is invoked.
+
+Modules that pull in the HTTP stack, the updaters or the plan and state
+formats are imported inside the commands that need them.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import click
+
+from cookiecutter_uv.cicd.defaults import DEFAULT_TTL, MAX_WORKERS, PYPI_SIMPLE_URL, default_cache_dir
+
+if TYPE_CHECKING:
+    from cookiecutter_uv.cicd.discovery import DiscoveredFiles
+    from cookiecutter_uv.cicd.executor import FileEdit
+    from cookiecutter_uv.cicd.fetchers import ResolvedVersions
+    from cookiecutter_uv.cicd.state import UpdateState
+    from cookiecutter_uv.cicd.updaters import WorkflowUsesUpdater
+
+
+max_workers_option = click.option(
+    "--max-workers",
+    default=MAX_WORKERS,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of concurrent version lookups and file writes",
+)
+
+
+def fetch_options(command: Callable[..., None]) -> Callable[..., None]:
+    """Add the options that control how versions are fetched and apply them to the fetchers."""
+
+    @functools.wraps(command)
+    def wrapper(
+        *args: Any,
+        cache_dir: Path,
+        cache_ttl: int,
+        no_cache: bool,
+        pypi_api: str,
+        index_url: str,
+        github_api: str,
+        **kwargs: Any,
+    ) -> None:
+        from cookiecutter_uv.cicd import fetchers
+        from cookiecutter_uv.cicd.cache import HttpCache
+
+        fetchers.settings.cache = None if no_cache else HttpCache(cache_dir, ttl=cache_ttl)
+        fetchers.settings.pypi_api = pypi_api
+        fetchers.settings.index_url = index_url
+        fetchers.settings.github_api = github_api
+        command(*args, **kwargs)
+
+    options = [
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, path_type=Path),
+            default=default_cache_dir,
+            show_default="~/.cache/cookiecutter-uv",
+            help="Directory for cached HTTP responses",
+        ),
+        click.option(
+            "--cache-ttl",
+            default=DEFAULT_TTL,
+            show_default=True,
+            help="Seconds before cached responses are revalidated",
+        ),
+        click.option("--no-cache", is_flag=True, help="Do not read or write the HTTP response cache"),
+        click.option(
+            "--pypi-api",
+            type=click.Choice(["json", "simple"]),
+            default="json",
+            show_default=True,
+            help="PyPI API to query: the full JSON document or the lightweight PEP 691 simple index",
+        ),
+        click.option(
+            "--index-url",
+            default=PYPI_SIMPLE_URL,
+            show_default=True,
+            help="Simple index URL used with --pypi-api simple",
+        ),
+        click.option(
+            "--github-api",
+            type=click.Choice(["rest", "graphql"]),
+            default="rest",
+            show_default=True,
+            help="GitHub API to query: one REST request per repository, or a single GraphQL query "
+            "(needs GITHUB_TOKEN or GH_TOKEN)",
+        ),
+    ]
+    for option in reversed(options):
+        wrapper = option(wrapper)
+    return wrapper
+
+
+def _load_snapshot(path: Path) -> ResolvedVersions:
+    from cookiecutter_uv.cicd.snapshot import load_snapshot
+
+    try:
+        return load_snapshot(path)
+    except (ValueError, KeyError) as e:
+        raise click.BadParameter(str(e), param_hint="--from-snapshot") from e
+
+
+def _load_state(path: Path, pin_sha: bool) -> UpdateState:
+    from cookiecutter_uv.cicd.state import UpdateState, tracking_fingerprint
+
+    try:
+        state = UpdateState.load(path)
+    except (ValueError, KeyError, TypeError) as e:
+        raise click.BadParameter(str(e), param_hint="--state-file") from e
+    if state.track(tracking_fingerprint(pin_sha=pin_sha)):
+        click.echo("The tracked dependencies or options changed since the last run; processing all files.")
+    return state
+
+
+@click.command()
+@click.option(
+    "--output",
+    "-o",
+    required=True,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Snapshot file to write",
+)
+@click.option(
+    "--root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Also resolve the actions used by workflow and action files under this directory, and their commits",
+)
+@max_workers_option
+@fetch_options
+def resolve(output: Path, root: Path | None, max_workers: int) -> None:
+    """Resolve the latest versions of all tracked dependencies into a snapshot file."""
+    from cookiecutter_uv.cicd.discovery import discover_files
+    from cookiecutter_uv.cicd.snapshot import save_snapshot
+    from cookiecutter_uv.cicd.updaters import WorkflowUsesUpdater, resolve_versions
+
+    workflows = None
+    if root is not None:
+        discovered = discover_files(root)
+        workflows = WorkflowUsesUpdater(discovered.workflows + discovered.action_yml, max_workers=max_workers)
+    versions = resolve_versions(max_workers=max_workers, action_repos=workflows.repos() if workflows else [])
+    if workflows is not None:
+        # Record the commits of the new refs, so they can be pinned to SHAs from the snapshot alone.
+        workflows.versions = versions
+        versions.commits = workflows.resolve_commits()
+    save_snapshot(versions, output)
+
+    missing = [name for name, version in _iter_versions(versions) if version is None]
+    for name in missing:
+        click.echo(f"Failed to resolve {name}", err=True)
+    click.echo(f"Wrote {output}.")
+
+
+def _iter_versions(versions: ResolvedVersions) -> list[tuple[str, str | None]]:
+    return [
+        *versions.pypi.items(),
+        *((str(repo), version) for repo, version in versions.releases.items()),
+        *((str(repo), version) for repo, version in versions.tags.items()),
+    ]
+
+
+def _plan_updates(files: DiscoveredFiles, versions: ResolvedVersions, workflows: WorkflowUsesUpdater) -> list[FileEdit]:
+    """Plan the edits of all updaters, combined into one edit per file."""
+    from cookiecutter_uv.cicd.executor import merge_file_edits
+    from cookiecutter_uv.cicd.updaters import ActionYmlUpdater, PreCommitConfigUpdater, PyprojectTomlUpdater
+
+    edits = [
+        *PyprojectTomlUpdater(files.pyproject, versions).plan(),
+        *ActionYmlUpdater(files.action_yml, versions).plan(),
+    ]
+    for config in files.precommit:
+        edits.extend(PreCommitConfigUpdater(config, versions).plan())
+    return merge_file_edits([*edits, *workflows.plan(edits)])
+
+
+def _record_state(
+    state: UpdateState, edits: list[FileEdit], files: DiscoveredFiles, versions: ResolvedVersions
+) -> None:
+    """Record every processed file with the versions of the dependencies it references."""
+    from cookiecutter_uv.cicd.updaters import (
+        ActionYmlUpdater,
+        PreCommitConfigUpdater,
+        PyprojectTomlUpdater,
+        WorkflowUsesUpdater,
+    )
+
+    pyproject, action_yml, precommit = set(files.pyproject), set(files.action_yml), set(files.precommit)
+    uses = set(files.workflows) | action_yml
+    for edit in edits:
+        keys: set[str] = set()
+        if edit.path in pyproject:
+            keys |= PyprojectTomlUpdater.keys(edit.updated)
+        if edit.path in action_yml:
+            keys |= ActionYmlUpdater.keys(edit.updated)
+        if edit.path in precommit:
+            keys |= PreCommitConfigUpdater.keys(edit.updated)
+        if edit.path in uses:
+            keys |= WorkflowUsesUpdater.keys(edit.updated)
+        state.record(edit.path, keys, versions)
+
+
+def _require_files(files: DiscoveredFiles) -> None:
+    if not files.paths():
+        msg = "Pass --root or at least one of --pyproject, --action-yml, --precommit-config and --workflow."
+        raise click.UsageError(msg)
+
+
+@click.command()
+@click.option("--dry-run", is_flag=True, help="Print changes without writing")
+@click.option("--diff", "show_diff", is_flag=True, help="Print the planned changes as a unified diff")
+@click.option(
+    "--plan",
+    "plan_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the planned edits to this JSON file for 'apply-plan' instead of applying them",
+)
+@click.option(
+    "--root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Discover pyproject.toml, action.yml, pre-commit config and workflow files under this directory",
+)
+@click.option(
+    "--pyproject",
+    "pyproject_files",
+    multiple=True,
+    type=click.Path(exists=True, path_type=Path),
+    help="pyproject.toml files to update (can be repeated)",
+)
+@click.option(
+    "--action-yml",
+    "action_yml_files",
+    multiple=True,
+    type=click.Path(exists=True, path_type=Path),
+    help="action.yml files to update (can be repeated)",
+)
+@click.option(
+    "--precommit-config",
+    "precommit_configs",
+    multiple=True,
+    type=click.Path(exists=True, path_type=Path),
+    help="Pre-commit config files to update (can be repeated)",
+)
+@click.option(
+    "--workflow",
+    "workflow_files",
+    multiple=True,
+    type=click.Path(exists=True, path_type=Path),
+    help="Workflow files whose 'uses:' action references to update (can be repeated)",
+)
+@click.option(
+    "--no-workflows",
+    is_flag=True,
+    help="Do not update workflow files, e.g. when the changes are pushed with a token that may not modify them",
+)
+@click.option("--pin-sha", is_flag=True, help="Pin action references to the commit SHA of their version")
+@click.option(
+    "--state-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Skip files that are unchanged since the run that wrote this state, and update it afterwards",
+)
+@click.option(
+    "--from-snapshot",
+    "snapshot",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Apply the versions in a snapshot written by 'resolve' instead of fetching them",
+)
+@max_workers_option
+@fetch_options
+def update_dependencies(
+    dry_run: bool,
+    show_diff: bool,
+    plan_file: Path | None,
+    root: Path | None,
+    pyproject_files: tuple[Path, ...],
+    action_yml_files: tuple[Path, ...],
+    precommit_configs: tuple[Path, ...],
+    workflow_files: tuple[Path, ...],
+    no_workflows: bool,
+    pin_sha: bool,
+    state_file: Path | None,
+    max_workers: int,
+    snapshot: Path | None,
+) -> None:
+    """Update all dependencies to their latest versions."""
+    from cookiecutter_uv.cicd.discovery import DiscoveredFiles, discover_files
+    from cookiecutter_uv.cicd.executor import apply_file_edits
+    from cookiecutter_uv.cicd.profiling import span
+    from cookiecutter_uv.cicd.updaters import WorkflowUsesUpdater, resolve_versions
+
+    files = DiscoveredFiles(
+        list(pyproject_files), list(action_yml_files), list(precommit_configs), list(workflow_files)
+    )
+    if root is not None:
+        with span("phase", "discover"):
+            files.extend(discover_files(root))
+    if no_workflows:
+        files.workflows = []
+    _require_files(files)
+
+    state = _load_state(state_file, pin_sha) if state_file else None
+    unchanged = {path for path in files.paths() if state.unchanged(path)} if state else set()
+
+    workflows = WorkflowUsesUpdater(
+        [path for path in files.workflows + files.action_yml if path not in unchanged],
+        pin_sha=pin_sha,
+        max_workers=max_workers,
+        offline=snapshot is not None,
+    )
+    with span("phase", "resolve"):
+        if snapshot:
+            versions = _load_snapshot(snapshot)
+        else:
+            recorded = [repo for path in unchanged for repo in state.releases(path)] if state else []
+            versions = resolve_versions(max_workers=max_workers, action_repos=[*workflows.repos(), *recorded])
+
+    if state is not None:
+        skipped = {path for path in unchanged if not state.outdated(path, versions)}
+        files = files.without(skipped)
+        click.echo(f"Skipping {len(skipped)} unchanged file(s).")
+    workflows.files = files.workflows + files.action_yml
+    workflows.versions = versions
+
+    with span("phase", "plan"):
+        edits = _plan_updates(files, versions, workflows)
+
+    total = sum(edit.count for edit in edits)
+    if show_diff:
+        from cookiecutter_uv.cicd.plan import unified_diff
+
+        click.echo(unified_diff(edits), nl=False)
+    if plan_file is not None:
+        from cookiecutter_uv.cicd.plan import save_plan
+
+        save_plan(edits, plan_file)
+        click.echo(f"\nWrote {plan_file} with {total} update(s).")
+        return
+
+    if not dry_run:
+        with span("phase", "apply"):
+            apply_file_edits(edits, max_workers=max_workers)
+        if state is not None and state_file is not None:
+            _record_state(state, edits, files, versions)
+            state.save(state_file)
+
+    if dry_run:
+        click.echo(f"\nDry run complete. {total} update(s) would be applied.")
+    else:
+        click.echo(f"\nDone. {total} update(s) applied.")
+
+
+@click.command("apply-plan")
+@click.argument("plan_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@max_workers_option
+def apply_plan(plan_file: Path, max_workers: int) -> None:
+    """Apply a plan written by 'update-dependencies --plan' without fetching or parsing anything."""
+    from cookiecutter_uv.cicd.executor import apply_file_edits
+    from cookiecutter_uv.cicd.plan import load_plan
+
+    try:
+        edits = load_plan(plan_file)
+        apply_file_edits(edits, max_workers=max_workers)
+    except (ValueError, KeyError) as e:
+        raise click.ClickException(str(e)) from e
+    except OSError as e:
+        msg = f"Cannot update {e.filename}: {e.strerror}"
+        raise click.ClickException(msg) from e
+    click.echo(f"Done. {sum(edit.count for edit in edits)} update(s) applied.")
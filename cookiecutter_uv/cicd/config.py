@@ -13,6 +13,7 @@ PYPI_PACKAGES = [
     "mypy",
     "ty",
     "pytest-cov",
+    "pytest-benchmark",
     "ruff",
     "mkdocs",
     "mkdocs-material",
@@ -0,0 +1,25 @@
+"""Default settings shared by the CLI and the fetchers.
+
+Kept free of heavy imports so the CLI can build its options without loading
+the HTTP stack.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+MAX_WORKERS = 8
+
+PYPI_JSON_URL = "https://pypi.org/pypi"
+PYPI_SIMPLE_URL = "https://pypi.org/simple"
+GITHUB_API_URL = "https://api.github.com"
+
+DEFAULT_TTL = 3600
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the user cache directory for cookiecutter-uv."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cookiecutter-uv"
@@ -0,0 +1,218 @@
+"""Discover the files to update by walking a directory tree."""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PYPROJECT_NAMES = frozenset({"pyproject.toml"})
+ACTION_YML_NAMES = frozenset({"action.yml", "action.yaml"})
+PRECOMMIT_NAMES = frozenset({".pre-commit-config.yaml", ".pre-commit-config.yml"})
+WORKFLOW_DIR = ".github/workflows"
+WORKFLOW_SUFFIXES = (".yml", ".yaml")
+
+# Template files that only some projects get are named {{ optional('<feature>', '<name>') }}.
+OPTIONAL_TEMPLATE_NAME = re.compile(r"\{\{\s*optional\(\s*'[^']*'\s*,\s*'([^']+)'\s*\)\s*\}\}")
+
+# Directories that never contain files we want to update.
+PRUNED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".ruff_cache",
+        ".pytest_cache",
+    }
+)
+
+
+@dataclass
+class DiscoveredFiles:
+    """Files found under a root directory, grouped by updater.
+
+    A file is listed once per group: paths that resolve to a file already in the
+    group are dropped, keeping the first one seen.
+    """
+
+    pyproject: list[Path] = field(default_factory=list)
+    action_yml: list[Path] = field(default_factory=list)
+    precommit: list[Path] = field(default_factory=list)
+    workflows: list[Path] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.pyproject = _unique(self.pyproject)
+        self.action_yml = _unique(self.action_yml)
+        self.precommit = _unique(self.precommit)
+        self.workflows = _unique(self.workflows)
+
+    def paths(self) -> set[Path]:
+        return {*self.pyproject, *self.action_yml, *self.precommit, *self.workflows}
+
+    def extend(self, other: DiscoveredFiles) -> None:
+        self.pyproject = _unique(self.pyproject + other.pyproject)
+        self.action_yml = _unique(self.action_yml + other.action_yml)
+        self.precommit = _unique(self.precommit + other.precommit)
+        self.workflows = _unique(self.workflows + other.workflows)
+
+    def without(self, skipped: set[Path]) -> DiscoveredFiles:
+        """A copy without the ``skipped`` paths."""
+        return DiscoveredFiles(
+            *(
+                [path for path in paths if path not in skipped]
+                for paths in (self.pyproject, self.action_yml, self.precommit, self.workflows)
+            )
+        )
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+    base: str
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not path.startswith(self.base + "/"):
+                return False
+            path = path[len(self.base) + 1 :]
+        return bool(self.regex.fullmatch(path))
+
+
+def discover_files(root: Path) -> DiscoveredFiles:
+    """Find all pyproject.toml, action.yml, pre-commit config and workflow files under ``root``.
+
+    The tree is walked once with ``os.scandir``. Directories in ``PRUNED_DIRS``
+    and paths excluded by ``.gitignore`` files are skipped without descending
+    into them.
+    """
+    found = DiscoveredFiles()
+    stack: list[tuple[str, str, list[_IgnoreRule]]] = [(str(root), "", [])]
+
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        rules = rules + _read_gitignore(os.path.join(directory, ".gitignore"), rel_dir)
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in PRUNED_DIRS and not _is_ignored(rules, rel_path, is_dir=True):
+                    stack.append((entry.path, rel_path, rules))
+                continue
+
+            target = _target(found, entry.name, rel_dir)
+            if target is not None and not _is_ignored(rules, rel_path, is_dir=False):
+                target.append(Path(entry.path))
+
+    found.pyproject.sort()
+    found.action_yml.sort()
+    found.precommit.sort()
+    found.workflows.sort()
+    return found
+
+
+def _unique(paths: list[Path]) -> list[Path]:
+    seen: set[Path] = set()
+    unique = []
+    for path in paths:
+        resolved = path.resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            unique.append(path)
+    return unique
+
+
+def _target(found: DiscoveredFiles, name: str, rel_dir: str) -> list[Path] | None:
+    """The list a file with this name belongs to, if any."""
+    optional = OPTIONAL_TEMPLATE_NAME.fullmatch(name)
+    if optional:
+        name = optional.group(1)
+    if name in PYPROJECT_NAMES:
+        return found.pyproject
+    if name in ACTION_YML_NAMES:
+        return found.action_yml
+    if name in PRECOMMIT_NAMES:
+        return found.precommit
+    if name.endswith(WORKFLOW_SUFFIXES) and (rel_dir == WORKFLOW_DIR or rel_dir.endswith("/" + WORKFLOW_DIR)):
+        return found.workflows
+    return None
+
+
+def _is_ignored(rules: list[_IgnoreRule], path: str, is_dir: bool) -> bool:
+    """The last matching rule decides, as in git."""
+    ignored = False
+    for rule in rules:
+        if rule.matches(path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def _read_gitignore(path: str, base: str) -> list[_IgnoreRule]:
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        pattern = line.rstrip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        negate = pattern.startswith("!")
+        pattern = pattern.removeprefix("!").removeprefix("\\")
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            continue
+        # Patterns without an inner slash match at any depth.
+        anchored = "/" in pattern
+        regex = _translate(pattern.lstrip("/"))
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        rules.append(_IgnoreRule(base, re.compile(regex), negate, dir_only))
+    return rules
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            parts.append(".*" if pattern.startswith("**", i) else "[^/]*")
+            i += 2 if pattern.startswith("**", i) else 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            chars = pattern[i + 1 : end]
+            parts.append("[" + ("^" + chars[1:] if chars.startswith("!") else chars) + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
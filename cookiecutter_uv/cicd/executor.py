@@ -0,0 +1,123 @@
+"""Apply planned file edits in parallel with atomic writes."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cookiecutter_uv.cicd.defaults import MAX_WORKERS
+from cookiecutter_uv.cicd.profiling import span
+from cookiecutter_uv.cicd.pyproject import Edit, sorted_edits
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileEdit:
+    """The planned new content of a file and the number of updates it contains.
+
+    ``edits`` are the span edits that turn ``original`` into ``updated``.
+    """
+
+    path: Path
+    original: str
+    updated: str
+    count: int
+    edits: list[Edit] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.updated != self.original
+
+
+def merge_file_edits(edits: list[FileEdit]) -> list[FileEdit]:
+    """Combine edits of the same file planned one after another into a single edit.
+
+    A later edit of a file must have been planned from the content of the
+    earlier one, so the combined edit goes from the first original to the last
+    update. The spans of the later edits are moved back to offsets in the
+    first original. Raises ValueError if a later edit was planned from other
+    content, or if its spans overlap the earlier ones.
+    """
+    merged: dict[Path, FileEdit] = {}
+    for edit in edits:
+        previous = merged.get(edit.path)
+        if previous is None:
+            merged[edit.path] = edit
+            continue
+        if edit.original != previous.updated:
+            msg = f"Edits of {edit.path} were not planned one after another"
+            raise ValueError(msg)
+        try:
+            spans = sorted_edits(previous.edits + [_rebase(span, previous.edits) for span in edit.edits])
+        except ValueError as e:
+            msg = f"Edits of {edit.path} overlap: {e}"
+            raise ValueError(msg) from e
+        merged[edit.path] = FileEdit(edit.path, previous.original, edit.updated, previous.count + edit.count, spans)
+    return list(merged.values())
+
+
+def _rebase(edit: Edit, earlier: list[Edit]) -> Edit:
+    """Map an edit of the text produced by ``earlier`` back onto the text before them."""
+    shift = 0
+    for e in sorted(earlier, key=lambda e: e.start):
+        if e.start + shift + len(e.new) > edit.start:
+            break
+        shift += len(e.new) - len(e.old)
+    return Edit(edit.start - shift, edit.end - shift, edit.old, edit.new)
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Write content to a temporary file next to ``path`` and move it into place."""
+    with span("write", str(path)):
+        _write_atomic(path, content)
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        with contextlib.suppress(OSError):
+            os.chmod(tmp, path.stat().st_mode)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def apply_file_edits(edits: list[FileEdit], max_workers: int = MAX_WORKERS) -> None:
+    """Write all changed files in parallel.
+
+    Each file is replaced atomically. Files that were written are recorded in a
+    journal, and if any write fails they are restored to their original content
+    before the error is raised, so a failed run leaves no file half-updated.
+    """
+    pending = [edit for edit in edits if edit.changed]
+    if not pending:
+        return
+
+    journal: list[FileEdit] = []
+    errors: list[OSError] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(write_atomic, edit.path, edit.updated): edit for edit in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except OSError as e:
+                logger.error("Failed to write %s: %s", futures[future].path, e)  # noqa: TRY400
+                errors.append(e)
+            else:
+                journal.append(futures[future])
+
+    if errors:
+        for edit in journal:
+            logger.warning("Rolling back %s", edit.path)
+            write_atomic(edit.path, edit.original)
+        raise errors[0]
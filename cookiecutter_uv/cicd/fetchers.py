@@ -2,16 +2,50 @@
 
 from __future__ import annotations
 
+import http.client
 import json
-from dataclasses import dataclass
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.request import urlopen
+from urllib.parse import urlsplit
 
-TIMEOUT = 30
+from cookiecutter_uv.cicd.cache import CacheEntry, HttpCache
+from cookiecutter_uv.cicd.defaults import GITHUB_API_URL, MAX_WORKERS, PYPI_JSON_URL, PYPI_SIMPLE_URL
+from cookiecutter_uv.cicd.profiling import count, span
+from cookiecutter_uv.cicd.session import HttpSession
+from cookiecutter_uv.cicd.versions import latest_release
+
+logger = logging.getLogger(__name__)
+
+SIMPLE_JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2")
+GITHUB_TOKEN_VARIABLES = ("GITHUB_TOKEN", "GH_TOKEN")
 
 
 @dataclass
+class FetchSettings:
+    """Process-wide options for the fetchers."""
+
+    cache: HttpCache | None = None
+    session: HttpSession = field(default_factory=HttpSession)
+    # "json" reads the full /pypi/<package>/json document, "simple" the PEP 691 index page.
+    pypi_api: str = "json"
+    index_url: str = PYPI_SIMPLE_URL
+    pypi_url: str = PYPI_JSON_URL
+    github_api_url: str = GITHUB_API_URL
+    # "rest" makes one request per repository, "graphql" resolves all repositories in one query.
+    github_api: str = "rest"
+    # Falls back to the GITHUB_TOKEN and GH_TOKEN environment variables.
+    github_token: str | None = None
+
+
+settings = FetchSettings()
+
+
+@dataclass(frozen=True)
 class GitHubRepo:
     """A GitHub repository reference."""
 
@@ -21,40 +55,242 @@ class GitHubRepo:
     def __str__(self) -> str:
         return f"{self.owner}/{self.repo}"
 
+    @classmethod
+    def parse(cls, name: str) -> GitHubRepo:
+        """Parse an ``owner/repo`` string."""
+        owner, _, repo = name.partition("/")
+        return cls(owner=owner, repo=repo)
+
+
+@dataclass
+class ResolvedVersions:
+    """Latest versions for a set of PyPI packages and GitHub repositories."""
+
+    pypi: dict[str, str | None] = field(default_factory=dict)
+    releases: dict[GitHubRepo, str | None] = field(default_factory=dict)
+    tags: dict[GitHubRepo, str | None] = field(default_factory=dict)
+    # Commit SHAs of action refs, recorded so action references can be pinned without network access.
+    commits: dict[tuple[GitHubRepo, str], str | None] = field(default_factory=dict)
+
 
 def get_pypi_version(package: str) -> str | None:
     """Get the latest version of a package from PyPI."""
-    data = _fetch_json(f"https://pypi.org/pypi/{package}/json")
+    if settings.pypi_api == "simple":
+        return get_simple_index_version(package, settings.index_url)
+
+    data = _fetch_json(f"{settings.pypi_url}/{package}/json")
     if data:
         version: str | None = data.get("info", {}).get("version")
         return version
     return None
 
 
+def get_simple_index_version(package: str, index_url: str = PYPI_SIMPLE_URL) -> str | None:
+    """Get the latest final, non-yanked version of a package from a PEP 691 JSON index."""
+    data = _fetch_json(f"{index_url.rstrip('/')}/{package}/", accept=SIMPLE_JSON_CONTENT_TYPE)
+    if not data:
+        return None
+
+    available = set()
+    for file in data.get("files", []):
+        version = _version_from_filename(file.get("filename", ""))
+        if version and not file.get("yanked"):
+            available.add(version)
+    return latest_release(list(available))
+
+
+def _version_from_filename(filename: str) -> str | None:
+    """Extract the version from a wheel or sdist filename."""
+    if filename.endswith(".whl"):
+        parts = filename.split("-")
+        return parts[1] if len(parts) >= 5 else None
+    for suffix in SDIST_SUFFIXES:
+        if filename.endswith(suffix):
+            _, _, version = filename[: -len(suffix)].rpartition("-")
+            return version or None
+    return None
+
+
 def get_github_release(repo: GitHubRepo) -> str | None:
     """Get the latest release tag from GitHub."""
-    data = _fetch_json(f"https://api.github.com/repos/{repo}/releases/latest")
+    data = _fetch_json(f"{settings.github_api_url}/repos/{repo}/releases/latest")
     if data:
-        tag = data.get("tag_name", "")
-        return tag.lstrip("v") if tag else None
+        return _strip_tag(data.get("tag_name"))
     return None
 
 
 def get_github_tag(repo: GitHubRepo) -> str | None:
     """Get the latest tag from GitHub (for repos without releases)."""
-    data = _fetch_json(f"https://api.github.com/repos/{repo}/tags")
+    data = _fetch_json(f"{settings.github_api_url}/repos/{repo}/tags")
     if data and len(data) > 0:
-        tag = data[0].get("name", "")
-        return tag.lstrip("v") if tag else None
+        return _strip_tag(data[0].get("name"))
+    return None
+
+
+def get_github_commit(repo: GitHubRepo, ref: str) -> str | None:
+    """Get the SHA of the commit a tag or branch points to."""
+    data = _fetch_json(f"{settings.github_api_url}/repos/{repo}/commits/{ref}")
+    if data:
+        sha: str | None = data.get("sha")
+        return sha
     return None
 
 
-def _fetch_json(url: str) -> Any:
-    """Fetch JSON from a URL."""
+def get_github_versions(
+    release_repos: list[GitHubRepo], tag_repos: list[GitHubRepo]
+) -> tuple[dict[GitHubRepo, str | None], dict[GitHubRepo, str | None]] | None:
+    """Get the latest release and tag of many repositories with a single GraphQL query.
+
+    Every repository is queried under its own alias. Returns the releases and
+    tags keyed by repository, or None if the query failed as a whole, e.g.
+    because no token is available; repositories that could not be resolved
+    individually map to None.
+    """
+    token = github_token()
+    if token is None:
+        logger.warning("The GitHub GraphQL API requires a token; set GITHUB_TOKEN or GH_TOKEN.")
+        return None
+
+    repos = list(dict.fromkeys([*release_repos, *tag_repos]))
+    if not repos:
+        return {}, {}
+    release_set, tag_set = set(release_repos), set(tag_repos)
+    fields = []
+    for i, repo in enumerate(repos):
+        selection = []
+        if repo in release_set:
+            selection.append("latestRelease { tagName }")
+        if repo in tag_set:
+            selection.append(
+                'refs(refPrefix: "refs/tags/", first: 1, orderBy: {field: TAG_COMMIT_DATE, direction: DESC})'
+                " { nodes { name } }"
+            )
+        fields.append(
+            f"r{i}: repository(owner: {json.dumps(repo.owner)}, name: {json.dumps(repo.repo)}) "
+            f"{{ {' '.join(selection)} }}"
+        )
+
+    data = _post_json(
+        f"{settings.github_api_url}/graphql",
+        {"query": "query { " + " ".join(fields) + " }"},
+        {"Authorization": f"bearer {token}"},
+    )
+    if not isinstance(data, dict) or not isinstance(data.get("data"), dict):
+        return None
+
+    releases: dict[GitHubRepo, str | None] = {}
+    tags: dict[GitHubRepo, str | None] = {}
+    for i, repo in enumerate(repos):
+        node = data["data"].get(f"r{i}") or {}
+        if repo in release_set:
+            releases[repo] = _strip_tag((node.get("latestRelease") or {}).get("tagName"))
+        if repo in tag_set:
+            nodes = (node.get("refs") or {}).get("nodes") or []
+            tags[repo] = _strip_tag(nodes[0].get("name") if nodes else None)
+    return releases, tags
+
+
+def github_token() -> str | None:
+    """The configured GitHub token, or the first one set in the environment."""
+    if settings.github_token:
+        return settings.github_token
+    return next((os.environ[name] for name in GITHUB_TOKEN_VARIABLES if os.environ.get(name)), None)
+
+
+def _strip_tag(tag: str | None) -> str | None:
+    return tag.lstrip("v") if tag else None
+
+
+def fetch_versions(
+    packages: list[str],
+    release_repos: list[GitHubRepo],
+    tag_repos: list[GitHubRepo],
+    max_workers: int = MAX_WORKERS,
+) -> ResolvedVersions:
+    """Resolve all PyPI and GitHub versions concurrently.
+
+    Lookups run on a thread pool of at most ``max_workers`` threads, so the
+    wall-clock time is bounded by the slowest requests rather than their sum.
+    With ``settings.github_api == "graphql"`` all GitHub repositories are
+    resolved by one query instead, falling back to REST if that query fails.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        pypi = {package: pool.submit(get_pypi_version, package) for package in dict.fromkeys(packages)}
+
+        batch = get_github_versions(release_repos, tag_repos) if settings.github_api == "graphql" else None
+        if batch is not None:
+            github_releases, github_tags = batch
+        else:
+            releases = {repo: pool.submit(get_github_release, repo) for repo in dict.fromkeys(release_repos)}
+            tags = {repo: pool.submit(get_github_tag, repo) for repo in dict.fromkeys(tag_repos)}
+            github_releases = {repo: future.result() for repo, future in releases.items()}
+            github_tags = {repo: future.result() for repo, future in tags.items()}
+
+        return ResolvedVersions(
+            pypi={package: future.result() for package, future in pypi.items()},
+            releases=github_releases,
+            tags=github_tags,
+        )
+
+
+def _fetch_json(url: str, accept: str = "application/json") -> Any:
+    """Fetch JSON from a URL, going through the response cache if one is configured."""
     if not url.startswith(("https://", "http://")):
         return None
+
+    cache = settings.cache
+    entry = cache.get(url) if cache else None
+    if cache and entry and entry.is_fresh(cache.ttl):
+        count("cache.hit")
+        return json.loads(entry.body)
+
+    headers = {"Accept": accept, **(entry.conditional_headers() if entry else {})}
+    try:
+        with span("fetch", urlsplit(url).netloc, url=url):
+            response = settings.session.get(url, headers)
+    except (OSError, http.client.HTTPException):
+        return None
+
+    if response.status == 304 and cache and entry:
+        count("cache.revalidated")
+        cache.refresh(entry)
+        return json.loads(entry.body)
+    if response.status != 200:
+        return None
+
+    try:
+        body = response.body.decode()
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+
+    if cache:
+        count("cache.miss")
+        cache.put(
+            CacheEntry(
+                url=url,
+                body=body,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                fetched_at=time.time(),
+            )
+        )
+    return data
+
+
+def _post_json(url: str, payload: Any, headers: dict[str, str]) -> Any:
+    """POST a JSON payload and decode the JSON response. Responses are not cached."""
+    body = json.dumps(payload).encode()
+    headers = {"Accept": "application/json", "Content-Type": "application/json", **headers}
+    try:
+        with span("fetch", urlsplit(url).netloc, url=url):
+            response = settings.session.request("POST", url, headers, body)
+    except (OSError, http.client.HTTPException):
+        return None
+    if response.status != 200:
+        logger.warning("%s returned HTTP %s", url, response.status)
+        return None
     try:
-        with urlopen(url, timeout=TIMEOUT) as response:  # noqa: S310
-            return json.loads(response.read().decode())
-    except (HTTPError, URLError, json.JSONDecodeError):
+        return json.loads(response.body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
         return None
@@ -0,0 +1,89 @@
+"""Update plans: the edits of a run, saved to be applied later or shown as a diff."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from cookiecutter_uv.cicd.executor import FileEdit
+from cookiecutter_uv.cicd.pyproject import Edit, apply_edits, sorted_edits
+
+PLAN_FORMAT = 1
+
+
+def plan_to_dict(edits: list[FileEdit]) -> dict[str, Any]:
+    """Describe the changed files and their span edits as JSON-serializable data.
+
+    Paths are absolute, so the plan can be applied from any directory.
+    """
+    return {
+        "format": PLAN_FORMAT,
+        "files": [
+            {
+                "path": str(edit.path.resolve()),
+                "sha256": _sha256(edit.original),
+                "count": edit.count,
+                "edits": [
+                    {"start": span.start, "end": span.end, "old": span.old, "new": span.new} for span in edit.edits
+                ],
+            }
+            for edit in edits
+            if edit.changed
+        ],
+    }
+
+
+def save_plan(edits: list[FileEdit], path: Path) -> None:
+    path.write_text(json.dumps(plan_to_dict(edits), indent=2) + "\n")
+
+
+def load_plan(path: Path) -> list[FileEdit]:
+    """Read a plan and rebuild its file edits from the files on disk.
+
+    Nothing is fetched or parsed: the recorded spans are applied to the current
+    content. Raises ValueError if a file no longer has the content the plan
+    was made from, or if its spans overlap, and OSError if a file cannot be read.
+    """
+    data = json.loads(path.read_text())
+    if data.get("format") != PLAN_FORMAT:
+        msg = f"Unsupported plan format in {path}: {data.get('format')!r}"
+        raise ValueError(msg)
+
+    file_edits = []
+    for entry in data.get("files", []):
+        filepath = Path(entry["path"])
+        original = filepath.read_text()
+        spans = [Edit(span["start"], span["end"], span["old"], span["new"]) for span in entry["edits"]]
+        if _sha256(original) != entry["sha256"] or any(original[s.start : s.end] != s.old for s in spans):
+            msg = f"{filepath} has changed since the plan was made"
+            raise ValueError(msg)
+        try:
+            spans = sorted_edits(spans)
+        except ValueError as e:
+            msg = f"The plan has overlapping edits of {filepath}: {e}"
+            raise ValueError(msg) from e
+        file_edits.append(FileEdit(filepath, original, apply_edits(original, spans), entry["count"], spans))
+    return file_edits
+
+
+def unified_diff(edits: list[FileEdit]) -> str:
+    """Render the changed files as one unified diff."""
+    return "".join(
+        "".join(
+            difflib.unified_diff(
+                edit.original.splitlines(keepends=True),
+                edit.updated.splitlines(keepends=True),
+                fromfile=str(edit.path),
+                tofile=str(edit.path),
+            )
+        )
+        for edit in edits
+        if edit.changed
+    )
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
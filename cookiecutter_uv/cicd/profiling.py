@@ -0,0 +1,133 @@
+"""Timing spans and counters for diagnosing slow update runs.
+
+Instrumented code calls ``span`` and ``count`` unconditionally; both are
+no-ops until ``profiler.enabled`` is set, which the CLI does for ``--profile``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Span:
+    """A timed operation. ``category`` is the phase (fetch, read, match, write), ``name`` what it ran on."""
+
+    category: str
+    name: str
+    start: float
+    duration: float
+    thread: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Profiler:
+    """Collects spans and counters from any thread."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: list[Span] = []
+        self.counters: Counter[str] = Counter()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = []
+            self.counters = Counter()
+            self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, category: str, name: str, **args: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.spans.append(Span(category, name, start - self._origin, duration, threading.get_ident(), args))
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def summary(self, limit: int = 20) -> str:
+        """A table of the total time per category and name, slowest first, followed by the counters."""
+        totals: dict[tuple[str, str], list[float]] = {}
+        for span in self.spans:
+            totals.setdefault((span.category, span.name), []).append(span.duration)
+
+        rows = sorted(totals.items(), key=lambda item: sum(item[1]), reverse=True)
+        lines = [f"{'category':<10} {'name':<50} {'calls':>6} {'total ms':>10} {'max ms':>10}"]
+        for (category, name), durations in rows[:limit]:
+            lines.append(
+                f"{category:<10} {_shorten(name, 50):<50} {len(durations):>6} "
+                f"{sum(durations) * 1000:>10.1f} {max(durations) * 1000:>10.1f}"
+            )
+        if len(rows) > limit:
+            lines.append(f"... {len(rows) - limit} more")
+
+        by_category: dict[str, float] = {}
+        for span in self.spans:
+            by_category[span.category] = by_category.get(span.category, 0.0) + span.duration
+        lines.append("")
+        lines.extend(
+            f"{category:<10} {seconds * 1000:>10.1f} ms"
+            for category, seconds in sorted(by_category.items(), key=lambda item: item[1], reverse=True)
+        )
+        lines.extend(f"{name:<30} {value:>8}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The spans as complete events in the Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+        events.extend(
+            {"name": name, "ph": "C", "ts": 0, "pid": pid, "args": {"value": value}}
+            for name, value in self.counters.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path: Path) -> None:
+        path.write_text(json.dumps(self.chrome_trace()) + "\n")
+
+
+profiler = Profiler()
+
+
+def span(category: str, name: str, **args: Any) -> contextlib.AbstractContextManager[None]:
+    """Time the enclosed block if profiling is enabled."""
+    if not profiler.enabled:
+        return contextlib.nullcontext()
+    return profiler.span(category, name, **args)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter if profiling is enabled."""
+    if profiler.enabled:
+        profiler.count(name, n)
+
+
+def _shorten(text: str, width: int) -> str:
+    return text if len(text) <= width else "..." + text[-(width - 3) :]
@@ -0,0 +1,294 @@
+"""Format-preserving index of the dependency specifiers in a pyproject.toml file.
+
+The scanner understands just enough TOML to find every dependency array
+(``[project]``, ``[project.optional-dependencies]``, ``[dependency-groups]``,
+``[build-system]`` and uv's ``[tool.uv]`` lists) and records where each
+requirement string and its version clauses live in the original text. Jinja
+tags outside of strings are skipped, so template files can be indexed too.
+Updates are applied as span edits, leaving the rest of the file untouched.
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from cookiecutter_uv.cicd.versions import release_key
+
+_TOKEN = re.compile(
+    r"""
+    (?P<ws>[ \t\r]+)
+    |(?P<newline>\n)
+    |(?P<comment>\#[^\n]*)
+    |(?P<jinja>\{%.*?%\}|\{\{.*?\}\}|\{\#.*?\#\})
+    |(?P<multiline>\"\"\".*?\"\"\"|'''.*?''')
+    |(?P<string>"(?:[^"\\\n]|\\.)*"|'[^'\n]*')
+    |(?P<punct>[\[\]{}=,.])
+    |(?P<bare>[A-Za-z0-9_+:\-]+)
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_SKIPPED = {"ws", "comment", "jinja"}
+
+_REQUIREMENT = re.compile(
+    r"\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?P<extras>\[[^\]]*\])?(?P<specifier>[^;@]*)(?P<marker>;.*)?",
+    re.DOTALL,
+)
+_CLAUSE = re.compile(r"\s*(?P<operator>~=|===|==|!=|<=|>=|<|>)\s*(?P<version>[^,;\s]+)\s*")
+
+# Operators whose version is moved forward when a newer release is available.
+_LOWER_BOUNDS = ("==", ">=", "~=")
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Edit:
+    """Replacement of ``old`` by ``new`` at ``text[start:end]``."""
+
+    start: int
+    end: int
+    old: str
+    new: str
+
+
+@dataclass(frozen=True)
+class Clause:
+    """One version clause of a specifier, e.g. ``>=1.0``."""
+
+    operator: str
+    version: str
+    start: int
+    end: int
+
+
+@dataclass
+class Requirement:
+    """A dependency string and the location of its version clauses in the file."""
+
+    name: str
+    extras: str
+    clauses: list[Clause]
+    section: str
+    start: int
+    end: int
+
+    @property
+    def key(self) -> str:
+        return normalize_name(self.name)
+
+    def bump(self, version: str) -> Edit | None:
+        """Return the edit that moves this requirement to ``version``, if it applies.
+
+        The first ``==``, ``>=`` or ``~=`` clause is rewritten; upper bounds and
+        exclusions are kept and the bump is skipped when ``version`` would
+        violate them, or when it is not newer than the current version.
+        """
+        clause = next((c for c in self.clauses if c.operator in _LOWER_BOUNDS), None)
+        if clause is None or clause.version.endswith(".*"):
+            return None
+
+        new_version = version
+        if clause.operator == "~=":
+            precision = max(2, len(clause.version.split(".")))
+            new_version = ".".join(version.split(".")[:precision])
+
+        current_key, new_key = release_key(clause.version), release_key(new_version)
+        if current_key is None or new_key is None or new_key <= current_key:
+            return None
+        if not all(_allows(c, new_version) for c in self.clauses if c is not clause):
+            return None
+        return Edit(clause.start, clause.end, clause.version, new_version)
+
+
+@dataclass
+class DependencyIndex:
+    """All dependency requirements in a file, found in a single scan."""
+
+    requirements: list[Requirement] = field(default_factory=list)
+
+    def find(self, name: str) -> list[Requirement]:
+        key = normalize_name(name)
+        return [requirement for requirement in self.requirements if requirement.key == key]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a project name as described in PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def sorted_edits(edits: list[Edit]) -> list[Edit]:
+    """Sort edits by position. Raises ValueError if two of them replace the same text.
+
+    Two edits at the same offset overlap even if they are insertions, since
+    the order they apply in is ambiguous.
+    """
+    ordered = sorted(edits, key=lambda e: (e.start, e.end))
+    for previous, edit in itertools.pairwise(ordered):
+        if edit.start < previous.end or edit.start == previous.start:
+            msg = f"Overlapping edits at {previous.start}:{previous.end} and {edit.start}:{edit.end}"
+            raise ValueError(msg)
+    return ordered
+
+
+def apply_edits(text: str, edits: list[Edit]) -> str:
+    """Apply non-overlapping edits to text. Raises ValueError if edits overlap."""
+    parts = []
+    position = 0
+    for edit in sorted_edits(edits):
+        parts.append(text[position : edit.start])
+        parts.append(edit.new)
+        position = edit.end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def parse_dependencies(text: str) -> DependencyIndex:
+    """Index every dependency requirement in a pyproject.toml document."""
+    tokens = [token for token in _tokenize(text) if token.kind not in _SKIPPED]
+    index = DependencyIndex()
+    table = ""
+    i = 0
+
+    while i < len(tokens):
+        token = tokens[i]
+        if token.kind == "newline":
+            i += 1
+        elif token.text == "[":
+            end = _end_of_line(tokens, i)
+            table = _join_key([t for t in tokens[i:end] if t.kind in ("bare", "string") or t.text == "."])
+            i = end
+        else:
+            equals = i
+            while equals < len(tokens) and tokens[equals].text != "=" and tokens[equals].kind != "newline":
+                equals += 1
+            if equals == len(tokens) or tokens[equals].text != "=":
+                i = equals
+                continue
+
+            key = _join_key(tokens[i:equals])
+            section = f"{table}.{key}" if table else key
+            i = equals + 1
+            if i < len(tokens) and tokens[i].text == "[" and _is_dependency_array(section):
+                i = _read_array(tokens, i, section, index)
+            else:
+                i = _skip_value(tokens, i)
+
+    return index
+
+
+def _tokenize(text: str) -> Iterator[_Token]:
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup or "other"
+        yield _Token(kind, match.group(), match.start(), match.end())
+
+
+def _unquote(token: _Token) -> str:
+    return token.text[1:-1] if token.kind == "string" else token.text
+
+
+def _join_key(tokens: list[_Token]) -> str:
+    return ".".join(_unquote(t) for t in tokens if t.kind in ("bare", "string"))
+
+
+def _is_dependency_array(section: str) -> bool:
+    return (
+        section in ("project.dependencies", "build-system.requires")
+        or section.startswith(("project.optional-dependencies.", "dependency-groups."))
+        or section in ("tool.uv.dev-dependencies", "tool.uv.constraint-dependencies", "tool.uv.override-dependencies")
+    )
+
+
+def _end_of_line(tokens: list[_Token], i: int) -> int:
+    while i < len(tokens) and tokens[i].kind != "newline":
+        i += 1
+    return i
+
+
+def _skip_value(tokens: list[_Token], i: int) -> int:
+    """Skip a value, including multi-line arrays and inline tables."""
+    depth = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.text in ("[", "{"):
+            depth += 1
+        elif token.text in ("]", "}"):
+            depth -= 1
+        elif token.kind == "newline" and depth <= 0:
+            break
+        i += 1
+    return i
+
+
+def _read_array(tokens: list[_Token], i: int, section: str, index: DependencyIndex) -> int:
+    """Collect the requirement strings of the array starting at ``tokens[i]``."""
+    depth = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.text in ("[", "{"):
+            depth += 1
+        elif token.text in ("]", "}"):
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        elif token.kind == "string" and depth == 1:
+            requirement = _parse_requirement(token, section)
+            if requirement is not None:
+                index.requirements.append(requirement)
+        i += 1
+    return i
+
+
+def _parse_requirement(token: _Token, section: str) -> Requirement | None:
+    content = _unquote(token)
+    if "\\" in content:
+        return None
+    match = _REQUIREMENT.fullmatch(content)
+    if not match:
+        return None
+
+    offset = token.start + 1
+    specifier_start = match.start("specifier")
+    clauses = []
+    for part in re.finditer(r"[^,]+", match.group("specifier")):
+        clause = _CLAUSE.fullmatch(part.group())
+        if clause is None:
+            if part.group().strip():
+                return None
+            continue
+        start = offset + specifier_start + part.start() + clause.start("version")
+        clauses.append(Clause(clause.group("operator"), clause.group("version"), start, start + len(clause["version"])))
+
+    return Requirement(
+        name=match.group("name"),
+        extras=match.group("extras") or "",
+        clauses=clauses,
+        section=section,
+        start=offset,
+        end=token.end - 1,
+    )
+
+
+def _allows(clause: Clause, version: str) -> bool:
+    """Check that ``version`` satisfies an existing clause."""
+    bound, candidate = release_key(clause.version), release_key(version)
+    if bound is None or candidate is None:
+        return False
+    if clause.operator == "<":
+        return candidate < bound
+    if clause.operator == "<=":
+        return candidate <= bound
+    if clause.operator == ">":
+        return candidate > bound
+    if clause.operator == "!=":
+        return candidate != bound
+    return clause.operator in _LOWER_BOUNDS and candidate >= bound
@@ -0,0 +1,145 @@
+"""HTTP session with persistent connections for the fetchers."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+from cookiecutter_uv.cicd.profiling import count
+
+TIMEOUT = 30
+RETRIES = 3
+BACKOFF = 0.5
+MAX_REDIRECTS = 5
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+_ConnectionKey = tuple[str, str, int]
+
+
+@dataclass
+class Response:
+    """A fully read HTTP response. Header names are lower-case."""
+
+    status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class HttpSession:
+    """Reuses connections per host, retries transient failures and decodes gzip bodies.
+
+    Connections are kept in a pool per (scheme, host, port) and handed out to
+    one request at a time, so a session can be shared between threads.
+    """
+
+    def __init__(self, timeout: float = TIMEOUT, retries: int = RETRIES, backoff: float = BACKOFF) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._pool: dict[_ConnectionKey, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> Response:
+        return self.request("GET", url, headers)
+
+    def request(
+        self, method: str, url: str, headers: dict[str, str] | None = None, body: bytes | None = None
+    ) -> Response:
+        """Send a request, following redirects. Raises OSError or HTTPException once retries are exhausted.
+
+        The Authorization header is dropped when a redirect leads to another
+        host, so a token is only ever sent to the host it was meant for.
+        """
+        host = urlsplit(url).hostname
+        headers = headers or {}
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request_with_retries(method, url, headers, body)
+            location = response.headers.get("location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            url = urljoin(url, location)
+            if urlsplit(url).hostname != host:
+                headers = {name: value for name, value in headers.items() if name.lower() != "authorization"}
+            if response.status == 303:
+                method, body = "GET", None
+        return response
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pool, self._pool = self._pool, {}
+        for connections in pool.values():
+            for connection in connections:
+                connection.close()
+
+    def _request_with_retries(self, method: str, url: str, headers: dict[str, str], body: bytes | None) -> Response:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = {"Accept-Encoding": "gzip", "User-Agent": "cookiecutter-uv", **headers}
+
+        attempt = 0
+        while True:
+            connection = self._acquire(key)
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                raw = connection.getresponse()
+                data = raw.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if attempt >= self.retries:
+                    raise
+                count("http.retries")
+                self._sleep(attempt)
+                attempt += 1
+                continue
+
+            if raw.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+
+            response = Response(raw.status, {name.lower(): value for name, value in raw.getheaders()}, data)
+            if response.status in RETRY_STATUSES and attempt < self.retries:
+                count("http.retries")
+                self._sleep(attempt, response.headers.get("retry-after"))
+                attempt += 1
+                continue
+
+            if response.headers.get("content-encoding") == "gzip":
+                response.body = gzip.decompress(response.body)
+            return response
+
+    def _sleep(self, attempt: int, retry_after: str | None = None) -> None:
+        delay = self.backoff * 2**attempt
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        time.sleep(delay)
+
+    def _acquire(self, key: _ConnectionKey) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._pool.get(key)
+            if idle:
+                return idle.pop()
+
+        count("http.connections")
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key: _ConnectionKey, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._pool.setdefault(key, []).append(connection)
@@ -0,0 +1,43 @@
+"""Snapshots of resolved versions for reproducible, offline update runs."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cookiecutter_uv.cicd.fetchers import GitHubRepo, ResolvedVersions
+
+SNAPSHOT_FORMAT = 1
+
+
+def save_snapshot(versions: ResolvedVersions, path: Path) -> None:
+    """Write resolved versions to a JSON snapshot file."""
+    data = {
+        "format": SNAPSHOT_FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "pypi": versions.pypi,
+        "releases": {str(repo): version for repo, version in versions.releases.items()},
+        "tags": {str(repo): version for repo, version in versions.tags.items()},
+        "commits": {f"{repo}@{ref}": sha for (repo, ref), sha in versions.commits.items()},
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def load_snapshot(path: Path) -> ResolvedVersions:
+    """Read resolved versions from a snapshot file written by ``save_snapshot``."""
+    data = json.loads(path.read_text())
+    if data.get("format") != SNAPSHOT_FORMAT:
+        msg = f"Unsupported snapshot format in {path}: {data.get('format')!r}"
+        raise ValueError(msg)
+    return ResolvedVersions(
+        pypi=dict(data.get("pypi", {})),
+        releases={GitHubRepo.parse(name): version for name, version in data.get("releases", {}).items()},
+        tags={GitHubRepo.parse(name): version for name, version in data.get("tags", {}).items()},
+        commits={_parse_commit_ref(name): sha for name, sha in data.get("commits", {}).items()},
+    )
+
+
+def _parse_commit_ref(name: str) -> tuple[GitHubRepo, str]:
+    repo, _, ref = name.partition("@")
+    return GitHubRepo.parse(repo), ref
@@ -0,0 +1,158 @@
+"""State of earlier update runs, used to skip files that cannot have changed.
+
+For every file the state records its size, modification time and content
+hash, together with the versions of the dependencies it referenced when it was
+last processed. A file needs processing again only if its content changed or
+one of those versions moved. The state also records a fingerprint of the
+tracked dependencies and of the options that change how files are updated;
+if either changed, every file is processed again.
+
+Versions are identified by keys such as ``pypi:pytest``, ``release:astral-sh/uv``
+and ``tag:pre-commit/pre-commit-hooks``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from cookiecutter_uv.cicd.config import PRECOMMIT_HOOKS, PYPI_PACKAGES, UV_REPO
+from cookiecutter_uv.cicd.fetchers import GitHubRepo, ResolvedVersions
+
+STATE_FORMAT = 1
+
+
+def pypi_key(package: str) -> str:
+    return f"pypi:{package}"
+
+
+def github_release_key(repo: GitHubRepo) -> str:
+    return f"release:{repo}"
+
+
+def github_tag_key(repo: GitHubRepo) -> str:
+    return f"tag:{repo}"
+
+
+def lookup_version(versions: ResolvedVersions, key: str) -> str | None:
+    """Return the version a key refers to, or None if it was not resolved."""
+    kind, _, name = key.partition(":")
+    if kind == "pypi":
+        return versions.pypi.get(name)
+    if kind == "release":
+        return versions.releases.get(GitHubRepo.parse(name))
+    if kind == "tag":
+        return versions.tags.get(GitHubRepo.parse(name))
+    return None
+
+
+def tracking_fingerprint(**options: object) -> str:
+    """A hash of the tracked dependencies in config.py and of ``options``."""
+    tracked = {
+        "pypi": sorted(PYPI_PACKAGES),
+        "uv": str(UV_REPO),
+        "hooks": sorted(f"{url} {repo}" for url, repo in PRECOMMIT_HOOKS),
+        "options": options,
+    }
+    return _sha256(json.dumps(tracked, sort_keys=True).encode())
+
+
+@dataclass
+class FileState:
+    """What a file looked like after it was last processed."""
+
+    sha256: str
+    size: int
+    mtime_ns: int
+    versions: dict[str, str | None] = field(default_factory=dict)
+
+
+class UpdateState:
+    """Per-file hashes and applied versions, persisted as JSON between runs."""
+
+    def __init__(self, files: dict[str, FileState] | None = None, fingerprint: str | None = None) -> None:
+        self.files = files or {}
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def load(cls, path: Path) -> UpdateState:
+        """Read a state file. A missing file is an empty state."""
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        if data.get("format") != STATE_FORMAT:
+            msg = f"Unsupported state format in {path}: {data.get('format')!r}"
+            raise ValueError(msg)
+        files = {name: FileState(**entry) for name, entry in data.get("files", {}).items()}
+        return cls(files, data.get("fingerprint"))
+
+    def save(self, path: Path) -> None:
+        data = {
+            "format": STATE_FORMAT,
+            "fingerprint": self.fingerprint,
+            "files": {name: asdict(entry) for name, entry in sorted(self.files.items())},
+        }
+        path.write_text(json.dumps(data, indent=2) + "\n")
+
+    def track(self, fingerprint: str) -> bool:
+        """Forget all files if they were recorded with another fingerprint. Returns whether any were forgotten."""
+        if fingerprint == self.fingerprint:
+            return False
+        forgotten = bool(self.files)
+        self.files = {}
+        self.fingerprint = fingerprint
+        return forgotten
+
+    @staticmethod
+    def _name(path: Path) -> str:
+        return str(path.resolve())
+
+    def unchanged(self, path: Path) -> bool:
+        """Check whether ``path`` still has the content it had when it was recorded.
+
+        The size and modification time are compared first, so unchanged files
+        are usually not read at all.
+        """
+        entry = self.files.get(self._name(path))
+        if entry is None:
+            return False
+        try:
+            stat = path.stat()
+            if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+                return True
+            return stat.st_size == entry.size and _sha256(path.read_bytes()) == entry.sha256
+        except OSError:
+            return False
+
+    def keys(self, path: Path) -> list[str]:
+        """The version keys recorded for ``path``."""
+        entry = self.files.get(self._name(path))
+        return list(entry.versions) if entry else []
+
+    def releases(self, path: Path) -> list[GitHubRepo]:
+        """The repositories whose latest release was recorded for ``path``."""
+        return [GitHubRepo.parse(key.removeprefix("release:")) for key in self.keys(path) if key.startswith("release:")]
+
+    def outdated(self, path: Path, versions: ResolvedVersions) -> bool:
+        """Whether a version ``path`` referenced when it was recorded has moved since."""
+        entry = self.files.get(self._name(path))
+        if entry is None:
+            return True
+        return any(lookup_version(versions, key) != version for key, version in entry.versions.items())
+
+    def record(self, path: Path, keys: set[str], versions: ResolvedVersions) -> None:
+        """Record the current content of ``path`` and the versions of the given keys."""
+        stat = os.stat(path)
+        self.files[self._name(path)] = FileState(
+            sha256=_sha256(path.read_bytes()),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            versions={key: lookup_version(versions, key) for key in sorted(keys)},
+        )
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from cookiecutter_uv.cicd.config import (
@@ -11,65 +13,125 @@ from cookiecutter_uv.cicd.config import (
     PYPI_PACKAGES,
     UV_REPO,
 )
-from cookiecutter_uv.cicd.fetchers import get_github_release, get_github_tag, get_pypi_version
+from cookiecutter_uv.cicd.defaults import MAX_WORKERS
+from cookiecutter_uv.cicd.executor import FileEdit, apply_file_edits
+from cookiecutter_uv.cicd.fetchers import (
+    GitHubRepo,
+    ResolvedVersions,
+    fetch_versions,
+    get_github_commit,
+    get_github_release,
+    get_github_tag,
+    get_pypi_version,
+)
+from cookiecutter_uv.cicd.profiling import span
+from cookiecutter_uv.cicd.pyproject import Edit, apply_edits, normalize_name, parse_dependencies
+from cookiecutter_uv.cicd.state import github_release_key, github_tag_key, pypi_key
+from cookiecutter_uv.cicd.versions import release_key
 
 logger = logging.getLogger(__name__)
 
 
+_USES = re.compile(
+    r"^[ \t]*(?:-[ \t]+)?uses:[ \t]*(?P<quote>[\"']?)"
+    r"(?P<owner>[A-Za-z0-9_.-]+)/(?P<repo>[A-Za-z0-9_.-]+)(?:/[^@\s\"']*)?@(?P<ref>[^\s\"'#]+)(?P=quote)"
+    r"(?P<comment>[ \t]+#[ \t]*(?P<comment_ref>\S+)[^\n]*)?",
+    re.MULTILINE,
+)
+_SHA = re.compile(r"[0-9a-f]{40}")
+
+
+def resolve_versions(max_workers: int = MAX_WORKERS, action_repos: list[GitHubRepo] | None = None) -> ResolvedVersions:
+    """Fetch the latest version of everything tracked in the config in one batch.
+
+    ``action_repos`` are the repositories referenced by workflow ``uses:`` lines,
+    resolved to their latest release along with uv.
+    """
+    return fetch_versions(
+        PYPI_PACKAGES,
+        [UV_REPO, *(action_repos or [])],
+        [github_repo for _, github_repo in PRECOMMIT_HOOKS],
+        max_workers=max_workers,
+    )
+
+
 class PyprojectTomlUpdater:
     """Updates package versions in pyproject.toml files."""
 
-    def __init__(self, files: list[Path]) -> None:
+    def __init__(self, files: list[Path], versions: ResolvedVersions | None = None) -> None:
         self.files = files
+        self.versions = versions
 
-    @staticmethod
-    def _build_pattern(package: str) -> str:
-        return rf'("{re.escape(package)}(?:\[[^\]]*\])?)>=([^"]+)"'
+    def _get_version(self, package: str) -> str | None:
+        if self.versions is not None:
+            return self.versions.pypi.get(package)
+        return get_pypi_version(package)
 
     @staticmethod
-    def _build_replacement(version: str) -> str:
-        return f'\\g<1>>={version}"'
-
-    def _update_file(self, filepath: Path, package: str, version: str) -> bool:
-        """Update a single package in a pyproject.toml file. Returns True if updated."""
-        content = filepath.read_text()
-        pattern = self._build_pattern(package)
-        replacement = self._build_replacement(version)
-        new_content, count = re.subn(pattern, replacement, content)
-
-        if count > 0 and new_content != content:
-            filepath.write_text(new_content)
-            return True
-        return False
-
-    def _matches(self, filepath: Path, package: str) -> bool:
-        """Check if file contains the package pattern."""
-        content = filepath.read_text()
-        return bool(re.search(self._build_pattern(package), content))
+    def _plan_edits(content: str, versions: dict[str, str]) -> tuple[list[Edit], dict[str, Edit]]:
+        """Find the version edits for all tracked packages. Returns (edits, first edit per updated package)."""
+        tracked = {normalize_name(package): package for package in versions}
+        edits = []
+        updated: dict[str, Edit] = {}
+
+        for requirement in parse_dependencies(content).requirements:
+            package = tracked.get(requirement.key)
+            if package is None:
+                continue
+            edit = requirement.bump(versions[package])
+            if edit is not None:
+                edits.append(edit)
+                updated.setdefault(package, edit)
 
-    def update(self, dry_run: bool = False) -> int:
-        """Update all pyproject.toml files. Returns count of updates."""
-        update_count = 0
+        return edits, updated
 
+    @staticmethod
+    def keys(content: str) -> set[str]:
+        """The version keys of the tracked packages a file depends on."""
+        tracked = {normalize_name(package): package for package in PYPI_PACKAGES}
+        return {
+            pypi_key(tracked[requirement.key])
+            for requirement in parse_dependencies(content).requirements
+            if requirement.key in tracked
+        }
+
+    def _resolve(self) -> dict[str, str]:
+        versions = {}
         for package in PYPI_PACKAGES:
-            version = get_pypi_version(package)
+            version = self._get_version(package)
             if not version:
                 logger.warning("Failed to fetch version for %s", package)
                 continue
+            versions[package] = version
+        return versions
 
-            for filepath in self.files:
-                if not filepath.exists():
-                    continue
+    def plan(self) -> list[FileEdit]:
+        """Plan the updates for all pyproject.toml files without writing them.
 
-                if dry_run:
-                    if self._matches(filepath, package):
-                        logger.info("%s: %s -> %s", filepath, package, version)
-                        update_count += 1
-                elif self._update_file(filepath, package, version):
-                    logger.info("%s: %s -> %s", filepath, package, version)
-                    update_count += 1
+        Each file is read and indexed once, and every tracked requirement is
+        updated with a span edit.
+        """
+        versions = self._resolve()
+        if not versions:
+            return []
 
-        return update_count
+        file_edits = []
+        for filepath in self.files:
+            if not filepath.exists():
+                continue
+
+            content = _read(filepath)
+            with span("match", str(filepath)):
+                edits, updated = self._plan_edits(content, versions)
+            for package, edit in updated.items():
+                logger.info("%s: %s %s -> %s", filepath, package, edit.old, edit.new)
+            file_edits.append(FileEdit(filepath, content, apply_edits(content, edits), len(updated), edits))
+
+        return file_edits
+
+    def update(self, dry_run: bool = False) -> int:
+        """Update all pyproject.toml files. Returns count of updates."""
+        return _apply(self.plan(), dry_run)
 
 
 class ActionYmlUpdater:
@@ -80,113 +142,330 @@ class ActionYmlUpdater:
         r'[0-9]+\.[0-9]+\.[0-9]+(")'
     )
 
-    def __init__(self, files: list[Path]) -> None:
+    def __init__(self, files: list[Path], versions: ResolvedVersions | None = None) -> None:
         self.files = files
+        self.versions = versions
 
-    @staticmethod
-    def _build_replacement(version: str) -> str:
-        return rf"\g<1>{version}\2"
+    def _get_version(self) -> str | None:
+        if self.versions is not None:
+            return self.versions.releases.get(UV_REPO)
+        return get_github_release(UV_REPO)
 
-    def _update_file(self, filepath: Path, version: str) -> bool:
-        """Update uv version in an action.yml file. Returns True if updated."""
-        content = filepath.read_text()
-        replacement = self._build_replacement(version)
-        new_content, count = re.subn(self.PATTERN, replacement, content)
+    @classmethod
+    def keys(cls, content: str) -> set[str]:
+        """The version keys a file depends on: uv, if it has a uv-version input."""
+        return {github_release_key(UV_REPO)} if re.search(cls.PATTERN, content) else set()
 
-        if count > 0 and new_content != content:
-            filepath.write_text(new_content)
-            return True
-        return False
-
-    def _matches(self, filepath: Path) -> bool:
-        """Check if file contains the uv version pattern."""
-        content = filepath.read_text()
-        return bool(re.search(self.PATTERN, content))
-
-    def update(self, dry_run: bool = False) -> int:
-        """Update all action.yml files. Returns count of updates."""
-        version = get_github_release(UV_REPO)
+    def plan(self) -> list[FileEdit]:
+        """Plan the uv version update for all action.yml files without writing them."""
+        version = self._get_version()
         if not version:
             logger.warning("Failed to fetch uv version")
-            return 0
-
-        update_count = 0
+            return []
 
+        file_edits = []
         for filepath in self.files:
             if not filepath.exists():
                 continue
 
-            if dry_run:
-                if self._matches(filepath):
-                    logger.info("%s: uv -> %s", filepath, version)
-                    update_count += 1
-            elif self._update_file(filepath, version):
-                logger.info("%s: uv -> %s", filepath, version)
-                update_count += 1
+            content = _read(filepath)
+            with span("match", str(filepath)):
+                edits = [
+                    Edit(match.end(1), match.start(2), old, version)
+                    for match in re.finditer(self.PATTERN, content)
+                    if (old := content[match.end(1) : match.start(2)]) != version
+                ]
+            for edit in edits:
+                logger.info("%s: uv %s -> %s", filepath, edit.old, version)
+            file_edits.append(FileEdit(filepath, content, apply_edits(content, edits), int(bool(edits)), edits))
 
-        return update_count
+        return file_edits
+
+    def update(self, dry_run: bool = False) -> int:
+        """Update all action.yml files. Returns count of updates."""
+        return _apply(self.plan(), dry_run)
+
+
+@dataclass(frozen=True)
+class ActionReference:
+    """A ``uses: owner/repo[/path]@ref`` line.
+
+    ``version`` is the ref itself, or the version comment of a ref pinned to a
+    commit SHA (``@<sha> # v4.1.1``). ``start`` and ``end`` span the ref, its
+    closing quote and the comment.
+    """
+
+    repo: GitHubRepo
+    ref: str
+    version: str
+    quote: str
+    comment: str
+    start: int
+    end: int
+
+    @property
+    def pinned(self) -> bool:
+        return bool(_SHA.fullmatch(self.ref))
+
+
+def find_action_references(content: str) -> list[ActionReference]:
+    """Index every remote action reference in a workflow or composite action file.
+
+    Local actions (``./path``) and Docker images are skipped.
+    """
+    references = []
+    for match in _USES.finditer(content):
+        ref = match.group("ref")
+        pinned = bool(_SHA.fullmatch(ref))
+        if pinned and not match.group("comment_ref"):
+            continue
+        references.append(
+            ActionReference(
+                repo=GitHubRepo(owner=match.group("owner"), repo=match.group("repo")),
+                ref=ref,
+                version=match.group("comment_ref") if pinned else ref,
+                quote=match.group("quote"),
+                comment=match.group("comment") or "",
+                start=match.start("ref"),
+                end=match.end(),
+            )
+        )
+    return references
+
+
+class WorkflowUsesUpdater:
+    """Updates the ``uses: owner/repo@ref`` action references in workflow and composite action files.
+
+    All files are scanned once and every referenced repository is resolved once,
+    however often it occurs. Refs keep their precision, so ``@v4`` moves to the
+    latest major version and ``@v4.1.1`` to the latest release. Refs pinned to a
+    commit SHA, and all refs when ``pin_sha`` is set, are rewritten to the SHA
+    of the new version with the version in a trailing comment. SHAs come from
+    ``versions.commits`` where recorded; with ``offline`` set, the others are
+    not looked up and those references are left unchanged.
+    """
+
+    def __init__(
+        self,
+        files: list[Path],
+        versions: ResolvedVersions | None = None,
+        pin_sha: bool = False,
+        max_workers: int = MAX_WORKERS,
+        offline: bool = False,
+    ) -> None:
+        self.files = files
+        self.versions = versions
+        self.pin_sha = pin_sha
+        self.max_workers = max_workers
+        self.offline = offline
+
+    def _read(self, planned: dict[Path, FileEdit]) -> dict[Path, str]:
+        contents = {}
+        for filepath in self.files:
+            if filepath in planned:
+                contents[filepath] = planned[filepath].updated
+            elif filepath.exists():
+                contents[filepath] = _read(filepath)
+        return contents
+
+    @staticmethod
+    def keys(content: str) -> set[str]:
+        """The version keys of the actions a file uses."""
+        return {github_release_key(reference.repo) for reference in find_action_references(content)}
+
+    def repos(self) -> list[GitHubRepo]:
+        """The unique repositories referenced by all files."""
+        contents = self._read({})
+        return list(
+            dict.fromkeys(
+                reference.repo for content in contents.values() for reference in find_action_references(content)
+            )
+        )
+
+    def _resolve(self, repos: list[GitHubRepo]) -> dict[GitHubRepo, str | None]:
+        if self.versions is not None:
+            return {repo: self.versions.releases.get(repo) for repo in repos}
+        return fetch_versions([], repos, [], max_workers=self.max_workers).releases
+
+    @staticmethod
+    def _target_ref(reference: ActionReference, latest: str) -> str:
+        """The ref to move to, keeping the precision and ``v`` prefix of the current one."""
+        current = reference.version
+        prefix = "v" if current.startswith("v") else ""
+        precision = len(current.removeprefix("v").split("."))
+        candidate = prefix + ".".join(latest.split(".")[:precision])
+        current_key, candidate_key = release_key(current), release_key(candidate)
+        if current_key is None or candidate_key is None or candidate_key <= current_key:
+            return current
+        return candidate
+
+    def _references(
+        self, contents: dict[Path, str]
+    ) -> tuple[dict[Path, list[ActionReference]], dict[GitHubRepo, str | None]]:
+        """The action references of each file, and the latest version of every referenced repository."""
+        references = {}
+        for filepath, content in contents.items():
+            with span("match", str(filepath)):
+                references[filepath] = find_action_references(content)
+        repos = list(dict.fromkeys(reference.repo for refs in references.values() for reference in refs))
+        return references, self._resolve(repos)
+
+    def _commit_targets(
+        self, references: dict[Path, list[ActionReference]], latest: dict[GitHubRepo, str | None], every: bool
+    ) -> set[tuple[GitHubRepo, str]]:
+        """The (repo, ref) pairs whose commit is needed: of pinned references, or of all if ``every``."""
+        return {
+            (reference.repo, self._target_ref(reference, version))
+            for refs in references.values()
+            for reference in refs
+            if (version := latest[reference.repo]) and (every or reference.pinned)
+        }
+
+    def _commits(self, targets: set[tuple[GitHubRepo, str]]) -> dict[tuple[GitHubRepo, str], str | None]:
+        recorded = self.versions.commits if self.versions is not None else {}
+        shas = {target: recorded[target] for target in targets if target in recorded}
+        missing = [target for target in targets if target not in recorded]
+        if self.offline:
+            if missing:
+                logger.warning(
+                    "%d action ref(s) have no recorded commit; run 'resolve --root' to record them", len(missing)
+                )
+            return shas
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            futures = {target: pool.submit(get_github_commit, *target) for target in missing}
+            shas |= {target: future.result() for target, future in futures.items()}
+        return shas
+
+    def resolve_commits(self) -> dict[tuple[GitHubRepo, str], str | None]:
+        """The commits of the refs that every action reference would be updated to, pinned or not."""
+        references, latest = self._references(self._read({}))
+        return self._commits(self._commit_targets(references, latest, every=True))
+
+    def plan(self, planned: list[FileEdit] | None = None) -> list[FileEdit]:
+        """Plan the action reference updates without writing any file.
+
+        Files that other updaters already plan to change (``planned``) are read
+        from their planned content, so the edits can be combined with
+        ``merge_file_edits``.
+        """
+        originals = self._read({edit.path: edit for edit in planned or []})
+        references, latest = self._references(originals)
+        for repo, version in latest.items():
+            if not version:
+                logger.warning("Failed to fetch version for %s", repo)
+
+        shas = self._commits(self._commit_targets(references, latest, every=self.pin_sha))
+
+        file_edits = []
+        for filepath, content in originals.items():
+            edits = []
+            for reference in references[filepath]:
+                version = latest[reference.repo]
+                if not version:
+                    continue
+                target = self._target_ref(reference, version)
+                if self.pin_sha or reference.pinned:
+                    sha = shas.get((reference.repo, target))
+                    if sha is None:
+                        logger.warning("Failed to resolve %s@%s to a commit", reference.repo, target)
+                        continue
+                    replacement = f"{sha}{reference.quote} # {target}"
+                else:
+                    replacement = f"{target}{reference.quote}{reference.comment}"
+
+                old = content[reference.start : reference.end]
+                if replacement != old:
+                    logger.info("%s: %s@%s -> %s", filepath, reference.repo, reference.version, target)
+                    edits.append(Edit(reference.start, reference.end, old, replacement))
+            file_edits.append(FileEdit(filepath, content, apply_edits(content, edits), len(edits), edits))
+
+        return file_edits
+
+    def update(self, dry_run: bool = False) -> int:
+        """Update all workflow and action files. Returns count of updates."""
+        return _apply(self.plan(), dry_run)
 
 
 class PreCommitConfigUpdater:
     """Updates hook revisions in .pre-commit-config.yaml."""
 
-    def __init__(self, config_file: Path) -> None:
+    def __init__(self, config_file: Path, versions: ResolvedVersions | None = None) -> None:
         self.config_file = config_file
+        self.versions = versions
+
+    def _get_version(self, github_repo: GitHubRepo) -> str | None:
+        if self.versions is not None:
+            return self.versions.tags.get(github_repo)
+        return get_github_tag(github_repo)
 
     @staticmethod
     def _build_pattern(repo_url: str) -> str:
         return rf'(- repo: {re.escape(repo_url)}\s*\n\s*rev:\s*")[^"]+(")'
 
-    @staticmethod
-    def _build_replacement(version: str) -> str:
-        return rf"\g<1>v{version}\2"
-
     @staticmethod
     def _extract_hook_name(repo_url: str) -> str:
         return repo_url.split("/")[-1]
 
-    def _update_hook(self, content: str, repo_url: str, version: str) -> tuple[str, bool]:
-        """Update a single hook in pre-commit config. Returns (new_content, updated)."""
-        pattern = self._build_pattern(repo_url)
-        replacement = self._build_replacement(version)
-        new_content, count = re.subn(pattern, replacement, content)
-
-        if count > 0 and new_content != content:
-            return new_content, True
-        return content, False
-
-    def _matches(self, content: str, repo_url: str) -> bool:
-        """Check if content contains the hook pattern."""
-        return bool(re.search(self._build_pattern(repo_url), content))
-
-    def update(self, dry_run: bool = False) -> int:
-        """Update pre-commit config. Returns count of updates."""
+    @classmethod
+    def keys(cls, content: str) -> set[str]:
+        """The version keys of the tracked hooks a config uses."""
+        return {
+            github_tag_key(github_repo)
+            for repo_url, github_repo in PRECOMMIT_HOOKS
+            if re.search(cls._build_pattern(repo_url), content)
+        }
+
+    def _hook_edits(self, content: str, repo_url: str, version: str) -> list[Edit]:
+        """Find the rev edits for a single hook in the pre-commit config."""
+        rev = f"v{version}"
+        return [
+            Edit(match.end(1), match.start(2), old, rev)
+            for match in re.finditer(self._build_pattern(repo_url), content)
+            if (old := content[match.end(1) : match.start(2)]) != rev
+        ]
+
+    def plan(self) -> list[FileEdit]:
+        """Plan the hook updates for the pre-commit config without writing it."""
         if not self.config_file.exists():
-            return 0
+            return []
 
         update_count = 0
-        content = self.config_file.read_text()
+        content = _read(self.config_file)
+        edits = []
 
         for repo_url, github_repo in PRECOMMIT_HOOKS:
-            version = get_github_tag(github_repo)
+            version = self._get_version(github_repo)
             if not version:
                 logger.warning("Failed to fetch version for %s", github_repo)
                 continue
 
-            hook_name = self._extract_hook_name(repo_url)
+            with span("match", str(self.config_file)):
+                hook_edits = self._hook_edits(content, repo_url, version)
+            if hook_edits:
+                logger.info(
+                    "%s: %s %s -> v%s",
+                    self.config_file,
+                    self._extract_hook_name(repo_url),
+                    hook_edits[0].old,
+                    version,
+                )
+                edits.extend(hook_edits)
+                update_count += 1
+
+        return [FileEdit(self.config_file, content, apply_edits(content, edits), update_count, edits)]
+
+    def update(self, dry_run: bool = False) -> int:
+        """Update pre-commit config. Returns count of updates."""
+        return _apply(self.plan(), dry_run)
+
 
-            if dry_run:
-                if self._matches(content, repo_url):
-                    logger.info("%s: %s -> v%s", self.config_file, hook_name, version)
-                    update_count += 1
-            else:
-                new_content, updated = self._update_hook(content, repo_url, version)
-                if updated:
-                    content = new_content
-                    logger.info("%s: %s -> v%s", self.config_file, hook_name, version)
-                    update_count += 1
+def _read(filepath: Path) -> str:
+    with span("read", str(filepath)):
+        return filepath.read_text()
 
-        if not dry_run and update_count > 0:
-            self.config_file.write_text(content)
 
-        return update_count
+def _apply(file_edits: list[FileEdit], dry_run: bool) -> int:
+    """Write planned edits unless this is a dry run. Returns count of updates."""
+    if not dry_run:
+        apply_file_edits(file_edits)
+    return sum(edit.count for edit in file_edits)
@@ -0,0 +1,34 @@
+"""Helpers for comparing version strings."""
+
+from __future__ import annotations
+
+import re
+
+_FINAL_RELEASE = re.compile(r"^v?(\d+(?:\.\d+)*)(?:[-_.]?post(\d+))?$", re.IGNORECASE)
+
+ReleaseKey = tuple[tuple[int, ...], int]
+
+
+def release_key(version: str) -> ReleaseKey | None:
+    """Return a sort key for a final release, or None for pre-, dev- and local versions.
+
+    >>> release_key("1.2.0") == release_key("1.2")
+    True
+    >>> release_key("2.0.0rc1") is None
+    True
+    """
+    match = _FINAL_RELEASE.match(version.strip())
+    if not match:
+        return None
+    release = tuple(int(part) for part in match.group(1).split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    return release, int(match.group(2) or 0)
+
+
+def latest_release(versions: list[str]) -> str | None:
+    """Return the highest final release in a list of versions."""
+    releases = [(key, version) for version in versions if (key := release_key(version)) is not None]
+    if not releases:
+        return None
+    return max(releases)[1]
@@ -1,9 +1,150 @@
 from __future__ import annotations
 
-import os
+from pathlib import Path
 
+import click
 
-def main() -> None:
-    cwd = os.path.dirname(__file__)
-    package_dir = os.path.abspath(os.path.join(cwd, ".."))
-    os.system(f"cookiecutter {package_dir}")  # noqa: S605 | No injection, retrieving path in OS
+
+@click.group(invoke_without_command=True)
+@click.pass_context
+def main(ctx: click.Context) -> None:
+    """Create a new project from the cookiecutter-uv template.
+
+    Without a subcommand, prompts for the template options and generates one project.
+    """
+    if ctx.invoked_subcommand is None:
+        from cookiecutter.main import cookiecutter
+
+        from cookiecutter_uv.bake import TEMPLATE_DIR
+
+        cookiecutter(str(TEMPLATE_DIR))
+
+
+@main.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("."),
+    show_default=True,
+    help="Directory to generate the projects in.",
+)
+@click.option("--processes", "-j", type=click.IntRange(min=1), default=1, show_default=True, help="Worker processes.")
+@click.option("--overwrite", is_flag=True, help="Overwrite projects that already exist in the output directory.")
+@click.option(
+    "--config-file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Cookiecutter config file to use instead of the user's.",
+)
+@click.option("--default-config", is_flag=True, help="Ignore the user's cookiecutter config and use the defaults.")
+def bake(
+    manifest: Path,
+    output_dir: Path,
+    processes: int,
+    overwrite: bool,
+    config_file: Path | None,
+    default_config: bool,
+) -> None:
+    """Generate one project per row of MANIFEST without prompting.
+
+    MANIFEST is a CSV file with a header row of template options, a JSON Lines
+    file (.jsonl) or a JSON list of objects. Options left out use the template
+    defaults.
+    """
+    from cookiecutter_uv.bake import bake_many, read_manifest
+
+    contexts = read_manifest(manifest)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = bake_many(
+        contexts,
+        output_dir,
+        overwrite_if_exists=overwrite,
+        processes=processes,
+        config_file=config_file,
+        default_config=default_config,
+    )
+    for result in results:
+        if result.ok:
+            click.echo(f"Generated {result.project_dir}")
+        else:
+            click.echo(f"Failed {result.context}: {result.error}", err=True)
+
+    failed = sum(not result.ok for result in results)
+    if failed:
+        msg = f"{failed} of {len(results)} projects failed"
+        raise click.ClickException(msg)
+
+
+@main.command()
+@click.option(
+    "--strength", "-t", type=click.IntRange(min=1), default=2, show_default=True, help="Interaction strength."
+)
+@click.option(
+    "--template",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Template directory with a cookiecutter.json. Defaults to this template.",
+)
+def combinations(strength: int, template: Path | None) -> None:
+    """Print a covering array of the template's choice options as JSON Lines.
+
+    Every combination of choices of any STRENGTH options appears in at least
+    one line. The output is a manifest for the bake command.
+    """
+    import json
+
+    from cookiecutter_uv.bake import TEMPLATE_DIR
+    from cookiecutter_uv.combinations import covering_array, load_choices
+
+    choices = load_choices((template or TEMPLATE_DIR) / "cookiecutter.json")
+    for options in covering_array(choices, strength):
+        click.echo(json.dumps(options))
+
+
+@main.command()
+@click.argument("project_dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=Path("."))
+@click.option("--to", "rev", default="HEAD", show_default=True, help="Template revision to update to.")
+@click.option(
+    "--template",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Git checkout of the template. Defaults to the template recorded in the project.",
+)
+@click.option("--dry-run", is_flag=True, help="Only show what would change.")
+def update(project_dir: Path, rev: str, template: Path | None, dry_run: bool) -> None:
+    """Bring PROJECT_DIR up to date with a later version of the template.
+
+    Only the template files that changed since the project was generated are
+    rendered again, with the options recorded in the project. Changes are
+    merged with local edits; files where both changed the same lines are left
+    with conflict markers and the command exits with an error.
+    """
+    import subprocess
+
+    from cookiecutter_uv.update import TemplateRecord, apply_update, plan_update
+
+    try:
+        template = template or Path(TemplateRecord.load(project_dir).template)
+        if not template.is_dir():
+            msg = f"Template {template} is not a local directory; pass --template"
+            raise click.ClickException(msg)
+        updates, commit = plan_update(project_dir, template, rev)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else e.stderr
+        raise click.ClickException(stderr.strip() if stderr else str(e)) from e
+
+    for file in updates:
+        click.echo(f"{file.action:<10} {file.path}")
+    if not dry_run:
+        apply_update(project_dir, updates, commit)
+    if not updates:
+        click.echo(f"Already up to date with {commit[:12]}.")
+
+    conflicts = [file.path for file in updates if file.action == "conflict"]
+    if conflicts:
+        msg = f"{len(conflicts)} files have conflicts to resolve"
+        raise click.ClickException(msg)
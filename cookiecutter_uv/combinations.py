@@ -0,0 +1,83 @@
+"""Covering arrays over the choice options of a cookiecutter template.
+
+A covering array of strength ``t`` is a set of option combinations in which
+every combination of values of any ``t`` options appears at least once. With
+``t=2`` (pairwise) every pair of choices is baked together somewhere, in a
+few dozen projects instead of the full product of all options.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+from pathlib import Path
+
+from cookiecutter_uv.bake import TEMPLATE_DIR
+
+# An interaction is a sorted tuple of (option index, value index) pairs, one per option.
+_Interaction = tuple[tuple[int, int], ...]
+
+
+def load_choices(path: Path = TEMPLATE_DIR / "cookiecutter.json") -> dict[str, list[str]]:
+    """The options of a cookiecutter.json that are a list of choices, in file order."""
+    config = json.loads(path.read_text())
+    return {
+        name: [str(choice) for choice in value]
+        for name, value in config.items()
+        if isinstance(value, list) and not name.startswith("_")
+    }
+
+
+def defaults(choices: dict[str, list[str]]) -> dict[str, str]:
+    """The option values cookiecutter uses without input: the first choice of each option."""
+    return {name: values[0] for name, values in choices.items()}
+
+
+def covering_array(choices: dict[str, list[str]], strength: int = 2) -> list[dict[str, str]]:
+    """A small set of combinations that covers every ``strength``-wise combination of choices.
+
+    Rows are built greedily: each starts from an interaction that is not yet
+    covered, and the other options, those with the most choices first, take
+    the value that covers the most remaining interactions. The result is deterministic and usually close to
+    the smallest possible size. A strength of at least the number of options
+    gives the full product.
+    """
+    names = list(choices)
+    sizes = [len(choices[name]) for name in names]
+    strength = max(1, min(strength, len(names)))
+    order = sorted(range(len(names)), key=lambda option: -sizes[option])
+
+    uncovered: set[_Interaction] = {
+        tuple(zip(options, values, strict=True))
+        for options in itertools.combinations(range(len(names)), strength)
+        for values in itertools.product(*(range(sizes[option]) for option in options))
+    }
+
+    rows: list[dict[str, str]] = []
+    while uncovered:
+        row = dict(min(uncovered))
+        for option in order:
+            if option not in row:
+                row[option] = _best_value(row, option, sizes[option], uncovered, strength)
+        uncovered -= _interactions(row, strength)
+        rows.append({names[option]: choices[names[option]][value] for option, value in sorted(row.items())})
+    return rows
+
+
+def _best_value(row: dict[int, int], option: int, size: int, uncovered: set[_Interaction], strength: int) -> int:
+    """The value of ``option`` that completes the most uncovered interactions; ties go to the earlier choice."""
+    gains = [_gain(row, option, value, uncovered, strength) for value in range(size)]
+    return gains.index(max(gains))
+
+
+def _gain(row: dict[int, int], option: int, value: int, uncovered: set[_Interaction], strength: int) -> int:
+    """How many uncovered interactions setting ``option`` to ``value`` would complete."""
+    assigned = sorted(row.items())
+    return sum(
+        tuple(sorted((*others, (option, value)))) in uncovered
+        for others in itertools.combinations(assigned, strength - 1)
+    )
+
+
+def _interactions(row: dict[int, int], strength: int) -> set[_Interaction]:
+    return set(itertools.combinations(sorted(row.items()), strength))
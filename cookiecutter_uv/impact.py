@@ -0,0 +1,244 @@
+"""Work out which option combinations a change to the template can affect.
+
+Every file in the template project directory is analysed once: the Jinja
+syntax tree of its content and of each component of its path gives the
+cookiecutter variables its output depends on, and ``optional()`` and
+``license_file()`` calls in its path give the conditions under which it is
+rendered at all (see local_extensions.py). A changed file can only change
+the projects it is rendered in, and two projects that agree on the variables
+it depends on render it identically, so one project per distinct set of
+values is enough to test the change.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from cookiecutter.environment import StrictEnvironment
+from jinja2 import Environment, TemplateSyntaxError, nodes
+
+from cookiecutter_uv.bake import TEMPLATE_DIR
+
+# Stands for "every variable" when a template uses the cookiecutter dict as a whole.
+ALL_VARIABLES = "*"
+
+# A rendering condition: option values that must all match, or a list of such alternatives.
+Condition = Mapping[str, str] | list[Mapping[str, str]]
+
+_DICT_METHODS = frozenset({"items", "keys", "values", "get"})
+
+
+@dataclass(frozen=True)
+class TemplateFile:
+    """What one file of the template depends on."""
+
+    path: str
+    variables: frozenset[str]
+    conditions: tuple[Condition, ...] = ()
+
+    def rendered(self, options: Mapping[str, str]) -> bool:
+        """Whether a project baked with ``options`` contains this file."""
+        return all(_satisfied(condition, options) for condition in self.conditions)
+
+    def key(self, options: Mapping[str, str]) -> tuple[str | None, ...] | None:
+        """The option values that determine this file's output, or None if it is not rendered."""
+        if not self.rendered(options):
+            return None
+        if ALL_VARIABLES in self.variables:
+            return tuple(value for _, value in sorted(options.items()))
+        return tuple(options.get(name) for name in sorted(self.variables))
+
+
+def analyze_template(template_dir: Path = TEMPLATE_DIR) -> dict[str, TemplateFile]:
+    """Analyse every file in the template project directory, keyed by its path relative to ``template_dir``."""
+    analyze = _file_analyzer(template_dir)
+    return {
+        rel_path: analyze(rel_path)
+        for path in sorted(project_template_dir(template_dir).rglob("*"))
+        if path.is_file() and "__pycache__" not in path.parts
+        for rel_path in [path.relative_to(template_dir).as_posix()]
+    }
+
+
+def changed_paths(since: str, cwd: Path = TEMPLATE_DIR) -> list[str]:
+    """Paths relative to the repository root that differ from ``since``, including uncommitted and untracked files."""
+    diff = _git(cwd, "diff", "--name-only", "--no-renames", since, "--")
+    untracked = _git(cwd, "ls-files", "--others", "--exclude-standard", "--full-name")
+    return sorted(set(diff.splitlines()) | set(untracked.splitlines()))
+
+
+def select_combinations(
+    combinations: list[dict[str, str]],
+    changed: Iterable[str],
+    template_dir: Path = TEMPLATE_DIR,
+) -> list[dict[str, str]]:
+    """The combinations, in order, that are needed to test the changed paths.
+
+    ``combinations`` must contain every option. Changes outside the template
+    project directory, such as cookiecutter.json, hooks or tests, select all
+    combinations. For changes inside it, a combination is selected if it
+    renders a changed file with values not already covered by an earlier
+    selected combination.
+    """
+    project_dir = project_template_dir(template_dir).name
+    changed = list(changed)
+    if any(PurePosixPath(path).parts[:1] != (project_dir,) for path in changed):
+        return list(combinations)
+
+    analyze = _file_analyzer(template_dir)
+    changed_files = [analyze(path) for path in changed]
+
+    selected, seen = [], set()
+    for options in combinations:
+        key = tuple(file.key(options) for file in changed_files)
+        if all(part is None for part in key) or key in seen:
+            continue
+        seen.add(key)
+        selected.append(options)
+    return selected
+
+
+def _file_analyzer(template_dir: Path) -> Callable[[str], TemplateFile]:
+    """A function that analyses a file given by its path relative to ``template_dir``.
+
+    Files that do not exist, such as deleted ones, are analysed by their path alone.
+    """
+    config = json.loads((template_dir / "cookiecutter.json").read_text())
+    env: Environment = StrictEnvironment(context={})
+    derived = _derived_variables(env, config)
+    features = config.get("_features", {})
+
+    def analyze(rel_path: str) -> TemplateFile:
+        variables, conditions = _path_dependencies(env, rel_path, features)
+        path = template_dir / rel_path
+        if path.is_file():
+            variables |= _content_variables(env, path)
+        return TemplateFile(rel_path, _expand(variables, derived), tuple(conditions))
+
+    return analyze
+
+
+def project_template_dir(template_dir: Path) -> Path:
+    """The ``{{cookiecutter.project_name}}`` style directory of a template that projects are rendered from."""
+    for path in template_dir.iterdir():
+        if path.is_dir() and "cookiecutter" in path.name and "{{" in path.name:
+            return path
+    msg = f"No project template directory in {template_dir}"
+    raise ValueError(msg)
+
+
+def _path_dependencies(env: Environment, rel_path: str, features: dict[str, Any]) -> tuple[set[str], list[Condition]]:
+    """Variables and rendering conditions of the Jinja expressions in a path."""
+    variables: set[str] = set()
+    conditions: list[Condition] = []
+    for part in PurePosixPath(rel_path).parts:
+        if "{" not in part:
+            continue
+        tree = _parse(env, part)
+        part_conditions = None if tree is None else _conditions(tree, features)
+        if tree is None or part_conditions is None:
+            variables.add(ALL_VARIABLES)
+            continue
+        variables |= _referenced_variables(tree)
+        conditions += part_conditions
+    for condition in conditions:
+        for required in condition if isinstance(condition, list) else [condition]:
+            variables |= set(required)
+    return variables, conditions
+
+
+def _conditions(tree: nodes.Template, features: dict[str, Any]) -> list[Condition] | None:
+    """The conditions of the ``optional()`` and ``license_file()`` calls in a path component.
+
+    None if a call names a feature that is not declared.
+    """
+    conditions: list[Condition] = []
+    for call in tree.find_all(nodes.Call):
+        if not isinstance(call.node, nodes.Name) or not call.args or not isinstance(call.args[0], nodes.Const):
+            continue
+        if call.node.name == "optional":
+            if call.args[0].value not in features:
+                return None
+            conditions.append(features[call.args[0].value])
+        elif call.node.name == "license_file":
+            conditions.append({"open_source_license": call.args[0].value})
+    return conditions
+
+
+def _content_variables(env: Environment, path: Path) -> set[str]:
+    try:
+        source = path.read_text()
+    except UnicodeDecodeError:
+        # Binary files are copied without rendering.
+        return set()
+    tree = _parse(env, source)
+    return {ALL_VARIABLES} if tree is None else _referenced_variables(tree)
+
+
+def _parse(env: Environment, source: str) -> nodes.Template | None:
+    try:
+        return env.parse(source)
+    except TemplateSyntaxError:
+        return None
+
+
+def _referenced_variables(tree: nodes.Node) -> set[str]:
+    """The ``cookiecutter.<name>`` and ``cookiecutter['<name>']`` lookups in a syntax tree.
+
+    Any other use of ``cookiecutter``, such as iterating over it, counts as a
+    dependency on every variable.
+    """
+    uses = sum(1 for name in tree.find_all(nodes.Name) if name.name == "cookiecutter")
+    variables = set()
+    for getattr_node in tree.find_all(nodes.Getattr):
+        if _is_cookiecutter(getattr_node.node) and getattr_node.attr not in _DICT_METHODS:
+            variables.add(getattr_node.attr)
+            uses -= 1
+    for getitem_node in tree.find_all(nodes.Getitem):
+        if _is_cookiecutter(getitem_node.node) and isinstance(getitem_node.arg, nodes.Const):
+            variables.add(str(getitem_node.arg.value))
+            uses -= 1
+    if uses > 0:
+        variables.add(ALL_VARIABLES)
+    return variables
+
+
+def _is_cookiecutter(node: nodes.Node) -> bool:
+    return isinstance(node, nodes.Name) and node.name == "cookiecutter"
+
+
+def _derived_variables(env: Environment, config: dict[str, Any]) -> dict[str, set[str]]:
+    """The variables each templated default in cookiecutter.json is rendered from."""
+    derived = {}
+    for name, value in config.items():
+        if isinstance(value, str) and "{" in value:
+            tree = _parse(env, value)
+            derived[name] = {ALL_VARIABLES} if tree is None else _referenced_variables(tree)
+    return derived
+
+
+def _expand(variables: set[str], derived: dict[str, set[str]]) -> frozenset[str]:
+    expanded = set()
+    pending = list(variables)
+    while pending:
+        name = pending.pop()
+        if name not in expanded:
+            expanded.add(name)
+            pending.extend(derived.get(name, ()))
+    return frozenset(expanded)
+
+
+def _satisfied(condition: Condition, options: Mapping[str, str]) -> bool:
+    # Same semantics as local_extensions.feature_enabled, which the template has to carry itself.
+    alternatives = condition if isinstance(condition, list) else [condition]
+    return any(all(options.get(option) == value for option, value in required.items()) for required in alternatives)
+
+
+def _git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)  # noqa: S603, S607
+    return result.stdout
@@ -0,0 +1,203 @@
+"""Carry template changes into projects that were generated from an earlier version of the template.
+
+A generated project records the template commit and options it was baked
+with in ``.cookiecutter-uv.json``. To update it, the template files that
+changed between that commit and the target are rendered at both commits
+with the recorded options, and every output that differs is merged into the
+project as a 3-way merge with ``git merge-file``: local edits to the project
+are kept, and conflicting edits are left with conflict markers.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import tarfile
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from cookiecutter_uv.bake import bake, isolated_config
+from cookiecutter_uv.impact import project_template_dir
+
+TEMPLATE_RECORD = ".cookiecutter-uv.json"
+
+# Changes to these affect how every file is rendered.
+TEMPLATE_CONFIG = ("cookiecutter.json", "hooks", "local_extensions.py")
+
+
+@dataclass
+class TemplateRecord:
+    """The template and options a project was generated with."""
+
+    template: str
+    commit: str | None
+    context: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, project_dir: Path) -> TemplateRecord:
+        path = project_dir / TEMPLATE_RECORD
+        if not path.exists():
+            msg = (
+                f"{project_dir} has no {TEMPLATE_RECORD}; it was not generated from a git checkout "
+                "of this template, or before projects recorded their template"
+            )
+            raise ValueError(msg)
+        data = json.loads(path.read_text())
+        return cls(data["template"], data.get("commit"), data.get("context", {}))
+
+    def save(self, project_dir: Path) -> None:
+        data = {"template": self.template, "commit": self.commit, "context": self.context}
+        (project_dir / TEMPLATE_RECORD).write_text(json.dumps(data, indent=2) + "\n")
+
+
+@dataclass
+class FileUpdate:
+    """What updating does to one file of the project. ``action`` is create, update, merge, delete or conflict."""
+
+    path: str
+    action: str
+    content: bytes | None = None
+    conflicts: int = 0
+
+
+def resolve_commit(template_dir: Path, rev: str) -> str:
+    return _git(template_dir, "rev-parse", "--verify", f"{rev}^{{commit}}").strip()
+
+
+def changed_template_files(template_dir: Path, old: str, new: str) -> list[str] | None:
+    """Paths in the template project directory that changed between two commits.
+
+    None if the template configuration, hooks or extensions changed, since then
+    any file may render differently.
+    """
+    prefix = _git(template_dir, "rev-parse", "--show-prefix").strip()
+    changed = [
+        path.removeprefix(prefix)
+        for path in _git(template_dir, "diff", "--name-only", "--no-renames", old, new, "--", ".").splitlines()
+    ]
+    if any(PurePosixPath(path).parts[0] in TEMPLATE_CONFIG for path in changed):
+        return None
+    project = project_template_dir(template_dir).name
+    return [path for path in changed if PurePosixPath(path).parts[0] == project]
+
+
+def render_at(
+    template_dir: Path, commit: str, context: dict[str, str], paths: list[str] | None, output_dir: Path
+) -> Path:
+    """Bake the template as it was at ``commit`` with only ``paths`` of its project directory, or all files if None."""
+    source = output_dir / "template"
+    prefix = _git(template_dir, "rev-parse", "--show-prefix").strip()
+    archive = subprocess.run(  # noqa: S603
+        ["git", "archive", "--format=tar", commit],  # noqa: S607
+        cwd=_git(template_dir, "rev-parse", "--show-toplevel").strip(),
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(source, filter="data")
+        else:  # pragma: no cover - Python without the extraction filters backport
+            tar.extractall(source)  # noqa: S202
+    source /= prefix
+
+    if paths is not None:
+        keep = set(paths)
+        for path in sorted(project_template_dir(source).rglob("*"), reverse=True):
+            rel_path = path.relative_to(source).as_posix()
+            if path.is_file() and rel_path not in keep:
+                path.unlink()
+    # Without hooks: the post-generation hook only cleans up directories and records the
+    # template, which needs a git checkout that the archive is not.
+    config_file = isolated_config(output_dir / "config")
+    return bake(context, output_dir / "rendered", template=source, config_file=config_file, accept_hooks=False)
+
+
+def plan_update(project_dir: Path, template_dir: Path, rev: str = "HEAD") -> tuple[list[FileUpdate], str]:
+    """Work out the file updates that bring ``project_dir`` to the template at ``rev``, and the target commit."""
+    record = TemplateRecord.load(project_dir)
+    if not record.commit:
+        msg = f"{project_dir / TEMPLATE_RECORD} does not record a template commit"
+        raise ValueError(msg)
+    new = resolve_commit(template_dir, rev)
+    if new == record.commit:
+        return [], new
+
+    paths = changed_template_files(template_dir, record.commit, new)
+    if paths == []:
+        return [], new
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = render_at(template_dir, record.commit, record.context, paths, Path(tmp) / "base")
+        target = render_at(template_dir, new, record.context, paths, Path(tmp) / "target")
+        updates = []
+        for rel_path in sorted(_files(base) | _files(target)):
+            update = _update_file(rel_path, base / rel_path, target / rel_path, project_dir / rel_path)
+            if update is not None:
+                updates.append(update)
+    return updates, new
+
+
+def apply_update(project_dir: Path, updates: list[FileUpdate], commit: str) -> None:
+    """Write the updates and record ``commit`` as the template version of the project."""
+    for update in updates:
+        path = project_dir / update.path
+        if update.action == "delete":
+            path.unlink()
+        elif update.content is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(update.content)
+    record = TemplateRecord.load(project_dir)
+    record.commit = commit
+    record.save(project_dir)
+
+
+def merge_file(current: bytes, base: bytes, new: bytes, path: str) -> tuple[bytes, int]:
+    """3-way merge of a file with ``git merge-file``. Returns the merged content and the number of conflicts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for name, content in (("current", current), ("base", base), ("new", new)):
+            file = Path(tmp) / name
+            file.write_bytes(content)
+            files.append(str(file))
+        result = subprocess.run(  # noqa: S603
+            ["git", "merge-file", "-p", "-L", path, "-L", "template (old)", "-L", "template (new)", *files],  # noqa: S607
+            capture_output=True,
+            check=False,
+        )
+    if result.returncode < 0:
+        msg = f"git merge-file failed on {path}: {result.stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
+    return result.stdout, result.returncode
+
+
+def _update_file(rel_path: str, base: Path, target: Path, current: Path) -> FileUpdate | None:
+    old = base.read_bytes() if base.is_file() else None
+    new = target.read_bytes() if target.is_file() else None
+    mine = current.read_bytes() if current.is_file() else None
+    if old == new or mine == new:
+        return None
+    if new is None:
+        # Removed from the template: delete it unless it was changed locally.
+        return FileUpdate(rel_path, "delete") if mine == old else FileUpdate(rel_path, "conflict", conflicts=1)
+    if mine is None:
+        # New in the template, or deleted locally: only add files the project never had.
+        return FileUpdate(rel_path, "create", new) if old is None else None
+    if mine == old:
+        return FileUpdate(rel_path, "update", new)
+    merged, conflicts = merge_file(mine, old or b"", new, rel_path)
+    return FileUpdate(rel_path, "conflict" if conflicts else "merge", merged, conflicts)
+
+
+def _files(root: Path) -> set[str]:
+    return {
+        path.relative_to(root).as_posix()
+        for path in root.rglob("*")
+        if path.is_file() and path.name != TEMPLATE_RECORD and "__pycache__" not in path.parts
+    }
+
+
+def _git(cwd: Path | str, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True)  # noqa: S603, S607
+    return result.stdout
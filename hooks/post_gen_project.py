@@ -1,93 +1,100 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
+import json
 import os
-import shutil
+import re
+import subprocess
+import sys
 
 PROJECT_DIRECTORY = os.path.realpath(os.path.curdir)
 
-
-def remove_file(filepath: str) -> None:
-    os.remove(os.path.join(PROJECT_DIRECTORY, filepath))
-
-
-def remove_dir(filepath: str) -> None:
-    shutil.rmtree(os.path.join(PROJECT_DIRECTORY, filepath))
-
-
-def move_file(filepath: str, target: str) -> None:
-    os.rename(os.path.join(PROJECT_DIRECTORY, filepath), os.path.join(PROJECT_DIRECTORY, target))
-
-
-def move_dir(src: str, target: str) -> None:
-    shutil.move(os.path.join(PROJECT_DIRECTORY, src), os.path.join(PROJECT_DIRECTORY, target))
+# Where the project records the template it came from; read by `cookiecutter-uv update`.
+TEMPLATE_RECORD = ".cookiecutter-uv.json"
+
+CONTEXT = json.loads(r"""{{ cookiecutter | jsonify }}""")
+
+TEMPLATE_DIR = r"""{{ template_dir() }}"""
+
+# File names that render empty when the project does not get the file, see local_extensions.py.
+OPTIONAL_NAME = re.compile(r"\{\{\s*(?:optional|license_file)\(.*\)\s*\}\}")
+TEMPLATED_NAME = re.compile(r"\{\{.*\}\}")
+
+
+def optional_dirs(template_project_dir: str) -> list[str]:
+    """Directories of the template project that only hold optional files, deepest first.
+
+    Paths are relative to ``template_project_dir``. Directories with templated
+    names are left out, since their name in the project is not known here.
+    """
+    optional = set()
+    for dirpath, dirnames, filenames in os.walk(template_project_dir, topdown=False):
+        subdirs = [os.path.join(dirpath, name) for name in dirnames if name != "__pycache__"]
+        if all(OPTIONAL_NAME.fullmatch(name) for name in filenames) and all(path in optional for path in subdirs):
+            optional.add(dirpath)
+    optional.discard(template_project_dir)
+    rel_paths = [os.path.relpath(path, template_project_dir) for path in optional]
+    return sorted(
+        (path for path in rel_paths if not TEMPLATED_NAME.search(path)),
+        key=lambda path: path.count(os.sep),
+        reverse=True,
+    )
+
+
+def remove_empty_dirs(root: str, candidates: list[str]) -> None:
+    """Remove the ``candidates`` under ``root`` that are empty because none of their optional files were generated.
+
+    Other empty directories, such as ones that already existed in the output, are left alone.
+    """
+    for rel_path in candidates:
+        path = os.path.join(root, rel_path)
+        if os.path.isdir(path) and not os.listdir(path):
+            os.rmdir(path)
+
+
+def template_project_dir(template_dir: str) -> str:
+    for name in os.listdir(template_dir):
+        if "cookiecutter" in name and TEMPLATED_NAME.search(name) and os.path.isdir(os.path.join(template_dir, name)):
+            return os.path.join(template_dir, name)
+    msg = f"No project template directory in {template_dir}"
+    raise ValueError(msg)
+
+
+def template_commit(template_dir: str) -> str | None:
+    """The commit the template is checked out at, or None if it is not tracked in a git repository."""
+    try:
+        result = subprocess.run(  # noqa: S603
+            # Resolving cookiecutter.json, not the directory, keeps an untracked template inside
+            # another checkout from recording that checkout's HEAD.
+            ["git", "-C", template_dir, "rev-parse", "HEAD:./cookiecutter.json", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.split()[-1]
+
+
+def record_template(path: str) -> None:
+    """Record the template commit and the options, so the project can be updated to later template versions."""
+    commit = template_commit(TEMPLATE_DIR)
+    if commit is None:
+        sys.stderr.write(
+            f"Not writing {TEMPLATE_RECORD}: the template in {TEMPLATE_DIR} is not a git checkout, "
+            "so 'cookiecutter-uv update' cannot update this project.\n"
+        )
+        return
+    record = {
+        "template": TEMPLATE_DIR,
+        "commit": commit,
+        "context": {name: value for name, value in CONTEXT.items() if not name.startswith("_")},
+    }
+    with open(path, "w") as f:
+        f.write(json.dumps(record, indent=2) + "\n")
 
 
 if __name__ == "__main__":
-    if "{{cookiecutter.include_github_actions}}" != "y":
-        remove_dir(".github")
-    else:
-        if "{{cookiecutter.mkdocs}}" != "y" and "{{cookiecutter.publish_to_pypi}}" == "n":
-            remove_file(".github/workflows/on-release-main.yml")
-
-    if "{{cookiecutter.mkdocs}}" != "y":
-        remove_dir("docs")
-        remove_file("mkdocs.yml")
-
-    if "{{cookiecutter.dockerfile}}" != "y":
-        remove_file("Dockerfile")
-
-    if "{{cookiecutter.codecov}}" != "y":
-        remove_file("codecov.yaml")
-        if "{{cookiecutter.include_github_actions}}" == "y":
-            remove_file(".github/workflows/validate-codecov-config.yml")
-
-    if "{{cookiecutter.devcontainer}}" != "y":
-        remove_dir(".devcontainer")
-
-    if "{{cookiecutter.open_source_license}}" == "MIT license":
-        move_file("LICENSE_MIT", "LICENSE")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "BSD license":
-        move_file("LICENSE_BSD", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "ISC license":
-        move_file("LICENSE_ISC", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "Apache Software License 2.0":
-        move_file("LICENSE_APACHE", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "GNU General Public License v3":
-        move_file("LICENSE_GPL", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-
-    if "{{cookiecutter.open_source_license}}" == "Not open source":
-        remove_file("LICENSE_GPL")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-
-    if "{{cookiecutter.layout}}" == "src":
-        if os.path.isdir("src"):
-            remove_dir("src")
-        move_dir("{{cookiecutter.project_slug}}", os.path.join("src", "{{cookiecutter.project_slug}}"))
+    # Files of disabled features are skipped while rendering, see local_extensions.py.
+    remove_empty_dirs(PROJECT_DIRECTORY, optional_dirs(template_project_dir(TEMPLATE_DIR)))
+    record_template(os.path.join(PROJECT_DIRECTORY, TEMPLATE_RECORD))
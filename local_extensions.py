@@ -0,0 +1,70 @@
+"""Jinja extension that decides at render time which template files a project gets.
+
+Template files that only belong to some projects are named
+``{{ optional('<feature>', '<name>') }}``. The name renders to ``<name>`` if
+the feature is enabled and to an empty string otherwise, and cookiecutter
+skips files whose name renders empty without reading or rendering them.
+Directories of the template that only hold such files are removed by the
+post-generation hook when they are left empty.
+
+The features are declared as data in the ``_features`` entry of
+cookiecutter.json. A feature's condition is a mapping of option to its
+required value, or a list of such mappings of which any may match.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from typing import Any
+
+from jinja2 import Environment, pass_context
+from jinja2.ext import Extension
+from jinja2.runtime import Context
+
+Condition = Mapping[str, str] | list[Mapping[str, str]]
+
+LICENSE_FILE = "LICENSE"
+
+
+def feature_enabled(condition: Condition, options: Mapping[str, Any]) -> bool:
+    """Whether the options satisfy a feature condition."""
+    alternatives = condition if isinstance(condition, list) else [condition]
+    return any(all(options.get(option) == value for option, value in required.items()) for required in alternatives)
+
+
+def enabled_features(options: Mapping[str, Any]) -> set[str]:
+    """The features declared in ``options["_features"]`` that the options enable."""
+    return {name for name, condition in options.get("_features", {}).items() if feature_enabled(condition, options)}
+
+
+@pass_context
+def optional(context: Context, feature: str, name: str) -> str:
+    options = context["cookiecutter"]
+    features = options.get("_features", {})
+    if feature not in features:
+        msg = f"Unknown feature {feature!r}; declare it in the _features entry of cookiecutter.json"
+        raise KeyError(msg)
+    return name if feature_enabled(features[feature], options) else ""
+
+
+@pass_context
+def license_file(context: Context, license_name: str) -> str:
+    """Name the template for ``license_name`` LICENSE if that is the chosen license."""
+    return LICENSE_FILE if context["cookiecutter"].get("open_source_license") == license_name else ""
+
+
+def template_dir() -> str:
+    """The absolute path of the template.
+
+    Only meaningful in hooks: cookiecutter renders them with the template as the
+    working directory, while ``cookiecutter._repo_dir`` may be relative to
+    wherever cookiecutter was started.
+    """
+    return os.getcwd()
+
+
+class FeatureExtension(Extension):
+    def __init__(self, environment: Environment) -> None:
+        super().__init__(environment)
+        environment.globals.update(optional=optional, license_file=license_file, template_dir=template_dir)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import shlex
 import subprocess
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -18,6 +19,7 @@ class BakedProject:
     exit_code: int
     exception: Exception | None
     options: dict[str, str] = field(default_factory=dict)
+    env: dict[str, str] = field(default_factory=dict)
 
     @property
     def path(self) -> Path:
@@ -50,6 +52,7 @@ class BakedProject:
         # Strip VIRTUAL_ENV so the outer test environment doesn't leak
         # into the baked project's subprocess.
         env = {k: v for k, v in os.environ.items() if k != "VIRTUAL_ENV"}
+        env.update(self.env)
         return subprocess.run(
             shlex.split(command),
             cwd=self.path,
@@ -82,8 +85,107 @@ class BakedProject:
         assert result.returncode == 0, f"make check failed:\n{result.stdout}\n{result.stderr}"
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("baked projects")
+    group.addoption(
+        "--offline",
+        action="store_true",
+        help="Install baked projects only from the shared caches and the wheelhouse, without network access.",
+    )
+    group.addoption(
+        "--wheelhouse",
+        type=Path,
+        help="Directory of wheels that baked projects install from, e.g. filled with 'pip download'.",
+    )
+    group.addoption(
+        "--affected-since",
+        metavar="REV",
+        help="Only run option combinations whose rendered output can differ from REV, using the template "
+        "dependency analysis in cookiecutter_uv.impact.",
+    )
+    group.addoption(
+        "--tool-cache",
+        type=Path,
+        help="Directory for the uv and pre-commit caches shared by all baked projects. "
+        "Defaults to a directory in the pytest cache, so it is reused between runs.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    since = config.getoption("affected_since")
+    if not since:
+        return
+
+    from cookiecutter_uv.combinations import defaults, load_choices
+    from cookiecutter_uv.impact import changed_paths, select_combinations
+
+    template_defaults = defaults(load_choices())
+
+    def resolved(item) -> dict[str, str] | None:
+        callspec = getattr(item, "callspec", None)
+        if callspec is None or "options" not in callspec.params:
+            return None
+        return {**template_defaults, **callspec.params["options"]}
+
+    combinations = []
+    for item in items:
+        options = resolved(item)
+        if options is not None and options not in combinations:
+            combinations.append(options)
+    selected = select_combinations(combinations, changed_paths(since))
+
+    keep, deselected = [], []
+    for item in items:
+        options = resolved(item)
+        (deselected if options is not None and options not in selected else keep).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = keep
+
+
+@pytest.fixture(scope="session")
+def project_env(request, tmp_path_factory) -> dict[str, str]:
+    """Environment for commands run in baked projects.
+
+    All projects share one uv cache and one pre-commit home, so dependencies
+    and hook environments are downloaded and built once, and uv links packages
+    from its cache into each virtual environment instead of copying them.
+    With ``--offline`` nothing is fetched: packages come from the cache or the
+    ``--wheelhouse`` only, and pre-commit hooks must already be installed in
+    the shared pre-commit home.
+    """
+    config = request.config
+    cache = config.getoption("tool_cache") or _tool_cache(config, tmp_path_factory)
+    env = {
+        "UV_CACHE_DIR": str(cache / "uv"),
+        "PRE_COMMIT_HOME": str(cache / "pre-commit"),
+        "UV_LINK_MODE": "clone" if sys.platform == "darwin" else "hardlink",
+    }
+    wheelhouse = config.getoption("wheelhouse")
+    if wheelhouse:
+        env["UV_FIND_LINKS"] = str(wheelhouse.resolve())
+    if config.getoption("offline"):
+        env["UV_OFFLINE"] = "1"
+        env["UV_PYTHON_DOWNLOADS"] = "never"
+        if wheelhouse:
+            env["UV_NO_INDEX"] = "1"
+    return env
+
+
+def _tool_cache(config, tmp_path_factory) -> Path:
+    """Where the shared tool caches live.
+
+    In the pytest cache, so they are reused between runs, or in this session's
+    temporary directory when the cache provider is disabled with ``-p no:cacheprovider``.
+    """
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return tmp_path_factory.mktemp("baked-projects")
+    return cache.mkdir("baked-projects")
+
+
 @pytest.fixture
-def bake(cookies):
+def bake(cookies, project_env):
     """Fixture factory that bakes a cookiecutter project and returns a BakedProject.
 
     Usage:
@@ -99,9 +201,58 @@ def bake(cookies):
             exit_code=result.exit_code,
             exception=result.exception,
             options=options,
+            env=project_env,
         )
         assert project.exit_code == 0, f"Bake failed with options {options}: {project.exception}"
         assert project.exception is None
         return project
 
     return _bake
+
+
+class BakeCache:
+    """Bakes each distinct set of options once per session and hands out the same project afterwards.
+
+    Projects from the cache are shared between tests and must not be modified.
+    With pytest-xdist every worker has its own cache, so tests that share a
+    project should be kept on one worker with an ``xdist_group`` mark and
+    ``--dist loadgroup``.
+    """
+
+    def __init__(self, output_dir: Path, config_file: Path | None = None) -> None:
+        self.output_dir = output_dir
+        self.config_file = config_file
+        self.projects: dict[tuple[tuple[str, str], ...], BakedProject] = {}
+
+    def get(self, options: dict[str, str]) -> BakedProject:
+        key = tuple(sorted(options.items()))
+        if key not in self.projects:
+            from cookiecutter_uv.bake import bake
+
+            output_dir = self.output_dir / str(len(self.projects))
+            project_path = bake(options, output_dir, config_file=self.config_file)
+            self.projects[key] = BakedProject(project_path=project_path, exit_code=0, exception=None, options=options)
+        return self.projects[key]
+
+
+@pytest.fixture(scope="session")
+def cookiecutter_config(tmp_path_factory) -> Path:
+    """A cookiecutter config file for baking in-process, isolated from the user's config and replay directory.
+
+    pytest-cookies does the same for the ``cookies`` fixture.
+    """
+    from cookiecutter_uv.bake import isolated_config
+
+    return isolated_config(tmp_path_factory.mktemp("cookiecutter-config"))
+
+
+@pytest.fixture(scope="session")
+def bake_cache(tmp_path_factory, cookiecutter_config) -> BakeCache:
+    """Session-wide cache of baked projects for tests that only read the generated files.
+
+    Usage:
+        def test_something(bake_cache):
+            project = bake_cache.get({"mkdocs": "n"})
+            assert not project.has_dir("docs")
+    """
+    return BakeCache(tmp_path_factory.mktemp("baked"), cookiecutter_config)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from cookiecutter_uv.bake import bake, bake_many, isolated_config, read_manifest
+from cookiecutter_uv.cli import main
+
+
+class TestReadManifest:
+    def test_csv_skips_empty_cells(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "projects.csv"
+        manifest.write_text("project_name,mkdocs\nfirst,n\nsecond,\n")
+        assert read_manifest(manifest) == [{"project_name": "first", "mkdocs": "n"}, {"project_name": "second"}]
+
+    def test_jsonl(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "projects.jsonl"
+        manifest.write_text('{"project_name": "first"}\n\n{"project_name": "second", "codecov": "n"}\n')
+        assert read_manifest(manifest) == [{"project_name": "first"}, {"project_name": "second", "codecov": "n"}]
+
+    def test_json_list(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "projects.json"
+        manifest.write_text(json.dumps([{"project_name": "first"}]))
+        assert read_manifest(manifest) == [{"project_name": "first"}]
+
+    def test_json_must_be_a_list_of_objects(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "projects.json"
+        manifest.write_text(json.dumps({"project_name": "first"}))
+        with pytest.raises(ValueError, match="list of objects"):
+            read_manifest(manifest)
+
+
+class TestBake:
+    def test_bake_returns_project_dir(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        project_dir = bake({"project_name": "my-project", "mkdocs": "n"}, tmp_path, config_file=cookiecutter_config)
+        assert project_dir == tmp_path / "my-project"
+        assert (project_dir / "pyproject.toml").is_file()
+        assert not (project_dir / "docs").exists()
+
+    def test_bake_ignores_user_config(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        user_config = tmp_path / "user.yaml"
+        replay_dir = tmp_path / "user-replay"
+        user_config.write_text(
+            json.dumps({"default_context": {"project_name": "leaked"}, "replay_dir": str(replay_dir)})
+        )
+        monkeypatch.setenv("COOKIECUTTER_CONFIG", str(user_config))
+        config_file = isolated_config(tmp_path / "isolated")
+
+        project_dir = bake({}, tmp_path / "out", config_file=config_file)
+        assert project_dir.name == "example-project"
+        assert not replay_dir.exists()
+        assert list((tmp_path / "isolated" / "replay").iterdir())
+
+    def test_bake_many_in_process(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        contexts = [{"project_name": "first"}, {"project_name": "second", "layout": "src"}]
+        results = bake_many(contexts, tmp_path, config_file=cookiecutter_config)
+        assert [result.ok for result in results] == [True, True]
+        assert [result.project_dir for result in results] == [tmp_path / "first", tmp_path / "second"]
+        assert (tmp_path / "second" / "src" / "second").is_dir()
+
+    def test_bake_many_reports_failures_and_continues(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        contexts = [{"project_name": "first"}, {"project_name": "first"}, {"project_name": "third"}]
+        results = bake_many(contexts, tmp_path, config_file=cookiecutter_config)
+        assert [result.ok for result in results] == [True, False, True]
+        assert "OutputDirExistsException" in (results[1].error or "")
+
+    def test_bake_many_with_processes(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        contexts = [{"project_name": f"project-{i}"} for i in range(3)]
+        results = bake_many(contexts, tmp_path, processes=2, config_file=cookiecutter_config)
+        assert [result.project_dir for result in results] == [tmp_path / f"project-{i}" for i in range(3)]
+        assert all((tmp_path / f"project-{i}" / "pyproject.toml").is_file() for i in range(3))
+
+
+class TestCli:
+    def test_bake_command(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        manifest = tmp_path / "projects.csv"
+        manifest.write_text("project_name\nfirst\nsecond\n")
+        output_dir = tmp_path / "out"
+        args = ["bake", str(manifest), "--output-dir", str(output_dir), "--config-file", str(cookiecutter_config)]
+        result = CliRunner().invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert (output_dir / "first").is_dir()
+        assert (output_dir / "second").is_dir()
+
+    def test_bake_command_fails_if_a_project_fails(self, tmp_path: Path, cookiecutter_config: Path) -> None:
+        manifest = tmp_path / "projects.jsonl"
+        manifest.write_text('{"project_name": "first"}\n{"project_name": "first"}\n')
+        args = ["bake", str(manifest), "--output-dir", str(tmp_path), "--config-file", str(cookiecutter_config)]
+        result = CliRunner().invoke(main, args)
+        assert result.exit_code == 1
+        assert "1 of 2 projects failed" in result.output
+
+    def test_combinations_command_writes_a_manifest(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(main, ["combinations", "--strength", "1"])
+        assert result.exit_code == 0, result.output
+        manifest = tmp_path / "projects.jsonl"
+        manifest.write_text(result.output)
+        contexts = read_manifest(manifest)
+        assert {context["open_source_license"] for context in contexts} == {
+            "MIT license",
+            "BSD license",
+            "ISC license",
+            "Apache Software License 2.0",
+            "GNU General Public License v3",
+            "Not open source",
+        }
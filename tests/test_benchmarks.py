@@ -0,0 +1,70 @@
+"""Smoke tests for the benchmark suite."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from benchmarks import bench_bake
+from benchmarks.bench_cicd import compare, main, run_benchmarks
+
+
+def test_run_benchmarks_updates_every_file() -> None:
+    results = {result["phase"]: result for result in run_benchmarks([3], [4], repeat=1)}
+
+    assert set(results) == {"resolve", "pyproject", "action_yml", "precommit", "total"}
+    assert results["pyproject"]["updates"] == 3 * 4
+    assert results["action_yml"]["updates"] == 3
+    assert results["precommit"]["updates"] == 3 * 2
+
+
+def test_compare_reports_ratio() -> None:
+    baseline = [{"name": "pyproject[files=1,packages=1]", "min": 1.0}]
+    results = [{"name": "pyproject[files=1,packages=1]", "min": 1.5}, {"name": "new", "min": 1.0}]
+
+    assert compare(baseline, results) == [("pyproject[files=1,packages=1]", 1.0, 1.5, 1.5)]
+
+
+def test_cli_writes_results(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    result = CliRunner().invoke(main, ["--files", "2", "--packages", "2", "--repeat", "1", "-o", str(output)])
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(output.read_text())
+    assert data["metadata"]["python"]
+    assert len(data["results"]) == 5
+
+
+def test_bake_benchmark_breaks_down_each_bake() -> None:
+    results = bench_bake.run_benchmark([{}, {"mkdocs": "n"}], projects=2, warmup=0)
+
+    assert results["projects"] == 2
+    assert results["latency"]["p50"] <= results["latency"]["p95"]
+    assert {"context", "render", "hooks", "other"} <= set(results["phases"])
+    assert set(results["hooks"]) == {"pre_gen_project", "post_gen_project"}
+    files = {entry["path"]: entry["renders"] for entry in results["files"]}
+    assert files["pyproject.toml"] == 2
+    assert files["{{ optional('mkdocs', 'mkdocs.yml') }}"] == 2
+
+
+def test_percentile() -> None:
+    values = [float(i) for i in range(1, 21)]
+    assert bench_bake.percentile(values, 50) == 10.0
+    assert bench_bake.percentile(values, 95) == 19.0
+    assert bench_bake.percentile([1.0], 95) == 1.0
+
+
+def test_bake_cli_writes_and_compares_results(tmp_path: Path) -> None:
+    output = tmp_path / "bake-results.json"
+    result = CliRunner().invoke(bench_bake.main, ["--projects", "1", "--warmup", "0", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    data = json.loads(output.read_text())
+    assert data["results"]["projects_per_second"] > 0
+
+    result = CliRunner().invoke(
+        bench_bake.main, ["--projects", "1", "--warmup", "0", "--compare", str(output), "--max-slowdown", "1000"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "latency p50" in result.output
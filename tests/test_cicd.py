@@ -2,14 +2,49 @@
 
 from __future__ import annotations
 
+import json
+import os
 import shutil
+import subprocess
+import sys
+import time
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
+from click.testing import CliRunner
 
-from cookiecutter_uv.cicd.fetchers import GitHubRepo, get_github_release, get_github_tag, get_pypi_version
-from cookiecutter_uv.cicd.updaters import ActionYmlUpdater, PreCommitConfigUpdater, PyprojectTomlUpdater
+from benchmarks.mock_server import MockServer, fake_version
+from cookiecutter_uv.bake import TEMPLATE_DIR
+from cookiecutter_uv.cicd import fetchers
+from cookiecutter_uv.cicd.cache import CacheEntry, HttpCache
+from cookiecutter_uv.cicd.cli import cli
+from cookiecutter_uv.cicd.discovery import DiscoveredFiles, discover_files
+from cookiecutter_uv.cicd.executor import FileEdit, apply_file_edits, merge_file_edits, write_atomic
+from cookiecutter_uv.cicd.fetchers import (
+    FetchSettings,
+    GitHubRepo,
+    ResolvedVersions,
+    fetch_versions,
+    get_github_release,
+    get_github_tag,
+    get_github_versions,
+    get_pypi_version,
+    get_simple_index_version,
+)
+from cookiecutter_uv.cicd.plan import load_plan, plan_to_dict, save_plan, unified_diff
+from cookiecutter_uv.cicd.profiling import Profiler, profiler
+from cookiecutter_uv.cicd.pyproject import Edit, apply_edits, parse_dependencies
+from cookiecutter_uv.cicd.session import HttpSession, Response
+from cookiecutter_uv.cicd.snapshot import load_snapshot, save_snapshot
+from cookiecutter_uv.cicd.state import UpdateState
+from cookiecutter_uv.cicd.updaters import (
+    ActionYmlUpdater,
+    PreCommitConfigUpdater,
+    PyprojectTomlUpdater,
+    WorkflowUsesUpdater,
+    find_action_references,
+)
 
 DATA_DIR = Path(__file__).parent / "data" / "cicd"
 
@@ -30,6 +65,14 @@ def temp_action_yml(tmp_path: Path) -> Path:
     return dest
 
 
+@pytest.fixture
+def temp_workflow(tmp_path: Path) -> Path:
+    """Copy sample workflow to temp directory."""
+    dest = tmp_path / "main.yml"
+    shutil.copy(DATA_DIR / "sample_workflow.yml", dest)
+    return dest
+
+
 @pytest.fixture
 def temp_precommit(tmp_path: Path) -> Path:
     """Copy sample pre-commit config to temp directory."""
@@ -64,6 +107,534 @@ class TestFetchers:
         with patch("cookiecutter_uv.cicd.fetchers._fetch_json", return_value=mock_response):
             assert get_github_tag(GitHubRepo("pre-commit", "pre-commit-hooks")) == "5.0.0"
 
+    def test_get_simple_index_version_skips_yanked_and_prereleases(self) -> None:
+        mock_response = {
+            "name": "pytest",
+            "files": [
+                {"filename": "pytest-8.0.0-py3-none-any.whl", "yanked": False},
+                {"filename": "pytest-8.0.0.tar.gz", "yanked": False},
+                {"filename": "pytest-8.1.0-py3-none-any.whl", "yanked": "broken release"},
+                {"filename": "pytest-9.0.0rc1-py3-none-any.whl"},
+                {"filename": "pytest-8.0.1.tar.gz"},
+            ],
+        }
+        with patch("cookiecutter_uv.cicd.fetchers._fetch_json", return_value=mock_response) as fetch_json:
+            assert get_simple_index_version("pytest", "http://localhost:8080/simple/") == "8.0.1"
+
+        fetch_json.assert_called_once_with(
+            "http://localhost:8080/simple/pytest/", accept="application/vnd.pypi.simple.v1+json"
+        )
+
+    def test_get_pypi_version_uses_simple_api_when_configured(self) -> None:
+        mock_response = {"files": [{"filename": "ruff-0.9.0-py3-none-any.whl"}]}
+        with (
+            patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(pypi_api="simple")),
+            patch("cookiecutter_uv.cicd.fetchers._fetch_json", return_value=mock_response),
+        ):
+            assert get_pypi_version("ruff") == "0.9.0"
+
+    def test_fetch_versions_resolves_all(self) -> None:
+        uv = GitHubRepo("astral-sh", "uv")
+        hooks = GitHubRepo("pre-commit", "pre-commit-hooks")
+        with (
+            patch("cookiecutter_uv.cicd.fetchers.get_pypi_version", side_effect=lambda p: f"{p}-1.0"),
+            patch("cookiecutter_uv.cicd.fetchers.get_github_release", return_value="0.9.0"),
+            patch("cookiecutter_uv.cicd.fetchers.get_github_tag", return_value="5.0.0") as get_tag,
+        ):
+            versions = fetch_versions(["pytest", "ruff", "pytest"], [uv], [hooks, hooks], max_workers=2)
+
+        assert versions.pypi == {"pytest": "pytest-1.0", "ruff": "ruff-1.0"}
+        assert versions.releases == {uv: "0.9.0"}
+        assert versions.tags == {hooks: "5.0.0"}
+        assert get_tag.call_count == 1
+
+
+class TestGitHubGraphQL:
+    UV = GitHubRepo("astral-sh", "uv")
+    HOOKS = GitHubRepo("pre-commit", "pre-commit-hooks")
+
+    def test_resolves_all_repos_in_one_request(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("GITHUB_TOKEN", "token")
+        with MockServer() as server:
+            settings = FetchSettings(github_api_url=server.url, github_api="graphql")
+            with patch("cookiecutter_uv.cicd.fetchers.settings", settings):
+                result = get_github_versions([self.UV], [self.HOOKS, self.UV])
+
+        assert result is not None
+        releases, tags = result
+        assert releases == {self.UV: fake_version("astral-sh/uv")}
+        assert tags == {self.UV: fake_version("astral-sh/uv"), self.HOOKS: fake_version("pre-commit/pre-commit-hooks")}
+        assert server.request_count == 1
+
+    def test_missing_repository_maps_to_none(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.setenv("GH_TOKEN", "token")
+        session = MagicMock(spec=HttpSession)
+        session.request.return_value = Response(200, body=b'{"data": {"r0": null}, "errors": [{"type": "NOT_FOUND"}]}')
+        with patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(session=session)):
+            assert get_github_versions([self.UV], []) == ({self.UV: None}, {})
+
+        _, url, headers, _ = session.request.call_args.args
+        assert url == "https://api.github.com/graphql"
+        assert headers["Authorization"] == "bearer token"
+
+    def test_requires_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        session = MagicMock(spec=HttpSession)
+        with patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(session=session)):
+            assert get_github_versions([self.UV], []) is None
+        session.request.assert_not_called()
+
+    def test_fetch_versions_falls_back_to_rest(self) -> None:
+        with (
+            patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(github_api="graphql")),
+            patch("cookiecutter_uv.cicd.fetchers.get_github_versions", return_value=None),
+            patch("cookiecutter_uv.cicd.fetchers.get_github_release", return_value="0.9.0"),
+            patch("cookiecutter_uv.cicd.fetchers.get_github_tag", return_value="5.0.0"),
+        ):
+            versions = fetch_versions([], [self.UV], [self.HOOKS])
+
+        assert versions.releases == {self.UV: "0.9.0"}
+        assert versions.tags == {self.HOOKS: "5.0.0"}
+
+
+class TestHttpCache:
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        cache = HttpCache(tmp_path)
+        cache.put(CacheEntry(url="https://example.com/a", body="{}", etag='"abc"', fetched_at=time.time()))
+
+        entry = cache.get("https://example.com/a")
+        assert entry is not None
+        assert entry.is_fresh(cache.ttl)
+        assert entry.conditional_headers() == {"If-None-Match": '"abc"'}
+        assert cache.get("https://example.com/b") is None
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = HttpCache(tmp_path, max_size=250)
+        for i in range(3):
+            cache.put(CacheEntry(url=f"https://example.com/{i}", body="x" * 50))
+            # Ensure distinct modification times.
+            time.sleep(0.01)
+
+        assert cache.get("https://example.com/0") is None
+        assert cache.get("https://example.com/2") is not None
+
+
+class TestFetchJsonCache:
+    URL = "https://pypi.org/pypi/pytest/json"
+
+    @staticmethod
+    def _session(response: Response) -> MagicMock:
+        session = MagicMock(spec=HttpSession)
+        session.get.return_value = response
+        return session
+
+    def test_fresh_entry_skips_network(self, tmp_path: Path) -> None:
+        cache = HttpCache(tmp_path)
+        cache.put(CacheEntry(url=self.URL, body='{"cached": true}', fetched_at=time.time()))
+        session = self._session(Response(200))
+        with patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(cache=cache, session=session)):
+            assert fetchers._fetch_json(self.URL) == {"cached": True}
+        session.get.assert_not_called()
+
+    def test_stores_response_with_validators(self, tmp_path: Path) -> None:
+        cache = HttpCache(tmp_path)
+        session = self._session(Response(200, {"etag": '"v1"'}, b'{"info": {}}'))
+        with patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(cache=cache, session=session)):
+            assert fetchers._fetch_json(self.URL) == {"info": {}}
+
+        entry = cache.get(self.URL)
+        assert entry is not None
+        assert entry.etag == '"v1"'
+
+    def test_not_modified_revalidates_stale_entry(self, tmp_path: Path) -> None:
+        cache = HttpCache(tmp_path, ttl=0)
+        cache.put(CacheEntry(url=self.URL, body='{"cached": true}', etag='"v1"'))
+        session = self._session(Response(304))
+        with patch("cookiecutter_uv.cicd.fetchers.settings", FetchSettings(cache=cache, session=session)):
+            assert fetchers._fetch_json(self.URL) == {"cached": True}
+
+        _, headers = session.get.call_args.args
+        assert headers["If-None-Match"] == '"v1"'
+        entry = cache.get(self.URL)
+        assert entry is not None
+        assert entry.fetched_at > 0
+
+
+class TestHttpSession:
+    def test_reuses_connections(self) -> None:
+        session = HttpSession()
+        with MockServer() as server:
+            for package in ("pytest", "ruff", "mypy"):
+                assert session.get(f"{server.url}/pypi/{package}/json").status == 200
+            session.close()
+
+        assert server.request_count == 3
+        assert server.connection_count == 1
+
+    def test_decodes_gzip(self) -> None:
+        with MockServer() as server:
+            response = HttpSession().get(f"{server.url}/pypi/pytest/json")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(response.body)["info"]["name"] == "pytest"
+
+    def test_retries_transient_errors(self) -> None:
+        with MockServer() as server:
+            server.fail_next = 2
+            response = HttpSession(backoff=0).get(f"{server.url}/pypi/pytest/json")
+
+        assert response.status == 200
+        assert server.request_count == 3
+
+    def test_gives_up_after_retries(self) -> None:
+        with MockServer() as server:
+            server.fail_next = 5
+            response = HttpSession(retries=1, backoff=0).get(f"{server.url}/pypi/pytest/json")
+
+        assert response.status == 503
+
+    @pytest.mark.parametrize(
+        ("location", "authorized"),
+        [("/repos/astral-sh/uv/releases/latest", True), ("https://objects.example.com/release", False)],
+    )
+    def test_keeps_authorization_on_the_same_host_only(self, location: str, authorized: bool) -> None:
+        session = HttpSession()
+        responses = [Response(302, {"location": location}), Response(200)]
+        with patch.object(session, "_request_with_retries", side_effect=responses) as send:
+            session.get("https://api.github.com/repos/astral-sh/uv", {"Authorization": "Bearer token"})
+
+        _, _, headers, _ = send.call_args.args
+        assert ("Authorization" in headers) is authorized
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        versions = ResolvedVersions(
+            pypi={"pytest": "8.0.0", "missing": None},
+            releases={GitHubRepo("astral-sh", "uv"): "0.9.7"},
+            tags={GitHubRepo("pre-commit", "pre-commit-hooks"): "5.0.0"},
+            commits={(GitHubRepo("actions", "checkout"), "v4"): "0" * 40},
+        )
+        path = tmp_path / "versions.json"
+        save_snapshot(versions, path)
+
+        assert load_snapshot(path) == versions
+
+    def test_rejects_unknown_format(self, tmp_path: Path) -> None:
+        path = tmp_path / "versions.json"
+        path.write_text('{"format": 99}')
+
+        with pytest.raises(ValueError, match="Unsupported snapshot format"):
+            load_snapshot(path)
+
+
+class TestPlan:
+    VERSIONS = ResolvedVersions(pypi={"pytest": "8.0.0", "ruff": "0.0.1"})
+
+    def _plan(self, temp_pyproject: Path) -> list[FileEdit]:
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest", "ruff"]):
+            return PyprojectTomlUpdater([temp_pyproject], self.VERSIONS).plan()
+
+    def test_lists_span_edits(self, temp_pyproject: Path) -> None:
+        data = plan_to_dict(self._plan(temp_pyproject))
+
+        [entry] = data["files"]
+        assert entry["count"] == 1
+        assert [(edit["old"], edit["new"]) for edit in entry["edits"]] == [("7.2.0", "8.0.0")]
+
+    def test_round_trip_applies_without_parsing(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        planned = self._plan(temp_pyproject)
+        save_plan(planned, tmp_path / "plan.json")
+
+        with patch("cookiecutter_uv.cicd.updaters.parse_dependencies") as parse:
+            loaded = load_plan(tmp_path / "plan.json")
+        parse.assert_not_called()
+        assert [edit.updated for edit in loaded] == [planned[0].updated]
+
+    def test_rejects_changed_file(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        save_plan(self._plan(temp_pyproject), tmp_path / "plan.json")
+        temp_pyproject.write_text(temp_pyproject.read_text().replace("pytest", "pytest "))
+
+        with pytest.raises(ValueError, match="has changed since the plan was made"):
+            load_plan(tmp_path / "plan.json")
+
+    def test_rejects_overlapping_edits(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        plan_file = tmp_path / "plan.json"
+        save_plan(self._plan(temp_pyproject), plan_file)
+        data = json.loads(plan_file.read_text())
+        data["files"][0]["edits"] *= 2
+        plan_file.write_text(json.dumps(data))
+
+        with pytest.raises(ValueError, match="overlapping edits"):
+            load_plan(plan_file)
+
+    def test_unified_diff(self, temp_pyproject: Path) -> None:
+        diff = unified_diff(self._plan(temp_pyproject))
+
+        assert diff.startswith(f"--- {temp_pyproject}\n+++ {temp_pyproject}\n")
+        assert '-    "pytest>=7.2.0",\n+    "pytest>=8.0.0",\n' in diff
+
+
+class TestProfiling:
+    def test_disabled_profiler_records_nothing(self, temp_pyproject: Path) -> None:
+        profiler.reset()
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest"]):
+            PyprojectTomlUpdater([temp_pyproject], ResolvedVersions(pypi={"pytest": "8.0.0"})).plan()
+
+        assert profiler.spans == []
+
+    def test_summary_and_trace(self) -> None:
+        local = Profiler()
+        with local.span("fetch", "pypi.org", url="https://pypi.org/pypi/pytest/json"):
+            pass
+        with local.span("fetch", "pypi.org"):
+            pass
+        local.count("cache.hit", 3)
+
+        summary = local.summary()
+        assert "pypi.org" in summary.splitlines()[1]
+        assert summary.splitlines()[1].split()[2] == "2"
+        assert "cache.hit" in summary
+
+        events = local.chrome_trace()["traceEvents"]
+        assert [event["ph"] for event in events] == ["X", "X", "C"]
+        assert events[0]["args"] == {"url": "https://pypi.org/pypi/pytest/json"}
+
+
+class TestUpdateState:
+    VERSIONS = ResolvedVersions(pypi={"pytest": "8.0.0"}, releases={GitHubRepo("astral-sh", "uv"): "0.9.7"})
+
+    def test_round_trip(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        state = UpdateState()
+        state.record(temp_pyproject, {"pypi:pytest", "release:astral-sh/uv"}, self.VERSIONS)
+        state.save(tmp_path / "state.json")
+
+        loaded = UpdateState.load(tmp_path / "state.json")
+        assert loaded.unchanged(temp_pyproject)
+        assert loaded.releases(temp_pyproject) == [GitHubRepo("astral-sh", "uv")]
+        assert not loaded.outdated(temp_pyproject, self.VERSIONS)
+
+    def test_detects_changed_content(self, temp_pyproject: Path) -> None:
+        state = UpdateState()
+        state.record(temp_pyproject, set(), self.VERSIONS)
+        temp_pyproject.write_text(temp_pyproject.read_text() + "\n")
+
+        assert not state.unchanged(temp_pyproject)
+
+    def test_same_content_with_new_mtime_is_unchanged(self, temp_pyproject: Path) -> None:
+        state = UpdateState()
+        state.record(temp_pyproject, set(), self.VERSIONS)
+        temp_pyproject.write_text(temp_pyproject.read_text())
+        os.utime(temp_pyproject, ns=(0, 0))
+
+        assert state.unchanged(temp_pyproject)
+
+    def test_detects_moved_versions(self, temp_pyproject: Path) -> None:
+        state = UpdateState()
+        state.record(temp_pyproject, {"pypi:pytest"}, self.VERSIONS)
+
+        assert state.outdated(temp_pyproject, ResolvedVersions(pypi={"pytest": "9.0.0"}))
+        assert not state.outdated(temp_pyproject, ResolvedVersions(pypi={"pytest": "8.0.0", "ruff": "1.0.0"}))
+
+    def test_rejects_unknown_format(self, tmp_path: Path) -> None:
+        path = tmp_path / "state.json"
+        path.write_text('{"format": 99}')
+
+        with pytest.raises(ValueError, match="Unsupported state format"):
+            UpdateState.load(path)
+
+
+class TestDependencyIndex:
+    @pytest.fixture
+    def layouts(self) -> str:
+        return (DATA_DIR / "sample_pyproject_layouts.toml").read_text()
+
+    def test_indexes_all_dependency_sections(self, layouts: str) -> None:
+        index = parse_dependencies(layouts)
+        sections = {(r.name, r.section) for r in index.requirements}
+
+        assert ("click", "project.dependencies") in sections
+        assert ("mkdocs-material", "project.optional-dependencies.docs") in sections
+        assert ("Pytest_Cov", "dependency-groups.dev") in sections
+        assert ("ruff", "dependency-groups.lint") in sections
+        assert ("hatchling", "build-system.requires") in sections
+        assert not index.find("pytest")
+
+    def test_records_clause_locations(self, layouts: str) -> None:
+        (requirement,) = parse_dependencies(layouts).find("requests")
+        (clause,) = requirement.clauses
+
+        assert clause.operator == "~="
+        assert layouts[clause.start : clause.end] == "2.31"
+
+    def test_finds_normalized_names(self, layouts: str) -> None:
+        assert parse_dependencies(layouts).find("pytest-cov")
+
+    def test_skips_jinja_tags(self) -> None:
+        content = (Path(__file__).parents[1] / "{{cookiecutter.project_name}}" / "pyproject.toml").read_text()
+        names = {r.name for r in parse_dependencies(content).requirements}
+        assert {"deptry", "mypy", "ty", "mkdocstrings"} <= names
+
+    @pytest.mark.parametrize(
+        ("package", "version", "expected"),
+        [
+            ("click", "8.2.0", '"click==8.2.0"'),
+            ("requests", "2.32.3", "'requests ~= 2.32'"),
+            ("mkdocs", "1.6.1", '"mkdocs>=1.6.1,!=1.5.2"'),
+            ("mkdocs-material", "9.6.0", "\"mkdocs-material[imaging] >= 9.6.0 ; python_version >= '3.10'\""),
+            ("pytest-cov", "6.0.0", '"Pytest_Cov>=6.0.0"'),
+            ("hatchling", "1.27.0", '"hatchling>=1.27.0"'),
+        ],
+    )
+    def test_bump(self, layouts: str, package: str, version: str, expected: str) -> None:
+        (requirement,) = parse_dependencies(layouts).find(package)
+        edit = requirement.bump(version)
+
+        assert edit is not None
+        assert expected in apply_edits(layouts, [edit])
+
+    def test_apply_edits_rejects_overlaps(self) -> None:
+        with pytest.raises(ValueError, match="Overlapping edits"):
+            apply_edits("a = 1", [Edit(4, 5, "1", "2"), Edit(4, 5, "1", "3")])
+        with pytest.raises(ValueError, match="Overlapping edits"):
+            apply_edits("abc", [Edit(0, 2, "ab", "x"), Edit(1, 3, "bc", "y")])
+        assert apply_edits("abc", [Edit(1, 3, "bc", "y"), Edit(0, 1, "a", "x")]) == "xy"
+
+    @pytest.mark.parametrize(
+        ("package", "version"),
+        [
+            ("attrs", "23.1.0"),  # would violate the upper bound
+            ("mkdocs", "1.5.2"),  # excluded version
+            ("ruff", "0.10.0"),  # older than the current pin
+            ("setuptools", "75.0.0"),  # unpinned
+        ],
+    )
+    def test_bump_skipped(self, layouts: str, package: str, version: str) -> None:
+        (requirement,) = parse_dependencies(layouts).find(package)
+        assert requirement.bump(version) is None
+
+
+class TestDiscovery:
+    @staticmethod
+    def _touch(root: Path, *paths: str) -> None:
+        for rel_path in paths:
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def test_finds_files_by_type(self, tmp_path: Path) -> None:
+        self._touch(
+            tmp_path,
+            "pyproject.toml",
+            ".pre-commit-config.yaml",
+            ".github/actions/setup-python-env/action.yml",
+            "services/api/pyproject.toml",
+            "services/api/README.md",
+        )
+        found = discover_files(tmp_path)
+
+        assert found.pyproject == [tmp_path / "pyproject.toml", tmp_path / "services/api/pyproject.toml"]
+        assert found.action_yml == [tmp_path / ".github/actions/setup-python-env/action.yml"]
+        assert found.precommit == [tmp_path / ".pre-commit-config.yaml"]
+
+    def test_finds_workflows(self, tmp_path: Path) -> None:
+        self._touch(tmp_path, ".github/workflows/main.yml", ".github/workflows/README.md", "ci/workflows/other.yml")
+        found = discover_files(tmp_path)
+
+        assert found.workflows == [tmp_path / ".github/workflows/main.yml"]
+
+    def test_finds_optional_template_files(self, tmp_path: Path) -> None:
+        self._touch(
+            tmp_path,
+            ".github/workflows/{{ optional('github_actions', 'main.yml') }}",
+            ".github/actions/setup-python-env/{{ optional('github_actions', 'action.yml') }}",
+            "{{ optional('mkdocs', 'mkdocs.yml') }}",
+        )
+        found = discover_files(tmp_path)
+
+        assert found.workflows == [tmp_path / ".github/workflows/{{ optional('github_actions', 'main.yml') }}"]
+        assert found.action_yml == [
+            tmp_path / ".github/actions/setup-python-env/{{ optional('github_actions', 'action.yml') }}"
+        ]
+
+    def test_skips_pruned_and_ignored_paths(self, tmp_path: Path) -> None:
+        self._touch(
+            tmp_path,
+            ".venv/lib/pyproject.toml",
+            "node_modules/pkg/pyproject.toml",
+            "build/pyproject.toml",
+            "vendor/a/pyproject.toml",
+            "vendor/keep/pyproject.toml",
+            "services/api/generated/pyproject.toml",
+            "services/api/pyproject.toml",
+        )
+        (tmp_path / ".gitignore").write_text("# comment\nbuild/\n/vendor/*\n!/vendor/keep\n")
+        (tmp_path / "services" / "api" / ".gitignore").write_text("generated\n")
+
+        found = discover_files(tmp_path)
+
+        assert found.pyproject == [tmp_path / "services/api/pyproject.toml", tmp_path / "vendor/keep/pyproject.toml"]
+
+    def test_extend_skips_files_already_listed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        self._touch(tmp_path, "pyproject.toml", "services/api/pyproject.toml")
+        monkeypatch.chdir(tmp_path)
+        files = DiscoveredFiles([Path("pyproject.toml"), tmp_path / "pyproject.toml"])
+        files.extend(discover_files(tmp_path))
+
+        assert files.pyproject == [Path("pyproject.toml"), tmp_path / "services/api/pyproject.toml"]
+
+
+class TestExecutor:
+    def test_write_atomic_keeps_mode(self, tmp_path: Path) -> None:
+        target = tmp_path / "script.sh"
+        target.write_text("old")
+        target.chmod(0o755)
+
+        write_atomic(target, "new")
+
+        assert target.read_text() == "new"
+        assert target.stat().st_mode & 0o777 == 0o755
+        assert list(tmp_path.iterdir()) == [target]
+
+    def test_applies_changed_files(self, tmp_path: Path) -> None:
+        files = [tmp_path / f"{i}.toml" for i in range(4)]
+        for f in files:
+            f.write_text("old")
+        edits = [FileEdit(f, "old", "new" if i % 2 else "old", i % 2) for i, f in enumerate(files)]
+
+        apply_file_edits(edits, max_workers=2)
+
+        assert [f.read_text() for f in files] == ["old", "new", "old", "new"]
+
+    def test_rolls_back_on_failure(self, tmp_path: Path) -> None:
+        good = tmp_path / "good.toml"
+        good.write_text("old")
+        missing = tmp_path / "missing" / "pyproject.toml"
+        edits = [FileEdit(good, "old", "new", 1), FileEdit(missing, "old", "new", 1)]
+
+        with pytest.raises(OSError):
+            apply_file_edits(edits, max_workers=1)
+
+        assert good.read_text() == "old"
+
+    def test_merge_rejects_edits_planned_from_the_same_original(self, temp_pyproject: Path) -> None:
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest"]):
+            first = PyprojectTomlUpdater([temp_pyproject], ResolvedVersions(pypi={"pytest": "8.0.0"})).plan()
+            second = PyprojectTomlUpdater([temp_pyproject], ResolvedVersions(pypi={"pytest": "9.0.0"})).plan()
+
+        with pytest.raises(ValueError, match="not planned one after another"):
+            merge_file_edits([*first, *second])
+
+    def test_merge_rejects_overlapping_spans(self, tmp_path: Path) -> None:
+        path = tmp_path / "pyproject.toml"
+        first = FileEdit(path, "a = 1", "a = 22", 1, [Edit(4, 5, "1", "22")])
+        second = FileEdit(path, "a = 22", "a = 3", 1, [Edit(4, 6, "22", "3")])
+
+        with pytest.raises(ValueError, match="overlap"):
+            merge_file_edits([first, second])
+
 
 class TestPyprojectTomlUpdater:
     def test_updates_package_version(self, temp_pyproject: Path) -> None:
@@ -98,8 +669,66 @@ class TestPyprojectTomlUpdater:
 
         assert temp_pyproject.read_text() == original
 
+    def test_updates_all_packages_in_one_write(self, temp_pyproject: Path) -> None:
+        versions = ResolvedVersions(pypi={"pytest": "8.0.0", "ruff": "0.12.0", "mkdocstrings": "0.30.0"})
+        with (
+            patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest", "ruff", "mkdocstrings"]),
+            patch("cookiecutter_uv.cicd.executor.write_atomic", side_effect=write_atomic) as write,
+        ):
+            count = PyprojectTomlUpdater([temp_pyproject], versions).update()
+
+        assert count == 3
+        assert write.call_count == 1
+        content = temp_pyproject.read_text()
+        assert '"pytest>=8.0.0"' in content
+        assert '"ruff>=0.12.0"' in content
+        assert '"mkdocstrings[python]>=0.30.0"' in content
+
+    def test_skips_packages_already_at_latest(self, temp_pyproject: Path) -> None:
+        versions = ResolvedVersions(pypi={"pytest": "7.2.0"})
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest"]):
+            assert PyprojectTomlUpdater([temp_pyproject], versions).update(dry_run=True) == 0
+
+    def test_updates_all_layouts(self, tmp_path: Path) -> None:
+        dest = tmp_path / "pyproject.toml"
+        shutil.copy(DATA_DIR / "sample_pyproject_layouts.toml", dest)
+        versions = ResolvedVersions(pypi={"click": "8.2.0", "ruff": "0.12.0", "pytest": "8.0.0"})
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["click", "ruff", "pytest"]):
+            count = PyprojectTomlUpdater([dest], versions).update()
+
+        assert count == 2
+        content = dest.read_text()
+        assert '"click==8.2.0"' in content
+        assert 'lint = ["ruff>=0.12.0"]' in content
+        assert '["pytest>=1.0"]' in content
+
+    def test_updates_optional_template_dependency(self, tmp_path: Path) -> None:
+        dest = tmp_path / "pyproject.toml"
+        shutil.copy(TEMPLATE_DIR / "{{cookiecutter.project_name}}" / "pyproject.toml", dest)
+        versions = ResolvedVersions(pypi={"pytest-benchmark": "99.0.0"})
+        with patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest-benchmark"]):
+            assert PyprojectTomlUpdater([dest], versions).update() == 1
+
+        assert "{% if cookiecutter.benchmarks == 'y' %}\"pytest-benchmark>=99.0.0\",{% endif %}" in dest.read_text()
+
+    def test_uses_prefetched_versions(self, temp_pyproject: Path) -> None:
+        versions = ResolvedVersions(pypi={"pytest": "8.0.0"})
+        with (
+            patch("cookiecutter_uv.cicd.updaters.PYPI_PACKAGES", ["pytest"]),
+            patch("cookiecutter_uv.cicd.updaters.get_pypi_version") as get_version,
+        ):
+            count = PyprojectTomlUpdater([temp_pyproject], versions).update()
+
+        assert count == 1
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+        get_version.assert_not_called()
+
 
 class TestActionYmlUpdater:
+    def test_keys(self, temp_action_yml: Path) -> None:
+        assert ActionYmlUpdater.keys(temp_action_yml.read_text()) == {"release:astral-sh/uv"}
+        assert ActionYmlUpdater.keys("name: setup\n") == set()
+
     def test_updates_uv_version(self, temp_action_yml: Path) -> None:
         with patch("cookiecutter_uv.cicd.updaters.get_github_release", return_value="0.9.7"):
             count = ActionYmlUpdater([temp_action_yml]).update()
@@ -109,6 +738,107 @@ class TestActionYmlUpdater:
         assert 'default: "0.9.7"' in content
 
 
+class TestWorkflowUsesUpdater:
+    CHECKOUT = GitHubRepo("actions", "checkout")
+    CACHE = GitHubRepo("actions", "cache")
+    CODECOV = GitHubRepo("codecov", "codecov-action")
+    CODEQL = GitHubRepo("github", "codeql-action")
+    SHA = "0123456789abcdef0123456789abcdef01234567"
+
+    def _versions(self) -> ResolvedVersions:
+        return ResolvedVersions(
+            releases={self.CHECKOUT: "4.2.2", self.CACHE: "4.2.0", self.CODECOV: "5.4.3", self.CODEQL: "3.28.1"}
+        )
+
+    def test_finds_remote_action_references(self, temp_workflow: Path) -> None:
+        references = find_action_references(temp_workflow.read_text())
+
+        assert [(str(r.repo), r.ref, r.version) for r in references] == [
+            ("actions/checkout", "v4", "v4"),
+            ("actions/cache", "v3.3.1", "v3.3.1"),
+            ("codecov/codecov-action", "v3", "v3"),
+            ("github/codeql-action", "8a470fddafa5cbb6266ee11b37ef4d8aae19c571", "v3.24.0"),
+        ]
+
+    def test_keeps_ref_precision(self, temp_workflow: Path) -> None:
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit", return_value=self.SHA):
+            count = WorkflowUsesUpdater([temp_workflow], self._versions()).update()
+
+        content = temp_workflow.read_text()
+        assert count == 3
+        assert "uses: actions/checkout@v4\n" in content
+        assert "uses: actions/cache@v4.2.0\n" in content
+        assert 'uses: "codecov/codecov-action@v5"\n' in content
+        assert f"uses: github/codeql-action/init@{self.SHA} # v3.28.1\n" in content
+        assert "uses: ./.github/actions/setup-python-env\n" in content
+
+    def test_resolves_each_repo_once(self, tmp_path: Path, temp_workflow: Path) -> None:
+        other = tmp_path / "release.yml"
+        other.write_text("steps:\n  - uses: actions/checkout@v3\n  - uses: actions/checkout@v3\n")
+        with (
+            patch("cookiecutter_uv.cicd.updaters.fetch_versions", return_value=self._versions()) as fetch,
+            patch("cookiecutter_uv.cicd.updaters.get_github_commit", return_value=self.SHA) as get_commit,
+        ):
+            count = WorkflowUsesUpdater([temp_workflow, other]).update()
+
+        fetch.assert_called_once()
+        assert fetch.call_args.args[1] == [self.CHECKOUT, self.CACHE, self.CODECOV, self.CODEQL]
+        get_commit.assert_called_once_with(self.CODEQL, "v3.28.1")
+        assert count == 5
+        assert other.read_text().count("actions/checkout@v4") == 2
+
+    def test_pin_sha(self, temp_workflow: Path) -> None:
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit", return_value=self.SHA):
+            WorkflowUsesUpdater([temp_workflow], self._versions(), pin_sha=True).update()
+
+        content = temp_workflow.read_text()
+        assert f"uses: actions/checkout@{self.SHA} # v4\n" in content
+        assert f'uses: "codecov/codecov-action@{self.SHA}" # v5\n' in content
+
+    def test_uses_recorded_commits(self, temp_workflow: Path) -> None:
+        versions = self._versions()
+        versions.commits = {(self.CODEQL, "v3.28.1"): self.SHA}
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit") as get_commit:
+            WorkflowUsesUpdater([temp_workflow], versions, offline=True).update()
+
+        get_commit.assert_not_called()
+        assert f"uses: github/codeql-action/init@{self.SHA} # v3.28.1\n" in temp_workflow.read_text()
+
+    def test_offline_leaves_unrecorded_commits(self, temp_workflow: Path) -> None:
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit") as get_commit:
+            count = WorkflowUsesUpdater([temp_workflow], self._versions(), offline=True).update()
+
+        get_commit.assert_not_called()
+        assert count == 2
+        assert (
+            "github/codeql-action/init@8a470fddafa5cbb6266ee11b37ef4d8aae19c571 # v3.24.0" in temp_workflow.read_text()
+        )
+
+    def test_resolve_commits_of_every_reference(self, temp_workflow: Path) -> None:
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit", return_value=self.SHA):
+            commits = WorkflowUsesUpdater([temp_workflow], self._versions()).resolve_commits()
+
+        assert commits == {
+            (self.CHECKOUT, "v4"): self.SHA,
+            (self.CACHE, "v4.2.0"): self.SHA,
+            (self.CODECOV, "v5"): self.SHA,
+            (self.CODEQL, "v3.28.1"): self.SHA,
+        }
+
+    def test_combines_with_planned_edits(self, temp_action_yml: Path) -> None:
+        versions = ResolvedVersions(
+            releases={GitHubRepo("astral-sh", "uv"): "0.9.7", GitHubRepo("actions", "setup-python"): "6.0.0"}
+        )
+        planned = ActionYmlUpdater([temp_action_yml], versions).plan()
+        edits = merge_file_edits([*planned, *WorkflowUsesUpdater([temp_action_yml], versions).plan(planned)])
+
+        assert len(edits) == 1
+        assert edits[0].count == 2
+        assert 'default: "0.9.7"' in edits[0].updated
+        assert "uses: actions/setup-python@v6" in edits[0].updated
+        assert apply_edits(edits[0].original, edits[0].edits) == edits[0].updated
+
+
 class TestPreCommitConfigUpdater:
     def test_updates_hook_revision(self, temp_precommit: Path) -> None:
         hooks = [
@@ -123,3 +853,290 @@ class TestPreCommitConfigUpdater:
         assert count == 1
         content = temp_precommit.read_text()
         assert 'rev: "v5.0.0"' in content
+
+    def test_keys(self, temp_precommit: Path) -> None:
+        assert PreCommitConfigUpdater.keys(temp_precommit.read_text()) == {
+            "tag:pre-commit/pre-commit-hooks",
+            "tag:astral-sh/ruff-pre-commit",
+        }
+
+
+class TestCli:
+    VERSIONS = ResolvedVersions(
+        pypi={"pytest": "8.0.0"},
+        releases={GitHubRepo("astral-sh", "uv"): "0.9.7"},
+        tags={GitHubRepo("pre-commit", "pre-commit-hooks"): "5.0.0"},
+    )
+
+    def _invoke(self, *args: str) -> str:
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=self.VERSIONS):
+            result = CliRunner().invoke(cli, ["update-dependencies", "--no-cache", *args])
+        assert result.exit_code == 0, result.output
+        return result.output
+
+    def test_update_dependencies(self, temp_pyproject: Path, temp_action_yml: Path, temp_precommit: Path) -> None:
+        output = self._invoke(
+            "--pyproject",
+            str(temp_pyproject),
+            "--action-yml",
+            str(temp_action_yml),
+            "--precommit-config",
+            str(temp_precommit),
+        )
+
+        assert "3 update(s) applied" in output
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+        assert 'default: "0.9.7"' in temp_action_yml.read_text()
+        assert 'rev: "v5.0.0"' in temp_precommit.read_text()
+
+    def test_dry_run_does_not_modify(self, temp_pyproject: Path, temp_action_yml: Path, temp_precommit: Path) -> None:
+        originals = [f.read_text() for f in (temp_pyproject, temp_action_yml, temp_precommit)]
+        output = self._invoke(
+            "--dry-run",
+            "--pyproject",
+            str(temp_pyproject),
+            "--action-yml",
+            str(temp_action_yml),
+            "--precommit-config",
+            str(temp_precommit),
+        )
+
+        assert "3 update(s) would be applied" in output
+        assert [f.read_text() for f in (temp_pyproject, temp_action_yml, temp_precommit)] == originals
+
+    def test_root_discovers_files(self, temp_pyproject: Path, temp_action_yml: Path, temp_precommit: Path) -> None:
+        output = self._invoke("--root", str(temp_pyproject.parent))
+
+        assert "3 update(s) applied" in output
+
+    def test_root_with_explicit_file_updates_it_once(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        plan_file = tmp_path / "plan.json"
+        output = self._invoke(
+            "--root", str(tmp_path), "--pyproject", str(temp_pyproject), "--plan", str(plan_file), "--no-workflows"
+        )
+        assert "with 1 update(s)" in output
+
+        result = CliRunner().invoke(cli, ["apply-plan", str(plan_file)])
+        assert result.exit_code == 0, result.output
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+
+    def test_updates_workflow_actions(self, temp_action_yml: Path) -> None:
+        versions = ResolvedVersions(
+            releases={GitHubRepo("astral-sh", "uv"): "0.9.7", GitHubRepo("actions", "setup-python"): "6.0.0"}
+        )
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=versions) as resolve:
+            result = CliRunner().invoke(
+                cli,
+                ["update-dependencies", "--no-cache", "--action-yml", str(temp_action_yml)],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "2 update(s) applied" in result.output
+        assert resolve.call_args.kwargs["action_repos"] == [GitHubRepo("actions", "setup-python")]
+        assert "actions/setup-python@v6" in temp_action_yml.read_text()
+
+    def test_no_workflows(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        workflow = tmp_path / ".github" / "workflows" / "main.yml"
+        workflow.parent.mkdir(parents=True)
+        workflow.write_text("jobs:\n  test:\n    steps:\n      - uses: actions/checkout@v3\n")
+        versions = ResolvedVersions(pypi={"pytest": "8.0.0"}, releases={GitHubRepo("actions", "checkout"): "4.2.2"})
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=versions) as resolve:
+            result = CliRunner().invoke(
+                cli, ["update-dependencies", "--no-cache", "--root", str(tmp_path), "--no-workflows"]
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "1 update(s) applied" in result.output
+        assert resolve.call_args.kwargs["action_repos"] == []
+        assert "actions/checkout@v3" in workflow.read_text()
+
+    def test_plan_then_apply(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        original = temp_pyproject.read_text()
+        plan_file = tmp_path / "plan.json"
+        output = self._invoke("--diff", "--plan", str(plan_file), "--pyproject", str(temp_pyproject))
+
+        assert '+    "pytest>=8.0.0",' in output
+        assert "Wrote" in output
+        assert temp_pyproject.read_text() == original
+
+        result = CliRunner().invoke(cli, ["apply-plan", str(plan_file)])
+        assert result.exit_code == 0, result.output
+        assert "1 update(s) applied" in result.output
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+
+        result = CliRunner().invoke(cli, ["apply-plan", str(plan_file)])
+        assert result.exit_code == 1
+        assert "has changed since the plan was made" in result.output
+
+    def test_apply_plan_from_another_directory(
+        self, tmp_path: Path, temp_pyproject: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        self._invoke("--plan", "plan.json", "--pyproject", temp_pyproject.name)
+        (tmp_path / "elsewhere").mkdir()
+        monkeypatch.chdir(tmp_path / "elsewhere")
+
+        result = CliRunner().invoke(cli, ["apply-plan", str(tmp_path / "plan.json")])
+        assert result.exit_code == 0, result.output
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+
+    def test_apply_plan_with_deleted_file(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        plan_file = tmp_path / "plan.json"
+        self._invoke("--plan", str(plan_file), "--pyproject", str(temp_pyproject))
+        temp_pyproject.unlink()
+
+        result = CliRunner().invoke(cli, ["apply-plan", str(plan_file)])
+        assert result.exit_code == 1
+        assert f"Error: Cannot update {temp_pyproject}: No such file or directory" in result.output
+
+    def test_profile(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        trace = tmp_path / "trace.json"
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=self.VERSIONS):
+            result = CliRunner().invoke(
+                cli,
+                [
+                    "--profile",
+                    "--profile-output",
+                    str(trace),
+                    "update-dependencies",
+                    "--pyproject",
+                    str(temp_pyproject),
+                ],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert not profiler.enabled
+        assert "total ms" in result.output
+        spans = {(event["cat"], event["name"]) for event in json.loads(trace.read_text())["traceEvents"]}
+        assert {("read", str(temp_pyproject)), ("match", str(temp_pyproject)), ("write", str(temp_pyproject))} <= spans
+        assert ("phase", "plan") in spans
+
+    def test_state_file_skips_unchanged_files(
+        self, tmp_path: Path, temp_pyproject: Path, temp_action_yml: Path, temp_precommit: Path
+    ) -> None:
+        state_file = tmp_path / "state.json"
+        args = ["--root", str(tmp_path), "--state-file", str(state_file)]
+        assert "3 update(s) applied" in self._invoke(*args)
+
+        output = self._invoke(*args)
+        assert "Skipping 3 unchanged file(s)" in output
+        assert "0 update(s) applied" in output
+
+        newer = ResolvedVersions(pypi={"pytest": "9.0.0"}, releases=self.VERSIONS.releases, tags=self.VERSIONS.tags)
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=newer):
+            result = CliRunner().invoke(cli, ["update-dependencies", "--no-cache", *args])
+        assert "Skipping 2 unchanged file(s)" in result.output
+        assert '"pytest>=9.0.0"' in temp_pyproject.read_text()
+
+    def test_state_file_is_reset_when_tracking_changes(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        state_file = tmp_path / "state.json"
+        args = ["--pyproject", str(temp_pyproject), "--state-file", str(state_file)]
+        self._invoke(*args)
+        assert "Skipping 1 unchanged file(s)" in self._invoke(*args)
+
+        with patch("cookiecutter_uv.cicd.state.PYPI_PACKAGES", ["pytest", "newpkg"]):
+            output = self._invoke(*args)
+        assert "processing all files" in output
+        assert "Skipping 0 unchanged file(s)" in output
+
+        assert "processing all files" in self._invoke(*args, "--pin-sha")
+
+    def test_resolve_then_update_from_snapshot(self, tmp_path: Path, temp_pyproject: Path) -> None:
+        snapshot = tmp_path / "versions.json"
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=self.VERSIONS):
+            result = CliRunner().invoke(cli, ["resolve", "--no-cache", "--output", str(snapshot)])
+        assert result.exit_code == 0, result.output
+
+        with patch("cookiecutter_uv.cicd.updaters.resolve_versions") as resolve:
+            result = CliRunner().invoke(
+                cli, ["update-dependencies", "--from-snapshot", str(snapshot), "--pyproject", str(temp_pyproject)]
+            )
+
+        assert result.exit_code == 0, result.output
+        resolve.assert_not_called()
+        assert '"pytest>=8.0.0"' in temp_pyproject.read_text()
+
+    def test_pin_sha_from_snapshot_is_offline(self, tmp_path: Path) -> None:
+        workflow = tmp_path / ".github" / "workflows" / "main.yml"
+        workflow.parent.mkdir(parents=True)
+        workflow.write_text("jobs:\n  test:\n    steps:\n      - uses: actions/checkout@v3\n")
+        snapshot = tmp_path / "versions.json"
+        sha = "0123456789abcdef0123456789abcdef01234567"
+        versions = ResolvedVersions(releases={GitHubRepo("actions", "checkout"): "4.2.2"})
+        with (
+            patch("cookiecutter_uv.cicd.updaters.resolve_versions", return_value=versions),
+            patch("cookiecutter_uv.cicd.updaters.get_github_commit", return_value=sha),
+        ):
+            result = CliRunner().invoke(cli, ["resolve", "--no-cache", "--root", str(tmp_path), "-o", str(snapshot)])
+        assert result.exit_code == 0, result.output
+
+        with patch("cookiecutter_uv.cicd.updaters.get_github_commit") as get_commit:
+            result = CliRunner().invoke(
+                cli, ["update-dependencies", "--from-snapshot", str(snapshot), "--workflow", str(workflow), "--pin-sha"]
+            )
+
+        assert result.exit_code == 0, result.output
+        get_commit.assert_not_called()
+        assert f"actions/checkout@{sha} # v4" in workflow.read_text()
+
+    def test_requires_files_or_root(self) -> None:
+        result = CliRunner().invoke(cli, ["update-dependencies"])
+
+        assert result.exit_code == 2
+        assert "Pass --root" in result.output
+
+
+class TestStartup:
+    HEAVY_MODULES = frozenset(
+        {
+            "http.client",
+            "ssl",
+            "concurrent.futures",
+            "cookiecutter_uv.cicd.fetchers",
+            "cookiecutter_uv.cicd.updaters",
+        }
+    )
+
+    @staticmethod
+    def _python(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+        return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True)
+
+    def test_cli_import_defers_heavy_modules(self) -> None:
+        # Wall-clock import times are too noisy to assert on, especially with xdist workers
+        # competing for the CPU; `python -X importtime` shows them when needed.
+        result = self._python("import click; import cookiecutter_uv.cicd.cli", "-X", "importtime")
+
+        imported = set()
+        for line in result.stderr.splitlines():
+            _, _, times = line.partition("import time:")
+            fields = [field.strip() for field in times.split("|")]
+            if len(fields) == 3 and fields[1].isdigit():
+                imported.add(fields[2])
+
+        assert "cookiecutter_uv.cicd.cli" in imported
+        assert not self.HEAVY_MODULES & imported
+
+    def test_group_help_uses_command_docstrings(self) -> None:
+        result = self._python(
+            "import sys\n"
+            "from cookiecutter_uv.cicd.cli import cli\n"
+            "cli(['--help'], standalone_mode=False)\n"
+            "print(','.join(sys.modules))"
+        )
+
+        loaded = set(result.stdout.splitlines()[-1].split(","))
+        assert "Apply a plan written by 'update-dependencies" in result.stdout
+        assert "Update all dependencies to their latest versions." in result.stdout
+        assert not self.HEAVY_MODULES & loaded
+
+    def test_subcommand_help_defers_heavy_imports(self) -> None:
+        result = self._python(
+            "import sys\n"
+            "from cookiecutter_uv.cicd.cli import cli\n"
+            "cli(['update-dependencies', '--help'], standalone_mode=False)\n"
+            "print(','.join(sys.modules))"
+        )
+
+        loaded = set(result.stdout.splitlines()[-1].split(","))
+        assert "--pin-sha" in result.stdout
+        assert not self.HEAVY_MODULES & loaded
@@ -1,42 +1,49 @@
 from __future__ import annotations
 
+import itertools
+import os
+
 import pytest
 
+from cookiecutter_uv.combinations import covering_array, defaults, load_choices
+
+# Interaction strength of the generated combinations: 2 covers every pair of choices, 3 every triple.
+STRENGTH = int(os.environ.get("COOKIECUTTER_UV_STRENGTH", "2"))
+CHOICES = load_choices()
+
 MINIMAL = {
     "include_github_actions": "n",
     "publish_to_pypi": "n",
     "deptry": "n",
     "mkdocs": "n",
     "codecov": "n",
+    "benchmarks": "n",
     "dockerfile": "n",
     "devcontainer": "n",
 }
 
+
+def combination(options: dict[str, str], name: str):
+    """A parameter set whose tests run on one xdist worker, so its project is baked only once."""
+    return pytest.param(options, id=name, marks=pytest.mark.xdist_group(name))
+
+
 COMBINATIONS = [
-    pytest.param({}, id="all-defaults"),
-    pytest.param(MINIMAL, id="minimal"),
-    pytest.param({"layout": "src"}, id="src-layout-defaults"),
-    pytest.param({**MINIMAL, "layout": "src"}, id="src-layout-minimal"),
-    pytest.param({"publish_to_pypi": "n", "mkdocs": "n"}, id="no-publish-no-mkdocs"),
-    pytest.param({"include_github_actions": "n"}, id="no-github-actions"),
-    pytest.param({"type_checker": "ty"}, id="ty-type-checker"),
-    pytest.param({"mkdocs": "y", "codecov": "n"}, id="mkdocs-no-codecov"),
-    pytest.param({"codecov": "n", "include_github_actions": "n"}, id="no-codecov-no-actions"),
-    pytest.param({"layout": "src", "type_checker": "ty", "publish_to_pypi": "n"}, id="src-ty-no-publish"),
+    combination({}, "all-defaults"),
+    combination(MINIMAL, "minimal"),
+    combination({"layout": "src"}, "src-layout-defaults"),
+    combination({**MINIMAL, "layout": "src"}, "src-layout-minimal"),
+    combination({"publish_to_pypi": "n", "mkdocs": "n"}, "no-publish-no-mkdocs"),
+    combination({"include_github_actions": "n"}, "no-github-actions"),
+    combination({"type_checker": "ty"}, "ty-type-checker"),
+    combination({"mkdocs": "y", "codecov": "n"}, "mkdocs-no-codecov"),
+    combination({"codecov": "n", "include_github_actions": "n"}, "no-codecov-no-actions"),
+    combination({"layout": "src", "type_checker": "ty", "publish_to_pypi": "n"}, "src-ty-no-publish"),
 ]
 
-# Defaults from cookiecutter.json (first item in each list)
-DEFAULTS = {
-    "layout": "flat",
-    "include_github_actions": "y",
-    "publish_to_pypi": "y",
-    "deptry": "y",
-    "mkdocs": "y",
-    "codecov": "y",
-    "dockerfile": "y",
-    "devcontainer": "y",
-    "type_checker": "mypy",
-}
+COVERING = [combination(options, f"{STRENGTH}-wise-{i}") for i, options in enumerate(covering_array(CHOICES, STRENGTH))]
+
+DEFAULTS = defaults(CHOICES)
 
 
 def resolve_options(options: dict[str, str]) -> dict[str, str]:
@@ -44,30 +51,38 @@ def resolve_options(options: dict[str, str]) -> dict[str, str]:
     return {**DEFAULTS, **options}
 
 
-@pytest.mark.parametrize("options", COMBINATIONS)
+@pytest.fixture
+def project(bake_cache, options):
+    """The project for a combination, baked once per session and shared by the tests of that combination."""
+    return bake_cache.get(resolve_options(options))
+
+
+@pytest.mark.parametrize("options", COMBINATIONS + COVERING)
 class TestStructure:
     """Validate file presence/absence for each option combination."""
 
-    def test_always_present_files(self, bake, options):
+    def test_always_present_files(self, project, options):
         EXPECTED_FILES = [
             ".gitignore",
             ".pre-commit-config.yaml",
             "CONTRIBUTING.md",
-            "LICENSE",
             "Makefile",
             "README.md",
             "pyproject.toml",
             "tests",
             "tox.ini",
         ]
-        project = bake(**options)
         for rel_path in EXPECTED_FILES:
             assert (project.path / rel_path).exists(), f"Expected {rel_path} to exist"
 
-    def test_conditional_files(self, bake, options):
-        project = bake(**options)
+    def test_conditional_files(self, project, options):
         effective = resolve_options(options)
 
+        if effective["open_source_license"] != "Not open source":
+            assert project.has_file("LICENSE")
+        else:
+            assert not project.has_file("LICENSE")
+
         if effective["dockerfile"] == "y":
             assert project.has_file("Dockerfile")
         else:
@@ -85,6 +100,11 @@ class TestStructure:
         else:
             assert not project.has_file("codecov.yaml")
 
+        if effective["benchmarks"] == "y":
+            assert project.has_file("benchmarks/test_foo_benchmark.py")
+        else:
+            assert not project.has_dir("benchmarks")
+
         if effective["devcontainer"] == "y":
             assert project.has_dir(".devcontainer")
         else:
@@ -95,9 +115,8 @@ class TestStructure:
         else:
             assert not project.has_dir(".github")
 
-    def test_layout(self, bake, options):
+    def test_layout(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         if effective["layout"] == "src":
             assert project.has_dir("src/example_project")
             assert not project.has_dir("example_project")
@@ -105,9 +124,8 @@ class TestStructure:
             assert project.has_dir("example_project")
             assert not project.has_dir("src")
 
-    def test_release_workflow(self, bake, options):
+    def test_release_workflow(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         if effective["include_github_actions"] != "y":
             return  # no .github at all
         has_release = effective["publish_to_pypi"] == "y" or effective["mkdocs"] == "y"
@@ -117,15 +135,13 @@ class TestStructure:
         else:
             assert not project.has_file(workflow), "Expected release workflow to be absent"
 
-    def test_yaml_validity(self, bake, options):
+    def test_yaml_validity(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         if effective["include_github_actions"] == "y":
             assert project.is_valid_yaml(".github/workflows/main.yml")
 
-    def test_pyproject_type_checker(self, bake, options):
+    def test_pyproject_type_checker(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         content = project.read_file("pyproject.toml")
         if effective["type_checker"] == "mypy":
             assert '"mypy' in content
@@ -134,9 +150,8 @@ class TestStructure:
             assert '"ty' in content
             assert '"mypy' not in content
 
-    def test_makefile_targets(self, bake, options):
+    def test_makefile_targets(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         content = project.read_file("Makefile")
 
         if effective["publish_to_pypi"] == "y":
@@ -149,9 +164,18 @@ class TestStructure:
         else:
             assert "docs:" not in content
 
-    def test_codecov_workflow(self, bake, options):
+        for target in ("bench:", "bench-baseline:", "bench-compare:"):
+            assert (target in content) == (effective["benchmarks"] == "y")
+
+    def test_benchmarks_dependency_and_workflow(self, project, options):
+        effective = resolve_options(options)
+        enabled = effective["benchmarks"] == "y"
+        assert ('"pytest-benchmark' in project.read_file("pyproject.toml")) == enabled
+        if effective["include_github_actions"] == "y":
+            assert project.file_contains(".github/workflows/main.yml", "make bench-compare") == enabled
+
+    def test_codecov_workflow(self, project, options):
         effective = resolve_options(options)
-        project = bake(**options)
         if effective["include_github_actions"] == "y":
             if effective["codecov"] == "y":
                 assert project.has_file(".github/workflows/validate-codecov-config.yml")
@@ -161,6 +185,32 @@ class TestStructure:
                 assert not project.has_file("codecov.yaml")
 
 
+SMALL_CHOICES = {"a": ["1", "2", "3"], "b": ["y", "n"], "c": ["y", "n"], "d": ["x", "y", "z"]}
+
+
+class TestCoveringArray:
+    @pytest.mark.parametrize("strength", [1, 2, 3])
+    def test_covers_every_interaction(self, strength):
+        rows = covering_array(SMALL_CHOICES, strength)
+        for names in itertools.combinations(SMALL_CHOICES, strength):
+            for values in itertools.product(*(SMALL_CHOICES[name] for name in names)):
+                expected = dict(zip(names, values, strict=True))
+                assert any(expected.items() <= row.items() for row in rows), expected
+
+    def test_is_much_smaller_than_the_full_product(self):
+        assert len(covering_array(CHOICES, 2)) < 20
+        assert len(covering_array(SMALL_CHOICES, 2)) == 9
+
+    def test_full_strength_is_the_product(self):
+        assert len(covering_array(SMALL_CHOICES, 10)) == 3 * 2 * 2 * 3
+
+    def test_load_choices_skips_free_text_and_private_options(self):
+        assert "project_name" not in CHOICES
+        assert "_features" not in CHOICES
+        assert DEFAULTS["layout"] == "flat"
+        assert DEFAULTS["open_source_license"] == "MIT license"
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("options", COMBINATIONS)
 def test_install_and_run_tests(bake, options):
@@ -170,6 +220,17 @@ def test_install_and_run_tests(bake, options):
     project.run_tests()
 
 
+@pytest.mark.slow
+def test_benchmarks_compare_with_baseline(bake):
+    """The generated benchmarks run, save a baseline and pass a comparison against it."""
+    project = bake(benchmarks="y")
+    project.install()
+    for target in ("bench", "bench-baseline", "bench-compare"):
+        result = project.run(f"uv run make {target}")
+        assert result.returncode == 0, f"make {target} failed:\n{result.stdout}\n{result.stderr}"
+    assert (project.path / ".benchmarks" / "baseline.json").is_file()
+
+
 @pytest.mark.slow
 def test_check_passes_on_default_project(bake):
     """A freshly baked default project should pass its own ``make check``."""
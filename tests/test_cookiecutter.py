@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import json
+import re
+import sys
+from pathlib import Path
+
 
 def test_bake_project(bake):
     project = bake(project_name="my-project")
@@ -36,6 +41,24 @@ def test_not_mkdocs(bake):
     assert not project.has_dir("docs")
 
 
+def test_benchmarks(bake):
+    project = bake(benchmarks="y")
+    assert project.is_valid_yaml(".github/workflows/main.yml")
+    assert project.file_contains(".github/workflows/main.yml", "make bench-compare")
+    assert project.file_contains("Makefile", "bench-compare:")
+    assert project.file_contains("pyproject.toml", '"benchmarks/*" = ["S101"]')
+    assert project.has_file("benchmarks/test_foo_benchmark.py")
+
+
+def test_not_benchmarks(bake):
+    project = bake(benchmarks="n")
+    assert project.is_valid_yaml(".github/workflows/main.yml")
+    assert not project.file_contains(".github/workflows/main.yml", "bench")
+    assert not project.file_contains("Makefile", "bench")
+    assert not project.file_contains("pyproject.toml", "benchmark")
+    assert not project.has_dir("benchmarks")
+
+
 def test_tox(bake):
     project = bake()
     assert project.has_file("tox.ini")
@@ -70,3 +93,63 @@ def test_license_gplv3(bake):
 def test_license_no_license(bake):
     project = bake(open_source_license="Not open source")
     assert not project.has_file("LICENSE")
+
+
+def test_license_file_per_license():
+    template = Path(__file__).parent.parent / "{{cookiecutter.project_name}}"
+    licenses = json.loads((template.parent / "cookiecutter.json").read_text())["open_source_license"]
+    names = {path.name for path in template.iterdir()}
+    assert {f"{{{{ license_file('{name}') }}}}" for name in licenses if name != "Not open source"} <= names
+
+
+def test_optional_files_use_declared_features():
+    template_root = Path(__file__).parent.parent
+    features = json.loads((template_root / "cookiecutter.json").read_text())["_features"]
+    used = {
+        match.group(1)
+        for path in (template_root / "{{cookiecutter.project_name}}").rglob("*")
+        if (match := re.fullmatch(r"\{\{ optional\('([^']+)', '[^']+'\) \}\}", path.name))
+    }
+    assert used
+    assert used <= set(features)
+
+
+def test_disabled_features_leave_no_empty_dirs(bake):
+    project = bake(include_github_actions="n", mkdocs="n", devcontainer="n")
+    assert not project.has_dir(".github")
+    assert not project.has_dir("docs")
+    assert not project.has_dir(".devcontainer")
+
+
+def test_overwrite_keeps_existing_empty_dirs(tmp_path: Path, cookiecutter_config: Path):
+    from cookiecutter_uv.bake import bake
+
+    existing = tmp_path / "example-project"
+    for rel_path in ("data/raw", ".git/refs/tags", "docs"):
+        (existing / rel_path).mkdir(parents=True)
+
+    options = {"mkdocs": "n", "benchmarks": "n"}
+    project = bake(options, tmp_path, overwrite_if_exists=True, config_file=cookiecutter_config)
+    assert (project / "data" / "raw").is_dir()
+    assert (project / ".git" / "refs" / "tags").is_dir()
+    assert not (project / "docs").exists()
+    assert not (project / "benchmarks").exists()
+
+
+def test_src_layout(bake):
+    project = bake(project_name="my-project", layout="src")
+    assert project.has_file("src/my_project/foo.py")
+    assert not project.has_dir("my_project")
+
+
+def test_codecov_workflow_needs_github_actions(bake):
+    project = bake(codecov="y", include_github_actions="n")
+    assert project.has_file("codecov.yaml")
+    assert not project.has_dir(".github")
+
+
+def test_baked_projects_share_tool_caches(bake, project_env):
+    project = bake()
+    result = project.run(f"{sys.executable} -c 'import os; print(os.environ[\"UV_CACHE_DIR\"])'", check=True)
+    assert result.stdout.strip() == project_env["UV_CACHE_DIR"]
+    assert project_env["PRE_COMMIT_HOME"].startswith(str(Path(project_env["UV_CACHE_DIR"]).parent))
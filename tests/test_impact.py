@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from cookiecutter_uv.combinations import covering_array, load_choices
+from cookiecutter_uv.impact import ALL_VARIABLES, analyze_template, changed_paths, select_combinations
+
+PROJECT = "{{cookiecutter.project_name}}"
+
+
+@pytest.fixture(scope="module")
+def files():
+    return analyze_template()
+
+
+@pytest.fixture(scope="module")
+def combinations():
+    return covering_array(load_choices(), 2)
+
+
+class TestAnalyzeTemplate:
+    def test_content_variables(self, files) -> None:
+        makefile = files[f"{PROJECT}/Makefile"]
+        assert {"mkdocs", "publish_to_pypi", "type_checker"} <= makefile.variables
+        assert "open_source_license" not in makefile.variables
+        assert makefile.conditions == ()
+
+    def test_optional_files_are_conditional(self, files) -> None:
+        dockerfile = files[f"{PROJECT}/{{{{ optional('dockerfile', 'Dockerfile') }}}}"]
+        assert dockerfile.conditions == ({"dockerfile": "y"},)
+        assert dockerfile.rendered({"dockerfile": "y"})
+        assert not dockerfile.rendered({"dockerfile": "n"})
+
+    def test_license_files_are_conditional(self, files) -> None:
+        license_file = files[f"{PROJECT}/{{{{ license_file('MIT license') }}}}"]
+        assert license_file.rendered({"open_source_license": "MIT license"})
+        assert not license_file.rendered({"open_source_license": "BSD license"})
+
+    def test_derived_variables_are_expanded(self, files) -> None:
+        package = files[f"{PROJECT}/{{{{cookiecutter.__package_dir}}}}/foo.py"]
+        assert {"layout", "project_slug", "project_name"} <= package.variables
+
+    def test_whole_dict_use_depends_on_everything(self, tmp_path: Path) -> None:
+        (tmp_path / "cookiecutter.json").write_text('{"project_name": "x", "flag": ["y", "n"]}')
+        (tmp_path / PROJECT).mkdir()
+        (tmp_path / PROJECT / "context.txt").write_text("{% for key in cookiecutter %}{{ key }}{% endfor %}")
+        (tmp_path / PROJECT / "flag.txt").write_text("{{ cookiecutter['flag'] }}")
+
+        files = analyze_template(tmp_path)
+        assert ALL_VARIABLES in files[f"{PROJECT}/context.txt"].variables
+        assert files[f"{PROJECT}/flag.txt"].variables == {"flag", "project_name"}
+
+
+class TestSelectCombinations:
+    def test_selects_one_combination_per_relevant_values(self, combinations) -> None:
+        selected = select_combinations(combinations, [f"{PROJECT}/tox.ini"])
+        assert sorted(options["type_checker"] for options in selected) == ["mypy", "ty"]
+
+    def test_skips_combinations_without_the_file(self, combinations) -> None:
+        selected = select_combinations(combinations, [f"{PROJECT}/{{{{ optional('mkdocs', 'mkdocs.yml') }}}}"])
+        assert selected
+        assert all(options["mkdocs"] == "y" for options in selected)
+        assert len(selected) < len(combinations)
+
+    def test_deleted_files_are_judged_by_path(self, combinations) -> None:
+        selected = select_combinations(combinations, [f"{PROJECT}/{{{{ optional('codecov', 'removed.yml') }}}}"])
+        assert {options["codecov"] for options in selected} == {"y"}
+
+    def test_changes_outside_the_project_select_everything(self, combinations) -> None:
+        assert select_combinations(combinations, [f"{PROJECT}/tox.ini", "hooks/post_gen_project.py"]) == combinations
+
+    def test_no_changes_select_nothing(self, combinations) -> None:
+        assert select_combinations(combinations, []) == []
+
+
+def test_changed_paths(tmp_path: Path) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)  # noqa: S607
+
+    git("init", "-q")
+    (tmp_path / "tracked.txt").write_text("a")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "same.txt").write_text("a")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "initial")
+    (tmp_path / "tracked.txt").write_text("b")
+    (tmp_path / "sub" / "new.txt").write_text("a")
+
+    assert changed_paths("HEAD", tmp_path / "sub") == ["sub/new.txt", "tracked.txt"]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from cookiecutter.main import cookiecutter
+
+from cookiecutter_uv.bake import TEMPLATE_DIR, bake
+from cookiecutter_uv.cli import main
+from cookiecutter_uv.update import (
+    TEMPLATE_RECORD,
+    TemplateRecord,
+    apply_update,
+    changed_template_files,
+    merge_file,
+    plan_update,
+)
+
+PROJECT = "{{cookiecutter.project_name}}"
+
+
+def git(cwd: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],  # noqa: S607
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def commit(template: Path, message: str) -> str:
+    git(template, "add", "-A")
+    git(template, "commit", "-q", "-m", message)
+    return git(template, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    """A git repository with a copy of the template."""
+    template = tmp_path / "template"
+    ignore = shutil.ignore_patterns("__pycache__")
+    template.mkdir()
+    for name in ("cookiecutter.json", "local_extensions.py"):
+        shutil.copy(TEMPLATE_DIR / name, template / name)
+    for name in ("hooks", PROJECT):
+        shutil.copytree(TEMPLATE_DIR / name, template / name, ignore=ignore)
+    git(template, "init", "-q")
+    commit(template, "Initial template")
+    return template
+
+
+@pytest.fixture
+def project(tmp_path: Path, template: Path, cookiecutter_config: Path) -> Path:
+    context = {"project_name": "example-project"}
+    return bake(context, tmp_path / "projects", template=template, config_file=cookiecutter_config)
+
+
+def edit(path: Path, old: str, new: str) -> None:
+    text = path.read_text()
+    assert old in text
+    path.write_text(text.replace(old, new, 1))
+
+
+class TestTemplateRecord:
+    def test_generated_project_records_template_and_options(self, project: Path, template: Path) -> None:
+        record = TemplateRecord.load(project)
+        assert record.template == str(template)
+        assert record.commit == git(template, "rev-parse", "HEAD")
+        assert record.context["project_name"] == "example-project"
+        assert not any(name.startswith("_") for name in record.context)
+
+    def test_relative_template_path_is_recorded_absolute(
+        self, tmp_path: Path, template: Path, cookiecutter_config: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(template)
+        project = cookiecutter(
+            ".", no_input=True, output_dir=str(tmp_path / "relative"), config_file=str(cookiecutter_config)
+        )
+        record = TemplateRecord.load(Path(project))
+        assert record.template == str(template)
+        assert record.commit == git(template, "rev-parse", "HEAD")
+
+    def test_no_record_without_a_git_checkout(self, tmp_path: Path, template: Path, cookiecutter_config: Path) -> None:
+        shutil.rmtree(template / ".git")
+        project = bake({}, tmp_path / "projects", template=template, config_file=cookiecutter_config)
+        assert not (project / TEMPLATE_RECORD).exists()
+        with pytest.raises(ValueError, match="not generated from a git checkout"):
+            TemplateRecord.load(project)
+
+    def test_missing_record(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match=TEMPLATE_RECORD):
+            TemplateRecord.load(tmp_path)
+
+
+class TestChangedTemplateFiles:
+    def test_only_project_files(self, template: Path) -> None:
+        old = git(template, "rev-parse", "HEAD")
+        (template / "README.md").write_text("About the template\n")
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        new = commit(template, "Change the default goal")
+        assert changed_template_files(template, old, new) == [f"{PROJECT}/Makefile"]
+
+    def test_hook_changes_rerender_everything(self, template: Path) -> None:
+        old = git(template, "rev-parse", "HEAD")
+        (template / "hooks" / "post_gen_project.py").write_text("")
+        new = commit(template, "Remove the hook")
+        assert changed_template_files(template, old, new) is None
+
+
+class TestUpdate:
+    def test_up_to_date(self, project: Path, template: Path) -> None:
+        updates, new = plan_update(project, template)
+        assert updates == []
+        assert new == TemplateRecord.load(project).commit
+
+    def test_template_change_is_merged_with_local_edits(self, project: Path, template: Path) -> None:
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        new = commit(template, "Change the default goal")
+        edit(project / "Makefile", "@uv sync", "@uv sync --frozen")
+
+        updates, target = plan_update(project, template)
+        assert [(update.path, update.action) for update in updates] == [("Makefile", "merge")]
+        apply_update(project, updates, target)
+
+        makefile = (project / "Makefile").read_text()
+        assert "@uv sync --frozen" in makefile
+        assert ".DEFAULT_GOAL := install" in makefile
+        assert TemplateRecord.load(project).commit == new
+
+    def test_new_and_removed_files(self, project: Path, template: Path) -> None:
+        (template / PROJECT / "NOTICE").write_text("{{ cookiecutter.project_name }}\n")
+        (template / PROJECT / "CONTRIBUTING.md").unlink()
+        commit(template, "Replace the contributing guide with a notice")
+
+        updates, target = plan_update(project, template)
+        assert {update.path: update.action for update in updates} == {"CONTRIBUTING.md": "delete", "NOTICE": "create"}
+        apply_update(project, updates, target)
+        assert (project / "NOTICE").read_text() == "example-project\n"
+        assert not (project / "CONTRIBUTING.md").exists()
+
+    def test_conflicting_edits_leave_markers(self, project: Path, template: Path) -> None:
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        commit(template, "Change the default goal")
+        edit(project / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := check")
+
+        updates, _ = plan_update(project, template)
+        assert [(update.path, update.action, update.conflicts) for update in updates] == [("Makefile", "conflict", 1)]
+        assert b"<<<<<<< Makefile" in (updates[0].content or b"")
+
+    def test_merge_file(self) -> None:
+        merged, conflicts = merge_file(b"a\nb\nc\n", b"a\nb\n", b"z\na\nb\n", "file")
+        assert (merged, conflicts) == (b"z\na\nb\nc\n", 0)
+
+
+class TestCli:
+    def test_dry_run(self, project: Path, template: Path) -> None:
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        old = TemplateRecord.load(project).commit
+        commit(template, "Change the default goal")
+
+        result = CliRunner().invoke(main, ["update", str(project), "--dry-run"])
+        assert result.exit_code == 0, result.output
+        assert "update     Makefile" in result.output
+        assert TemplateRecord.load(project).commit == old
+
+    def test_update_to_revision(self, project: Path, template: Path) -> None:
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        first = commit(template, "Change the default goal")
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := install", ".DEFAULT_GOAL := check")
+        commit(template, "Change the default goal again")
+
+        result = CliRunner().invoke(main, ["update", str(project), "--to", "HEAD~1", "--template", str(template)])
+        assert result.exit_code == 0, result.output
+        assert ".DEFAULT_GOAL := install" in (project / "Makefile").read_text()
+        assert json.loads((project / TEMPLATE_RECORD).read_text())["commit"] == first
+
+    def test_unknown_revision(self, project: Path, template: Path) -> None:
+        result = CliRunner().invoke(
+            main, ["update", str(project), "--to", "no-such-branch", "--template", str(template)]
+        )
+        assert result.exit_code == 1
+        assert "Error: fatal: Needed a single revision" in result.output
+        assert "Traceback" not in result.output
+
+    def test_conflicts_fail(self, project: Path, template: Path) -> None:
+        edit(template / PROJECT / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := install")
+        commit(template, "Change the default goal")
+        edit(project / "Makefile", ".DEFAULT_GOAL := help", ".DEFAULT_GOAL := check")
+
+        result = CliRunner().invoke(main, ["update", str(project)])
+        assert result.exit_code == 1
+        assert "1 files have conflicts" in result.output
+        assert "<<<<<<<" in (project / "Makefile").read_text()